@@ -3,11 +3,17 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import plotly.graph_objects as go
 import plotly.express as px
-import random
-random.seed(42)  # For reproducibility
-
-from src.ga.scheduler import genetic_algorithm
+import hashlib
+import io
+import threading
+import time
+from collections import OrderedDict
+
+from src.ga.constraint_model import ConstraintModel
+from src.ga.fitness import TEAM_CONSTRAINTS
+from src.ga.scheduler import genetic_algorithm_iter, schedule_result
 from src.ga.operators import *
+from src.utils.export import schedule_frame
 from src.utils.helper import parse_input_data
 
 
@@ -15,37 +21,131 @@ from src.utils.helper import parse_input_data
 st.set_page_config(layout="wide")
 st.title("Tournament Scheduler using Genetic Algorithm")
 
+# Seconds between progress bar and chart redraws while the scheduler runs
+UPDATE_INTERVAL = 0.25
+
+# Finished runs kept for reuse by identical runs; the least recently used is evicted first
+MAX_STORED_RESULTS = 32
+
+
+@st.cache_data
+def load_constraints(raw):
+    """Parse a constraints JSON file once per distinct file content."""
+    return parse_input_data(io.BytesIO(raw))
+
+
+@st.cache_resource
+def result_store():
+    """
+    Finished GA results shared by all sessions, keyed by (constraints hash, config, seed).
+
+    :return: LRU-ordered dict of results and the lock that guards it across session threads.
+    """
+    return OrderedDict(), threading.Lock()
+
+
+def load_result(key):
+    """Stored result of an identical run, or None."""
+    results, lock = result_store()
+    with lock:
+        result = results.get(key)
+        if result is not None:
+            results.move_to_end(key)
+        return result
+
+
+def store_result(key, result):
+    """Keep a finished result, evicting the least recently used beyond `MAX_STORED_RESULTS`."""
+    results, lock = result_store()
+    with lock:
+        results[key] = result
+        results.move_to_end(key)
+        while len(results) > MAX_STORED_RESULTS:
+            results.popitem(last=False)
+
+
+def build_result(constraints, best_individual, generations_graph):
+    """
+    Decode a run's best individual and derive everything the results section shows.
+
+    Building the table, filter options, CSV and violations once per result keeps
+    filter changes from redoing this work on every rerun.
+
+    :return: Dict with the schedule, fitness, violation details and the derived views.
+    """
+    model = ConstraintModel(constraints)
+    schedule, fitness, venue_violations, rest_period_violations, time_violations, generations_fitness = schedule_result(
+        constraints, best_individual, generations_graph, model
+    )
+
+    df_schedule = schedule_frame(best_individual, constraints, match_table=model.match_table)
+    team_counts = model.count_violations(best_individual[None])
+
+    violations = pd.DataFrame(
+        [{"Type": "Venue", "Subject": venue, "Detail": f"week {week}, {day}: {count} matches", "Penalty": count - 1}
+         for (venue, week, day), count in venue_violations.items()]
+        + [{"Type": "Rest", "Subject": violation["team"],
+            "Detail": f"days {violation['match_days'][0]}-{violation['match_days'][1]} "
+                      f"(rest {violation['rest_period']} days)", "Penalty": 1}
+           for violation in rest_period_violations]
+        + [{"Type": "Time", "Subject": violation["team"],
+            "Detail": f"time slot {violation['time_slot']}: {violation['count']} matches", "Penalty": violation["count"] - 1}
+           for violation in time_violations]
+        + [{"Type": "Team", "Subject": name.replace("_", " "), "Detail": "matches beyond the limit",
+            "Penalty": int(team_counts[name][0])}
+           for name in TEAM_CONSTRAINTS if name in team_counts and team_counts[name][0]],
+        columns=["Type", "Subject", "Detail", "Penalty"],
+    )
+
+    return {
+        "schedule": schedule,
+        "fitness": fitness,
+        "generations_fitness": generations_fitness,
+        "violations": violations,
+        "df_schedule": df_schedule,
+        "csv": df_schedule.to_csv(index=False),
+        "teams": ["All"] + sorted(set(df_schedule["Team 1"]).union(df_schedule["Team 2"])),
+        "venues": ["All"] + sorted(df_schedule["Venue"].unique()),
+        "days": ["All"] + sorted(df_schedule["Day"].unique()),
+        "weeks": ["All"] + sorted(df_schedule["Week"].unique()),
+    }
+
+
 # Session states
-if 'schedule' not in st.session_state:
-    st.session_state.schedule = None
-if 'fitness_trend' not in st.session_state:
-    st.session_state.fitness_trend = None
-if 'constraints' not in st.session_state:
-    st.session_state.constraints = None
+if 'result' not in st.session_state:
+    st.session_state.result = None
 if 'mutation_method' not in st.session_state:
     st.session_state.mutation_method = None
 if 'crossover_method' not in st.session_state:
     st.session_state.crossover_method = None
+if 'partial_run' not in st.session_state:
+    st.session_state.partial_run = None
 
 # Sidebar configuration
 st.sidebar.header("⚙️ Settings")
 
 pop_size = st.sidebar.slider("Population Size", 100, 2000, 500, step=50)
 Gen_size = st.sidebar.slider("Generations Size", 100, 800, 200, step=50)
+seed = int(st.sidebar.number_input("Seed", min_value=0, value=42, step=1))
+seeded_fraction = st.sidebar.slider("Round-robin seeded share of the initial population", 0.0, 1.0, 0.1, step=0.05)
 
 # Team input
 st.header("Enter Teams")
 input_method = st.radio("Choose input method:", ["Upload JSON File", "Run with Saved Data"])
-teams = []
+constraints_raw = None
 
 if input_method == "Run with Saved Data":
-    with open("data/data.json", "r") as f:
-        constraints = parse_input_data(f)
+    with open("data/data.json", "rb") as f:
+        constraints_raw = f.read()
 
 if input_method == "Upload JSON File":
     uploaded_file = st.file_uploader("Upload JSON with constraints", type=["json"])
     if uploaded_file:
-        constraints = parse_input_data(uploaded_file)
+        constraints_raw = uploaded_file.getvalue()
+
+if constraints_raw is not None:
+    constraints = load_constraints(constraints_raw)
+    constraints_hash = hashlib.sha256(constraints_raw).hexdigest()
 
 # Genetic Algorithm Configuration Step
 st.header("Configure Genetic Algorithm")
@@ -64,47 +164,88 @@ if st.button("Save Configuration"):
 
 # Scheduler execution
 st.header("Run Scheduler")
-if st.button(" Run Scheduler"):
+run_column, stop_column = st.columns(2)
+run_clicked = run_column.button(" Run Scheduler")
+stop_clicked = stop_column.button("Stop")
+
+# Pressing Stop reruns the script, which interrupts a running loop; keep its best so far
+if stop_clicked and st.session_state.get("partial_run"):
+    partial_run = st.session_state.partial_run
+    st.session_state.partial_run = None
+    st.session_state.result = build_result(
+        partial_run["constraints"], partial_run["best_individual"], partial_run["generations_graph"]
+    )
+    st.warning(f"Stopped after generation {len(partial_run['generations_graph']) - 1}.")
+
+if run_clicked:
     try:
         if st.session_state.mutation_method is None or st.session_state.crossover_method is None or st.session_state.survivor_strategy is None:
             st.error("Please configure the Genetic Algorithm (Step 2) before running the scheduler.")
+        elif constraints_raw is None:
+            st.error("Please upload a constraints JSON file or run with the saved data.")
         else:
-            # Pass mutation and crossover methods to the genetic algorithm
-            best_schedule, best_fitness, venue_violations, rest_period_violations, time_violations, Generations_fitness = genetic_algorithm(
-                constraints,
-                population_size = pop_size,
-                generations_size = Gen_size,
-                mutation_method=st.session_state.mutation_method,
-                crossover_method=st.session_state.crossover_method,
-                survivor_strategy=st.session_state.survivor_strategy,
-                selection_method=st.session_state.selection_method
-            )
-
-            st.session_state.schedule = best_schedule
-            st.session_state.fitness_trend = best_fitness
-            st.session_state.Generations_fitness = Generations_fitness
-            st.session_state.venue_violations = venue_violations
-            st.session_state.rest_period_violations = rest_period_violations
-            st.session_state.time_violations = time_violations
-            st.session_state.constraints = constraints
+            config = {
+                "population_size": pop_size,
+                "generations_size": Gen_size,
+                "mutation_method": st.session_state.mutation_method,
+                "crossover_method": st.session_state.crossover_method,
+                "survivor_strategy": st.session_state.survivor_strategy,
+                "selection_method": st.session_state.selection_method,
+                "seeded_fraction": seeded_fraction,
+            }
+            result_key = (constraints_hash, tuple(sorted(config.items())), seed)
+
+            stored_result = load_result(result_key)
+            if stored_result is not None:
+                st.session_state.result = stored_result
+                st.info("Loaded the result of an identical earlier run.")
+            else:
+                progress_bar = st.progress(0.0, text="Starting...")
+                chart_placeholder = st.empty()
+                generations_graph = []
+                last_update = 0.0
+
+                # Pass mutation and crossover methods to the genetic algorithm
+                for snapshot in genetic_algorithm_iter(constraints, seed=seed, **config):
+                    generations_graph.append(snapshot.best_fitness)
+                    st.session_state.partial_run = {
+                        "constraints": constraints,
+                        "best_individual": snapshot.best_individual,
+                        "generations_graph": generations_graph,
+                    }
+
+                    # Redrawing every generation would dominate the run time on small instances
+                    if time.perf_counter() - last_update >= UPDATE_INTERVAL:
+                        last_update = time.perf_counter()
+                        violations = snapshot.violations
+                        progress_bar.progress(
+                            snapshot.generation / Gen_size,
+                            text=f"Generation {snapshot.generation}/{Gen_size}: best {snapshot.best_fitness}, "
+                                 f"mean {snapshot.mean_fitness:.1f} (venue {violations['venue']}, "
+                                 f"rest {violations['rest']}, time {violations['time']})"
+                        )
+                        chart_placeholder.line_chart(generations_graph)
+
+                progress_bar.progress(1.0, text=f"Finished at generation {snapshot.generation} ({snapshot.stop_reason}): "
+                                               f"best {snapshot.best_fitness}")
+                chart_placeholder.empty()
+                st.session_state.partial_run = None
+
+                st.session_state.result = build_result(constraints, snapshot.best_individual, generations_graph)
+                store_result(result_key, st.session_state.result)
     except Exception as e:
         st.error(f"Error: {e}")
 
 # Display results
-if st.session_state.schedule:
-    schedule = st.session_state.schedule
-    fitness_trend = st.session_state.fitness_trend
-    Generations_fitness = st.session_state.Generations_fitness
-    venue_violations = st.session_state.venue_violations
-    rest_period_violations = st.session_state.rest_period_violations
-    time_violations = st.session_state.time_violations
-    constraints = st.session_state.constraints
+if st.session_state.result:
+    result = st.session_state.result
+    Generations_fitness = result["generations_fitness"]
 
     # Replace your current fitness plot code with this:
     st.subheader("📈 Fitness Over Generations")
 
     fig = px.line(
-        x=list(range(len(Generations_fitness))), 
+        x=list(range(len(Generations_fitness))),
         y=Generations_fitness,
         markers=True,
         labels={"x": "Generation", "y": "Best Fitness"},
@@ -130,65 +271,49 @@ if st.session_state.schedule:
 
     st.subheader("Best Schedule")
     st.write("The best schedule found by the genetic algorithm is:")
-    st.write("**Fitness Score:**", fitness_trend)
-
-    st.write("**Venue Violations:**")
-    for venue, count in venue_violations.items():
-        st.write(f"- {venue[0]}, week {venue[1]}, Days {venue[2]}: {count} violations")
+    st.write("**Fitness Score:**", result["fitness"])
 
-    st.write("**Rest Period Violations:**")
-    for violation in rest_period_violations:
-        team, match_day, rest_period = violation.items()
-        st.write(f"- {team[1]}, Days: {match_day[1]} (Rest Period: {rest_period[1]})")
+    # One table for all violations instead of a widget per violation
+    violations = result["violations"]
+    st.write("**Violations:**")
+    venue_column, rest_column, time_column, team_column = st.columns(4)
+    for column, kind in ((venue_column, "Venue"), (rest_column, "Rest"), (time_column, "Time"), (team_column, "Team")):
+        column.metric(f"{kind} violations", int(violations.loc[violations["Type"] == kind, "Penalty"].sum()))
+    if not violations.empty:
+        st.dataframe(violations, use_container_width=True)
 
-    st.write("**Time Violations:**")
-    for violation in time_violations:
-        team, time_slot, count = violation.items()
-        st.write(f"- {team[0]}, time slot: {time_slot[1]} (Count: {count[1]})")
 
-    
 
     # Visual schedule table
     st.subheader("📅 Match Schedule")
-    df_schedule = pd.DataFrame([
-        {
-            "Week": match[5],
-            "Day": match[3],
-            "Time Slot": match[4],
-            "Venue": match[2]['VenueName'],
-            "Team 1": match[0]['TeamName'],
-            "Team 2": match[1]['TeamName']
-        }
-        for match in schedule
-    ])
-    df_schedule.sort_values(by=["Week", "Day", "Time Slot"], inplace=True)
+    df_schedule = result["df_schedule"]
 
 
     # Filters
     st.markdown("### 🔍 Filter Matches")
-    filter_team = st.selectbox("Filter by Team", ["All"] + sorted(set(df_schedule["Team 1"]).union(df_schedule["Team 2"])))
-    filter_venue = st.selectbox("Filter by Venue", ["All"] + sorted(df_schedule["Venue"].unique()))
-    filter_day = st.selectbox("Filter by Day", ["All"] + sorted(df_schedule["Day"].unique()))
-    filter_week = st.selectbox("Filter by Week", ["All"] + sorted(df_schedule["Week"].unique()))
+    filter_team = st.selectbox("Filter by Team", result["teams"])
+    filter_venue = st.selectbox("Filter by Venue", result["venues"])
+    filter_day = st.selectbox("Filter by Day", result["days"])
+    filter_week = st.selectbox("Filter by Week", result["weeks"])
 
 
-    filtered_df = df_schedule
+    mask = pd.Series(True, index=df_schedule.index)
     if filter_team != "All":
-        filtered_df = filtered_df[(filtered_df["Team 1"] == filter_team) | (filtered_df["Team 2"] == filter_team)]
+        mask &= (df_schedule["Team 1"] == filter_team) | (df_schedule["Team 2"] == filter_team)
     if filter_venue != "All":
-        filtered_df = filtered_df[filtered_df["Venue"] == filter_venue]
+        mask &= df_schedule["Venue"] == filter_venue
     if filter_day != "All":
-        filtered_df = filtered_df[filtered_df["Day"] == filter_day]
+        mask &= df_schedule["Day"] == filter_day
     if filter_week != "All":
-        filtered_df = filtered_df[filtered_df["Week"] == filter_week]
+        mask &= df_schedule["Week"] == filter_week
+    filtered_df = df_schedule[mask]
+
+    st.download_button(label="Download Schedule as CSV", data=result["csv"], file_name='data/schedule.csv', mime='text/csv')
 
-    csv = df_schedule.to_csv(index=False)
-    st.download_button(label="Download Schedule as CSV", data=csv, file_name='data/schedule.csv', mime='text/csv')
 
-    
 
     st.dataframe(filtered_df.style.set_properties(**{
         'background-color': '#e8f4fc',
         'color': 'black',
         'border-color': 'gray'
-    }))
\ No newline at end of file
+    }))
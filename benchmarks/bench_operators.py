@@ -0,0 +1,198 @@
+"""
+Micro-benchmarks for the fitness counters and GA operators at several league and population sizes.
+
+Run from the repository root:
+    python -m benchmarks.bench_operators --save benchmarks/baseline.json
+    python -m benchmarks.bench_operators --compare benchmarks/baseline.json --tolerance 0.25
+
+--compare exits with status 1 when any benchmark is slower than the baseline by
+more than the tolerance, so it can gate a performance change.
+"""
+import argparse
+import fnmatch
+import json
+import platform
+import random
+import sys
+import numpy as np
+from benchmarks.common import best_time, scaled_constraints
+from src.ga.constraint_model import ConstraintModel
+from src.ga.fitness import (
+    count_rest_violations, count_time_imbalances, count_venue_conflicts, evaluate_fitness, evaluate_population
+)
+from src.ga.operators import (
+    PMX_Crossover, attribute_level_mutation, elitism, genitor, order_crossover, rank_based_selection,
+    swap_mutation, tournament_selection
+)
+from src.ga.population import initialize_encoded_population, initialize_population
+
+LEAGUE_SIZES = (10, 20, 40)
+POPULATION_SIZES = (100, 500, 2000)
+
+# name -> (setup, uses population size); setup(constraints, population_size) returns the callable to time
+BENCHMARKS = {}
+
+
+def benchmark(name, population=False):
+    def register(setup):
+        BENCHMARKS[name] = (setup, population)
+        return setup
+    return register
+
+
+@benchmark("count_venue_conflicts")
+def _(constraints, _):
+    schedule = initialize_population(constraints, 1)[0]
+    return lambda: count_venue_conflicts(schedule)
+
+
+@benchmark("count_rest_violations")
+def _(constraints, _):
+    schedule = initialize_population(constraints, 1)[0]
+    min_rest_days = ConstraintModel(constraints).min_rest_days
+    return lambda: count_rest_violations(schedule, constraints, min_rest_days)
+
+
+@benchmark("count_time_imbalances")
+def _(constraints, _):
+    schedule = initialize_population(constraints, 1)[0]
+    return lambda: count_time_imbalances(schedule)
+
+
+@benchmark("evaluate_fitness")
+def _(constraints, _):
+    schedule = initialize_population(constraints, 1)[0]
+    model = ConstraintModel(constraints)
+    return lambda: evaluate_fitness(schedule, constraints, model)
+
+
+@benchmark("evaluate_population", population=True)
+def _(constraints, population_size):
+    population = initialize_encoded_population(constraints, population_size)
+    return lambda: evaluate_population(population, constraints)
+
+
+@benchmark("PMX_Crossover")
+def _(constraints, _):
+    parent1, parent2 = initialize_population(constraints, 2)
+    return lambda: PMX_Crossover(parent1, parent2)
+
+
+@benchmark("order_crossover")
+def _(constraints, _):
+    parent1, parent2 = initialize_population(constraints, 2)
+    return lambda: order_crossover(parent1, parent2)
+
+
+@benchmark("attribute_level_mutation")
+def _(constraints, _):
+    individual = initialize_population(constraints, 1)[0]
+    return lambda: attribute_level_mutation(constraints, individual)
+
+
+@benchmark("swap_mutation")
+def _(constraints, _):
+    individual = initialize_population(constraints, 1)[0]
+    return lambda: swap_mutation(individual)
+
+
+def _scored_population(constraints, population_size):
+    population = initialize_encoded_population(constraints, population_size)
+    return list(population), evaluate_population(population, constraints).tolist()
+
+
+@benchmark("tournament_selection", population=True)
+def _(constraints, population_size):
+    population, fitness = _scored_population(constraints, population_size)
+    return lambda: tournament_selection(population, fitness, tournament_size=population_size // 10)
+
+
+@benchmark("rank_based_selection", population=True)
+def _(constraints, population_size):
+    population, fitness = _scored_population(constraints, population_size)
+    return lambda: rank_based_selection(population, fitness, selection_pressure=1.2)
+
+
+@benchmark("elitism", population=True)
+def _(constraints, population_size):
+    population, fitness = _scored_population(constraints, population_size)
+    offspring, offspring_fitness = _scored_population(constraints, population_size)
+    return lambda: elitism(population, offspring, fitness, offspring_fitness)
+
+
+@benchmark("genitor", population=True)
+def _(constraints, population_size):
+    population, fitness = _scored_population(constraints, population_size)
+    offspring, offspring_fitness = _scored_population(constraints, population_size)
+    # genitor replaces in place, so every call works on fresh copies of the lists
+    return lambda: genitor(population[:], offspring, fitness[:], offspring_fitness)
+
+
+def run_benchmarks(pattern="*", league_sizes=LEAGUE_SIZES, population_sizes=POPULATION_SIZES, repeats=5):
+    """
+    Time every registered benchmark whose name matches `pattern`.
+
+    :return: Dict mapping "name[teams=..,population=..]" to the best seconds per call.
+    """
+    results = {}
+    for name, (setup, uses_population) in BENCHMARKS.items():
+        if not fnmatch.fnmatch(name, pattern):
+            continue
+        for n_teams in league_sizes:
+            constraints = scaled_constraints(n_teams)
+            for population_size in (population_sizes if uses_population else (None,)):
+                random.seed(0)
+                np.random.seed(0)
+                key = f"{name}[teams={n_teams}" + (f",population={population_size}]" if uses_population else "]")
+                results[key] = best_time(setup(constraints, population_size), repeats)
+                print(f"{key:<60} {results[key] * 1e3:>12.3f} ms")
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """
+    Compare timings against a baseline.
+
+    :return: List of (key, baseline seconds, current seconds) for every regression beyond `tolerance`.
+    """
+    regressions = []
+    print(f"\n{'benchmark':<60} {'baseline ms':>12} {'current ms':>12} {'ratio':>7}")
+    for key, seconds in results.items():
+        if key not in baseline:
+            continue
+        ratio = seconds / baseline[key]
+        flag = "  REGRESSION" if ratio > 1 + tolerance else ""
+        print(f"{key:<60} {baseline[key] * 1e3:>12.3f} {seconds * 1e3:>12.3f} {ratio:>7.2f}{flag}")
+        if flag:
+            regressions.append((key, baseline[key], seconds))
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--filter", default="*", help="Glob on benchmark names, e.g. 'count_*'.")
+    parser.add_argument("--teams", type=int, nargs="+", default=list(LEAGUE_SIZES), help="League sizes.")
+    parser.add_argument("--population", type=int, nargs="+", default=list(POPULATION_SIZES), help="Population sizes.")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--save", help="Write the timings to this JSON baseline file.")
+    parser.add_argument("--compare", help="Baseline JSON file to check for regressions.")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown before failing (0.25 = 25%%).")
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.filter, args.teams, args.population, args.repeats)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump({
+                "machine": {"python": platform.python_version(), "numpy": np.__version__,
+                            "platform": platform.platform()},
+                "results": results,
+            }, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, "r") as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} benchmark(s) regressed by more than {args.tolerance:.0%}")
+            sys.exit(1)
@@ -0,0 +1,39 @@
+"""
+Speedup of process-pool fitness evaluation as the worker count grows.
+
+Run from the repository root:
+    python -m benchmarks.bench_parallel --teams 80 --population 2000
+"""
+import argparse
+import os
+import numpy as np
+from benchmarks.common import best_time, scaled_constraints
+from src.ga.fitness import evaluate_population
+from src.ga.parallel import ParallelEvaluator
+from src.ga.population import initialize_encoded_population
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--teams", type=int, default=60)
+    parser.add_argument("--population", type=int, default=2000)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    constraints = scaled_constraints(args.teams)
+    population = initialize_encoded_population(constraints, args.population)
+    expected = evaluate_population(population, constraints)
+
+    serial = best_time(lambda: evaluate_population(population, constraints), args.repeats)
+    print(f"{args.teams} teams, {population.shape[1]} matches, population {args.population}")
+    print(f"{'workers':>8} {'seconds':>10} {'speedup':>8}")
+    print(f"{'serial':>8} {serial:>10.4f} {1.0:>8.2f}")
+
+    workers = 1
+    while workers <= args.max_workers:
+        with ParallelEvaluator(constraints, workers, args.population) as evaluate:
+            assert np.array_equal(evaluate(population), expected)
+            elapsed = best_time(lambda: evaluate(population), args.repeats)
+        print(f"{workers:>8} {elapsed:>10.4f} {serial / elapsed:>8.2f}")
+        workers *= 2
@@ -0,0 +1,37 @@
+"""Shared helpers for the benchmark scripts."""
+import json
+import time
+
+
+def scaled_constraints(n_teams):
+    """The saved constraints with the team list extended to `n_teams` teams."""
+    with open("data/data.json", "r") as f:
+        constraints = json.load(f)
+    constraints["teams"] = [{"TeamID": i + 1, "TeamName": f"Team {i + 1}"} for i in range(n_teams)]
+    return constraints
+
+
+def best_time(fn, repeats, min_duration=0.05):
+    """
+    Best per-call time of `fn` over `repeats` rounds.
+
+    Each round calls `fn` enough times to last at least `min_duration` seconds,
+    so fast functions are not dominated by timer resolution.
+    """
+    calls = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(calls):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_duration:
+            break
+        calls *= 2
+
+    timings = [elapsed / calls]
+    for _ in range(repeats - 1):
+        start = time.perf_counter()
+        for _ in range(calls):
+            fn()
+        timings.append((time.perf_counter() - start) / calls)
+    return min(timings)
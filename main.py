@@ -1,66 +1,72 @@
-import pandas as pd
-from src.ga.scheduler import genetic_algorithm
-from src.utils.visualizer import visualize_schedule
-from src.utils.helper import sort_schedule , parse_input_data
+"""
+Schedule one tournament from the command line.
 
+Run from the repository root:
+    python main.py --constraints data/data.json --population 200 --generations 100 --seed 0 --output best_schedule.csv
 
+Every setting is a flag, so scripts can call it without prompts. pandas, pyarrow
+and matplotlib are only imported when --output or --plot asks for them.
+"""
+import argparse
+import logging
+import os
+from src.ga.scheduler import (
+    CROSSOVER_METHODS, MUTATION_METHODS, SELECTION_METHODS, SURVIVOR_STRATEGIES, genetic_algorithm
+)
+from src.utils.helper import parse_input_data, sort_schedule
 
-if __name__ == "__main__":
-    # Load input data
-
-    with open("data\\data.json", "r") as f:
-        constraints = parse_input_data(f)
 
-    crossovar_method = int(input("Enter crossover method (1 for PMX, 2 for Order): "))
-    if crossovar_method == 1:
-        crossover_method = "PMX_Crossover"
-    elif crossovar_method == 2:
-        crossover_method = "order_crossover"
-    else:
-        raise ValueError("Invalid crossover method selected.")
-    mutation_method = int(input("Enter mutation method (1 for Random, 2 for Swapping): "))
-    if mutation_method == 1:
-        mutation_method = "attribute_level_mutation"
-    elif mutation_method == 2:
-        mutation_method = "swap_mutation"
-    else:
-        raise ValueError("Invalid mutation method selected.")
-    survivor_strategy = int(input("Enter survivor strategy (1 for elitism, 2 for genitor): "))
-    if survivor_strategy == 1:  
-        survivor_strategy = "elitism"
-    elif survivor_strategy == 2:
-        survivor_strategy = "genitor"
-    else:
-        raise ValueError("Invalid survivor strategy selected.")
-    
-    selection_method = int(input("Enter Selection method (1 for Tournament, 2 for Rank Based): "))
-    if selection_method == 1:
-        selection_method = "tournament_selection"
-    elif selection_method == 2:
-        selection_method = "rank_based_selection"
-    else:
-        raise ValueError("Invalid Selection method selected.")
-    
-    population_size = int(input("Enter population size: "))
-    generations_size = int(input("Enter generations size: "))
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--constraints", default=os.path.join("data", "data.json"), help="Constraints JSON file.")
+    parser.add_argument("--crossover", choices=CROSSOVER_METHODS, default="PMX_Crossover")
+    parser.add_argument("--mutation", choices=MUTATION_METHODS, default="swap_mutation")
+    parser.add_argument("--selection", choices=SELECTION_METHODS, default="tournament_selection")
+    parser.add_argument("--survivor", choices=SURVIVOR_STRATEGIES, default="elitism")
+    parser.add_argument("--population", type=int, default=200, help="Population size.")
+    parser.add_argument("--generations", type=int, default=100, help="Generation cap.")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed for a reproducible run.")
+    parser.add_argument("--output", help="Write the best schedule to this .csv, .parquet or .arrow file.")
+    parser.add_argument("--plot", action="store_true", help="Show the best schedule as a matplotlib table.")
+    parser.add_argument("--quiet", action="store_true", help="Do not log progress every generation.")
+    args = parser.parse_args(argv)
 
-    best_schedule, best_fitness, venue_violations, rest_period_violations, time_violations_details, generations_graph = genetic_algorithm(constraints, population_size=population_size, generations_size=generations_size, crossover_method=crossover_method, mutation_method=mutation_method,selection_method=selection_method,survivor_strategy=survivor_strategy)
+    if args.output:
+        # Reject an unsupported suffix now rather than after the whole run
+        from src.utils.export import export_format
+        try:
+            export_format(args.output)
+        except ValueError as error:
+            parser.error(str(error))
+    return args
 
-    print(f"Best fitness: {best_fitness}")
-    print(f"Venue violations: {venue_violations}")
-    print(f"Rest period violations: {rest_period_violations}")
 
+def main(argv=None):
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.WARNING if args.quiet else logging.INFO, format="%(message)s")
 
-    df = pd.DataFrame(best_schedule, columns=["Team1", "Team2", "Venue", "Day", "Time Slot", "Week"])
+    with open(args.constraints, "r") as f:
+        constraints = parse_input_data(f)
 
+    best_schedule, best_fitness, venue_violations, rest_period_violations, time_violations_details, generations_graph = genetic_algorithm(
+        constraints, population_size=args.population, generations_size=args.generations,
+        crossover_method=args.crossover, mutation_method=args.mutation, selection_method=args.selection,
+        survivor_strategy=args.survivor, seed=args.seed,
+    )
 
-    df['Team1'] = df['Team1'].apply(lambda x: x.get('TeamName') if isinstance(x, dict) else x)
-    df['Team2'] = df['Team2'].apply(lambda x: x.get('TeamName') if isinstance(x, dict) else x)
-    df['Venue'] = df['Venue'].apply(lambda x: x.get('VenueName') if isinstance(x, dict) else x)
+    print(f"Best fitness: {best_fitness}")
+    print(f"Venue violations: {venue_violations}")
+    print(f"Rest period violations: {rest_period_violations}")
 
+    if args.output:
+        from src.ga.encoding import encode_schedule
+        from src.utils.export import MAIN_COLUMNS, write_schedules
+        write_schedules(args.output, encode_schedule(best_schedule, constraints), constraints, columns=MAIN_COLUMNS)
 
+    if args.plot:
+        from src.utils.visualizer import visualize_schedule
+        visualize_schedule(sort_schedule(best_schedule), venue_violations, rest_period_violations, constraints)
 
-    df.to_csv(f"best_schedule.csv", index=False)
 
-    # Visualize the schedule
-    visualize_schedule(sort_schedule(best_schedule), venue_violations, rest_period_violations, constraints)
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+from collections import OrderedDict
+import hashlib
+import numpy as np
+
+
+class FitnessCache:
+    """
+    Bounded LRU cache of fitness scores keyed by a hash of the encoded chromosome.
+
+    Keys only cover the genes, so a cache must only ever score one set of constraints;
+    `bind` ties it to the fingerprint of a `ConstraintModel` and rejects any other.
+
+    :param max_size: Maximum number of scores kept; the least recently used entry is evicted first.
+    """
+
+    def __init__(self, max_size=100_000):
+        if max_size < 1:
+            raise ValueError("Cache size must be at least 1.")
+        self.max_size = max_size
+        self.fingerprint = None
+        self.hits = 0
+        self.misses = 0
+        self._scores = OrderedDict()
+
+    def __len__(self):
+        return len(self._scores)
+
+    def bind(self, fingerprint):
+        """
+        Tie the cache to the constraints its scores are computed against.
+
+        :param fingerprint: `ConstraintModel.fingerprint` of the constraints.
+        :raises ValueError: If the cache is already bound to different constraints.
+        """
+        if self.fingerprint is None:
+            self.fingerprint = fingerprint
+        elif self.fingerprint != fingerprint:
+            raise ValueError("FitnessCache holds scores for different constraints; use a new cache.")
+
+    @staticmethod
+    def key(individual):
+        """
+        Hash an encoded individual into a compact cache key.
+
+        :param individual: Encoded individual of shape (matches, 4).
+        :return: 16-byte digest of the gene buffer.
+        """
+        return hashlib.blake2b(np.ascontiguousarray(individual).data, digest_size=16).digest()
+
+    def get(self, key):
+        """
+        Look up a score and mark it as recently used.
+
+        :param key: Key produced by `FitnessCache.key`.
+        :return: The cached score, or None when missing.
+        """
+        score = self._scores.get(key)
+        if score is None:
+            self.misses += 1
+            return None
+        self._scores.move_to_end(key)
+        self.hits += 1
+        return score
+
+    def put(self, key, score):
+        """
+        Store a score, evicting the least recently used entry when full.
+
+        :param key: Key produced by `FitnessCache.key`.
+        :param score: Fitness score to store.
+        """
+        self._scores[key] = score
+        self._scores.move_to_end(key)
+        if len(self._scores) > self.max_size:
+            self._scores.popitem(last=False)
+
+    def evaluate(self, population, evaluate_fn):
+        """
+        Score a population, evaluating only the individuals that are not cached.
+
+        Identical chromosomes in the same batch are evaluated once.
+
+        :param population: Encoded population of shape (population, matches, 4).
+        :param evaluate_fn: Batch evaluator, e.g. a partial of `evaluate_population`.
+        :return: Integer array with one fitness score per individual.
+        """
+        scores = np.empty(len(population), dtype=np.int64)
+        pending = {}
+
+        for i, individual in enumerate(population):
+            key = self.key(individual)
+            if key in pending:
+                pending[key].append(i)
+                self.hits += 1
+                continue
+            score = self.get(key)
+            if score is None:
+                pending[key] = [i]
+            else:
+                scores[i] = score
+
+        if pending:
+            first_indices = [indices[0] for indices in pending.values()]
+            fresh_scores = evaluate_fn(population[first_indices])
+            for (key, indices), score in zip(pending.items(), fresh_scores.tolist()):
+                scores[indices] = score
+                self.put(key, score)
+
+        return scores
+
+    def stats(self):
+        """
+        Summary of cache effectiveness.
+
+        :return: Dictionary with hits, misses, hit rate and current size.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "size": len(self._scores),
+            "max_size": self.max_size,
+        }
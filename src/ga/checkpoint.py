@@ -0,0 +1,160 @@
+import json
+import os
+import random
+import threading
+import numpy as np
+
+# Run settings stored with a checkpoint so a resumed run uses the same operators
+CONFIG_KEYS = ("population_size", "generations_size", "crossover_method", "mutation_method",
+               "selection_method", "survivor_strategy")
+
+
+def capture_state(generation, population, fitness_scores, best_fitness, best_individual, history, config,
+                  stuck_keys=()):
+    """
+    Copy everything needed to continue a run into a checkpoint state.
+
+    Arrays are copied so the generation loop can keep changing its own in place.
+
+    :param generation: Number of the generation that just finished.
+    :param population: Encoded population of shape (population, matches, 4).
+    :param fitness_scores: Fitness scores of the population.
+    :param best_fitness: Best fitness found so far.
+    :param best_individual: Best encoded individual found so far.
+    :param history: Best fitness per generation up to and including `generation`.
+    :param config: Dict of run settings keyed by `CONFIG_KEYS`.
+    :param stuck_keys: Individuals a `LocalSearch` is skipping, from its `stuck_keys`.
+    :return: Checkpoint state dict, as read back by `load_checkpoint`.
+    """
+    return {
+        "generation": generation,
+        "population": population.copy(),
+        "fitness_scores": list(fitness_scores),
+        "best_fitness": best_fitness,
+        "best_individual": best_individual.copy(),
+        "history": list(history),
+        "config": {key: config[key] for key in CONFIG_KEYS},
+        "random_state": random.getstate(),
+        "numpy_state": np.random.get_state(),
+        "stuck_keys": list(stuck_keys),
+    }
+
+
+def restore_random_state(state):
+    """Put `random` and `numpy.random` back to where they were when `state` was captured."""
+    random.setstate(state["random_state"])
+    np.random.set_state(state["numpy_state"])
+
+
+def save_checkpoint(path, state):
+    """
+    Write a checkpoint state to an .npz file.
+
+    The file is written next to `path` and renamed over it, so a crash mid-write
+    leaves the previous checkpoint intact.
+
+    :param path: Checkpoint file path.
+    :param state: State dict from `capture_state`.
+    """
+    version, mt_state, gauss_next = state["random_state"]
+    algorithm, keys, position, has_gauss, cached_gaussian = state["numpy_state"]
+
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "wb") as f:
+        np.savez(
+            f,
+            generation=state["generation"],
+            population=state["population"],
+            fitness_scores=np.asarray(state["fitness_scores"], dtype=np.int64),
+            best_fitness=state["best_fitness"],
+            best_individual=state["best_individual"],
+            history=np.asarray(state["history"], dtype=np.int64),
+            config=json.dumps(state["config"]),
+            random_version=version,
+            random_state=np.asarray(mt_state, dtype=np.uint32),
+            random_gauss=np.nan if gauss_next is None else gauss_next,
+            numpy_algorithm=algorithm,
+            numpy_keys=keys,
+            numpy_position=position,
+            numpy_has_gauss=has_gauss,
+            numpy_gauss=cached_gaussian,
+            stuck_keys=np.array([key.hex() for key in state["stuck_keys"]], dtype=str),
+        )
+    os.replace(temp_path, path)
+
+
+def load_checkpoint(path):
+    """
+    Read a checkpoint written by `save_checkpoint`.
+
+    :param path: Checkpoint file path.
+    :return: State dict with the same keys and Python types as `capture_state` produces.
+    """
+    with np.load(path, allow_pickle=False) as data:
+        gauss_next = float(data["random_gauss"])
+        return {
+            "generation": int(data["generation"]),
+            "population": data["population"],
+            "fitness_scores": data["fitness_scores"].tolist(),
+            "best_fitness": int(data["best_fitness"]),
+            "best_individual": data["best_individual"],
+            "history": data["history"].tolist(),
+            "config": json.loads(str(data["config"])),
+            "random_state": (int(data["random_version"]), tuple(data["random_state"].tolist()),
+                             None if np.isnan(gauss_next) else gauss_next),
+            "numpy_state": (str(data["numpy_algorithm"]), data["numpy_keys"], int(data["numpy_position"]),
+                            int(data["numpy_has_gauss"]), float(data["numpy_gauss"])),
+            # Checkpoints written before local search was checkpointed have no stuck keys
+            "stuck_keys": [bytes.fromhex(key) for key in data["stuck_keys"].tolist()] if "stuck_keys" in data else [],
+        }
+
+
+class CheckpointWriter:
+    """
+    Writes checkpoints on a background thread so the generation loop does not wait for the disk.
+
+    At most one write is in flight: submitting a new state first waits for the previous
+    write, and `close` waits for the last one.
+
+    :param path: Checkpoint file path; every write replaces it.
+    :param interval: Write a checkpoint every this many generations.
+    """
+
+    def __init__(self, path, interval=10):
+        if interval < 1:
+            raise ValueError("Checkpoint interval must be at least 1.")
+        self.path = path
+        self.interval = interval
+        self._thread = None
+        self._error = None
+
+    def due(self, generation):
+        return generation % self.interval == 0
+
+    def submit(self, state):
+        """
+        Start writing a state captured with `capture_state`.
+
+        :param state: Checkpoint state dict; it must not be modified afterwards.
+        """
+        self.wait()
+        self._thread = threading.Thread(target=self._write, args=(state,), daemon=True)
+        self._thread.start()
+
+    def wait(self):
+        """Wait for the write in flight, re-raising any error it hit."""
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def close(self):
+        self.wait()
+
+    def _write(self, state):
+        try:
+            save_checkpoint(self.path, state)
+        except Exception as error:
+            self._error = error
@@ -0,0 +1,255 @@
+from collections import OrderedDict
+from functools import cached_property
+import hashlib
+import json
+import numpy as np
+from src.ga.encoding import VENUE, DAY, SLOT, WEEK, build_match_table
+
+# Weekday name to its offset within a week
+DAY_INDEX = {
+    "Monday": 0, "Tuesday": 1, "Wednesday": 2,
+    "Thursday": 3, "Friday": 4, "Saturday": 5, "Sunday": 6
+}
+
+# Default for `team_constraints.max_matches_per_time_slot`: a team may use one slot this often
+DEFAULT_TIME_SLOT_LIMIT = 3
+
+# Constraint kernels by name, in registration order
+KERNELS = {}
+
+# Most models `compiled_model` keeps, least recently used evicted first
+MAX_COMPILED_MODELS = 8
+_compiled_models = OrderedDict()
+
+
+def kernel(name):
+    """Register a function as the kernel of the constraint `name`."""
+    def register(function):
+        KERNELS[name] = function
+        return function
+    return register
+
+
+def absolute_day_table(constraints):
+    """
+    Absolute day number (week * 7 + weekday) for every encoded (week, day) pair.
+
+    :param constraints: The constraints dictionary.
+    :return: Integer array of shape (weeks, days).
+    """
+    day_offsets = np.array([DAY_INDEX[day] for day in constraints['days']], dtype=np.int64)
+    week_values = np.array([int(week) for week in constraints['weeks']], dtype=np.int64)
+    return week_values[:, None] * 7 + day_offsets[None, :]
+
+
+class ConstraintModel:
+    """
+    The constraints JSON compiled once into lookup arrays and thresholds.
+
+    Every constraint type is a kernel registered with `@kernel`: a function of the
+    model and a `PopulationArrays` that counts its violations for a whole encoded
+    population with array operations. Kernels share the per-population arrays, so
+    the (team, day) keys several of them need are only built and sorted once.
+
+    Enforced constraints:
+
+    - ``venue``: every match beyond the first at a venue on the same day.
+    - ``rest``: consecutive matches of a team less than `rest_periods.minimum_hours` apart.
+    - ``time``: a team using one time slot more than `team_constraints.max_matches_per_time_slot`
+      times (default 3) costs the number of uses minus one.
+    - ``matches_per_day``: every match of a team beyond `team_constraints.max_matches_per_day` on one day.
+    - ``consecutive``: every match of a team beyond `max_consecutive_matches` in a run of matches
+      on the same or consecutive days.
+    - ``repeats``: with `team_constraints.avoid_repeats`, every repeated pairing of two teams.
+      The genes never change which teams meet, so this is a property of the match table;
+      the kernel is only registered when the table pairs some teams more than once, which
+      `build_match_table` never does.
+
+    The last three are only enforced when their field is present in the JSON.
+
+    :param constraints: The constraints dictionary.
+    :param match_table: Optional precomputed match table.
+    """
+
+    def __init__(self, constraints, match_table=None):
+        if match_table is None:
+            match_table = build_match_table(constraints)
+
+        team_constraints = constraints.get("team_constraints", {})
+
+        self.constraints = constraints
+        self.match_table = np.asarray(match_table)
+        self.team_ids = np.array([team['TeamID'] for team in constraints['teams']])
+        self.venue_ids = np.array([venue['VenueID'] for venue in constraints['venues']])
+        self.day_indices = np.array([DAY_INDEX[day] for day in constraints['days']], dtype=np.int64)
+        self.weeks = np.array([int(week) for week in constraints['weeks']], dtype=np.int64)
+        self.absolute_days = self.weeks[:, None] * 7 + self.day_indices[None, :]
+
+        self.n_teams = len(self.team_ids)
+        self.n_slots = len(constraints['time_slots'])
+        self.n_days = int(self.absolute_days.max(initial=0)) + 1
+        # Team of every (match, side) entry: first teams of all matches, then second teams
+        self.teams = np.concatenate([self.match_table[:, 0], self.match_table[:, 1]]).astype(np.int64)
+        # (team, day) keys sort by team first, so the team at each sorted position never depends on the days
+        sorted_teams = np.sort(self.teams)
+        self.same_team = sorted_teams[1:] == sorted_teams[:-1]
+
+        self.min_rest_days = constraints.get("rest_periods", {}).get("minimum_hours", 72) // 24
+        self.time_slot_limit = team_constraints.get("max_matches_per_time_slot", DEFAULT_TIME_SLOT_LIMIT)
+        self.max_matches_per_day = team_constraints.get("max_matches_per_day")
+        self.max_consecutive_matches = constraints.get("max_consecutive_matches")
+        self.avoid_repeats = bool(team_constraints.get("avoid_repeats", False))
+
+        for name in ("max_matches_per_day", "max_consecutive_matches"):
+            if getattr(self, name) is not None and getattr(self, name) < 1:
+                raise ValueError(f"{name} must be at least 1.")
+
+        self.repeated_pairs = 0
+        if self.avoid_repeats:
+            pairs = np.unique(np.sort(self.match_table, axis=1), axis=0)
+            self.repeated_pairs = len(self.match_table) - len(pairs)
+
+        enabled = {
+            "matches_per_day": self.max_matches_per_day is not None,
+            "consecutive": self.max_consecutive_matches is not None,
+            "repeats": self.repeated_pairs > 0,
+        }
+        self.kernels = {name: function for name, function in KERNELS.items() if enabled.get(name, True)}
+
+    @cached_property
+    def fingerprint(self):
+        """Hash identifying the constraints and match table that scores were computed against."""
+        return hashlib.blake2b(
+            json.dumps(self.constraints, sort_keys=True, default=str).encode() + self.match_table.tobytes(),
+            digest_size=16
+        ).hexdigest()
+
+    def count_violations(self, population):
+        """
+        Violation counts per enforced constraint and individual.
+
+        :param population: Encoded population of shape (population, matches, 4).
+        :return: Dict of constraint name to an integer array with one count per individual.
+        """
+        arrays = PopulationArrays(self, population)
+        return {name: function(self, arrays) for name, function in self.kernels.items()}
+
+    def evaluate(self, population):
+        """
+        Fitness of an encoded population: minus the total number of violations.
+
+        :param population: Encoded population of shape (population, matches, 4).
+        :return: Integer array with one fitness score per individual.
+        """
+        counts = self.count_violations(population)
+        return -sum(counts.values(), np.zeros(len(population), dtype=np.int64))
+
+
+def compiled_model(constraints, match_table=None):
+    """
+    The `ConstraintModel` of a constraints dict, compiled on the first call and reused after.
+
+    Models are cached by the identity of `constraints` (and `match_table`), so the
+    convenience wrappers in `fitness` do not recompile on every call. A constraints
+    dict must not be modified once it has been compiled.
+
+    :param constraints: The constraints dictionary.
+    :param match_table: Optional precomputed match table.
+    :return: The compiled `ConstraintModel`.
+    """
+    key = (id(constraints), None if match_table is None else id(match_table))
+    entry = _compiled_models.get(key)
+    # The entry holds its inputs, so their ids cannot be reused by other objects while it is cached
+    if entry is not None and entry[0] is constraints and entry[1] is match_table:
+        _compiled_models.move_to_end(key)
+        return entry[2]
+
+    model = ConstraintModel(constraints, match_table)
+    _compiled_models[key] = (constraints, match_table, model)
+    if len(_compiled_models) > MAX_COMPILED_MODELS:
+        _compiled_models.popitem(last=False)
+    return model
+
+
+class PopulationArrays:
+    """
+    Arrays derived from an encoded population, built on first use and shared by all kernels.
+
+    :param model: The `ConstraintModel` the population is scored against.
+    :param population: Encoded population of shape (population, matches, 4).
+    """
+
+    def __init__(self, model, population):
+        self.model = model
+        self.population = np.asarray(population)
+
+    @cached_property
+    def venues(self):
+        return self.population[..., VENUE].astype(np.int64)
+
+    @cached_property
+    def slots(self):
+        return self.population[..., SLOT].astype(np.int64)
+
+    @cached_property
+    def days(self):
+        """Absolute day of every match."""
+        return self.model.absolute_days[self.population[..., WEEK], self.population[..., DAY]]
+
+    @cached_property
+    def team_days(self):
+        """Sorted (team, absolute day) keys of every team entry, so each team's match days are adjacent."""
+        days = np.concatenate([self.days, self.days], axis=1)
+        return np.sort(self.model.teams * self.model.n_days + days, axis=1)
+
+    @cached_property
+    def day_gaps(self):
+        """Days between neighbouring entries of `team_days`; only meaningful where `model.same_team` holds."""
+        return np.diff(self.team_days, axis=1)
+
+
+@kernel("venue")
+def venue_conflicts(model, arrays):
+    # Every repeated (venue, day) key beyond the first is a conflict
+    venue_keys = np.sort(arrays.venues * model.n_days + arrays.days, axis=1)
+    return np.count_nonzero(np.diff(venue_keys, axis=1) == 0, axis=1)
+
+
+@kernel("rest")
+def rest_violations(model, arrays):
+    return np.count_nonzero(model.same_team & (arrays.day_gaps < model.min_rest_days), axis=1)
+
+
+@kernel("time")
+def time_imbalances(model, arrays):
+    # Histogram of (team, slot) per individual
+    n_keys = model.n_teams * model.n_slots
+    team_slots = model.teams * model.n_slots + np.concatenate([arrays.slots, arrays.slots], axis=1)
+    offsets = np.arange(len(team_slots))[:, None] * n_keys
+    slot_counts = np.bincount((team_slots + offsets).ravel(), minlength=len(team_slots) * n_keys)
+    slot_counts = slot_counts.reshape(len(team_slots), -1)
+    return np.where(slot_counts > model.time_slot_limit, slot_counts - 1, 0).sum(axis=1)
+
+
+@kernel("matches_per_day")
+def day_overloads(model, arrays):
+    # In the sorted keys an entry equal to the one `limit` places before it is beyond the limit for its day
+    limit = model.max_matches_per_day
+    return np.count_nonzero(arrays.team_days[:, limit:] == arrays.team_days[:, :-limit], axis=1)
+
+
+@kernel("consecutive")
+def consecutive_overruns(model, arrays):
+    # Link neighbouring matches of a team no more than a day apart; a run of L matches has L - 1 links
+    # and L - limit of its matches end a window of `limit` links in a row
+    limit = model.max_consecutive_matches
+    links = model.same_team & (arrays.day_gaps <= 1)
+    windows = links
+    for shift in range(1, limit):
+        windows = windows[:, :-1] & links[:, shift:]
+    return np.count_nonzero(windows, axis=1)
+
+
+@kernel("repeats")
+def repeated_pairings(model, arrays):
+    return np.full(len(arrays.population), model.repeated_pairs, dtype=np.int64)
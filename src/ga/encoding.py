@@ -0,0 +1,105 @@
+import numpy as np
+
+
+# Column layout of an encoded gene: one row per match, one column per attribute.
+VENUE, DAY, SLOT, WEEK = range(4)
+GENE_FIELDS = ("venues", "days", "time_slots", "weeks")
+GENE_DTYPE = np.int16
+
+
+def build_match_table(constraints):
+    """
+    Build the fixed table of team pairings shared by every encoded individual.
+
+    Row ``m`` of an encoded individual always describes the match between
+    ``teams[table[m, 0]]`` and ``teams[table[m, 1]]``.
+
+    :param constraints: The constraints dictionary.
+    :return: Integer array of shape (matches, 2) holding team indices.
+    """
+    n_teams = len(constraints['teams'])
+    first, second = np.triu_indices(n_teams, k=1)
+    return np.stack([first, second], axis=1).astype(GENE_DTYPE)
+
+
+def field_sizes(constraints):
+    """
+    Number of possible values for each gene column (venue, day, slot, week).
+
+    :param constraints: The constraints dictionary.
+    :return: Integer array of length 4.
+    """
+    return np.array([len(constraints[field]) for field in GENE_FIELDS])
+
+
+def encode_schedule(schedule, constraints):
+    """
+    Convert a readable schedule into its integer encoding.
+
+    :param schedule: List of matches in format (team1, team2, venue, day, time_slot, week).
+    :param constraints: The constraints dictionary.
+    :return: Integer array of shape (matches, 4) ordered like the match table.
+    """
+    teams = constraints['teams']
+    team_index = {team['TeamID']: i for i, team in enumerate(teams)}
+    venue_index = {venue['VenueID']: i for i, venue in enumerate(constraints['venues'])}
+    day_index = {day: i for i, day in enumerate(constraints['days'])}
+    slot_index = {slot: i for i, slot in enumerate(constraints['time_slots'])}
+    week_index = {week: i for i, week in enumerate(constraints['weeks'])}
+
+    n_teams = len(teams)
+    genes = np.zeros((n_teams * (n_teams - 1) // 2, 4), dtype=GENE_DTYPE)
+    for team1, team2, venue, day, time_slot, week in schedule:
+        i, j = sorted((team_index[team1['TeamID']], team_index[team2['TeamID']]))
+        # Row of pair (i, j) in the upper-triangular match table
+        row = i * n_teams - i * (i + 1) // 2 + (j - i - 1)
+        genes[row] = (venue_index[venue['VenueID']], day_index[day], slot_index[time_slot], week_index[week])
+
+    return genes
+
+
+def decode_schedule(genes, constraints, match_table=None):
+    """
+    Convert an encoded individual back into a readable schedule.
+
+    :param genes: Integer array of shape (matches, 4).
+    :param constraints: The constraints dictionary.
+    :param match_table: Optional precomputed result of ``build_match_table``.
+    :return: List of matches in format (team1, team2, venue, day, time_slot, week).
+    """
+    if match_table is None:
+        match_table = build_match_table(constraints)
+
+    teams = constraints['teams']
+    venues = constraints['venues']
+    days = constraints['days']
+    time_slots = constraints['time_slots']
+    weeks = constraints['weeks']
+
+    return [
+        (teams[t1], teams[t2], venues[venue], days[day], time_slots[slot], weeks[week])
+        for (t1, t2), (venue, day, slot, week) in zip(match_table.tolist(), genes.tolist())
+    ]
+
+
+def encode_population(population, constraints):
+    """
+    Encode a list of readable schedules into a single population array.
+
+    :param population: List of schedules.
+    :param constraints: The constraints dictionary.
+    :return: Integer array of shape (population, matches, 4).
+    """
+    return np.stack([encode_schedule(individual, constraints) for individual in population])
+
+
+def decode_population(population, constraints):
+    """
+    Decode a population array into readable schedules.
+
+    :param population: Integer array of shape (population, matches, 4).
+    :param constraints: The constraints dictionary.
+    :return: List of schedules.
+    """
+    match_table = build_match_table(constraints)
+    return [decode_schedule(genes, constraints, match_table) for genes in population]
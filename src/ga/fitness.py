@@ -1,5 +1,10 @@
 from collections import defaultdict
-import pandas as pd
+from operator import eq
+from src.ga.constraint_model import DAY_INDEX, DEFAULT_TIME_SLOT_LIMIT, compiled_model
+from src.ga.encoding import decode_schedule
+
+# Constraints scored on top of the venue, rest and time counters of `evaluate_fitness`
+TEAM_CONSTRAINTS = ("matches_per_day", "consecutive", "repeats")
 
 
 def count_venue_conflicts(schedule):
@@ -30,41 +35,53 @@ def count_venue_conflicts(schedule):
     return total_venue_violations, violation_details
 
 
-def count_rest_violations(schedule, constraints):
+def team_match_days(schedule):
     """
-    Count rest period violations for teams using a pure Python approach.
+    Absolute match days (week * 7 + weekday) of every team, in ascending order.
 
     :param schedule: The schedule to evaluate, where each match is a tuple:
                      (team1, team2, venue, day, timeslot, week).
-    :param constraints: The constraints dictionary.
-    :return: The total number of rest period violations.
-    :return: Details of rest period violations.
+    :return: Dict of team name to its sorted list of match days.
     """
-    # Minimum rest period in days (default to 3 days if not specified)
-    min_rest_days = constraints.get("rest_periods", {}).get("minimum_hours", 72) // 24
-
-    # Day name to index
-    day_to_index = {
-        "Monday": 0, "Tuesday": 1, "Wednesday": 2,
-        "Thursday": 3, "Friday": 4, "Saturday": 5, "Sunday": 6
-    }
-
-    # Organize matches by team
     team_schedule = defaultdict(list)
 
     for match in schedule:
         team1, team2, _, day, _, week = match
-        day_index = day_to_index[day]
+        day_index = DAY_INDEX[day]
         absolute_day = int(week) * 7 + day_index
 
         team_schedule[team1.get("TeamName")].append(absolute_day)
         team_schedule[team2.get("TeamName")].append(absolute_day)
 
+    for days in team_schedule.values():
+        days.sort()
+    return team_schedule
+
+
+def count_rest_violations(schedule, constraints, min_rest_days=None, team_days=None):
+    """
+    Count rest period violations for teams using a pure Python approach.
+
+    :param schedule: The schedule to evaluate, where each match is a tuple:
+                     (team1, team2, venue, day, timeslot, week).
+    :param constraints: The constraints dictionary.
+    :param min_rest_days: Optional precomputed minimum rest in days, e.g. `ConstraintModel.min_rest_days`.
+    :param team_days: Optional result of `team_match_days` for the schedule.
+    :return: The total number of rest period violations.
+    :return: Details of rest period violations.
+    """
+    # Minimum rest period in days (default to 3 days if not specified)
+    if min_rest_days is None:
+        min_rest_days = constraints.get("rest_periods", {}).get("minimum_hours", 72) // 24
+
+    # Organize matches by team
+    if team_days is None:
+        team_days = team_match_days(schedule)
+
     # Calculate rest period violations
     total_violations = 0
     violation_details = []
-    for team, days in team_schedule.items():
-        sorted_days = sorted(days)
+    for team, sorted_days in team_days.items():
         for i in range(1, len(sorted_days)):
             rest_period = sorted_days[i] - sorted_days[i - 1]
             if rest_period < min_rest_days:
@@ -78,13 +95,14 @@ def count_rest_violations(schedule, constraints):
 
     return total_violations, violation_details
 
-def count_time_imbalances(schedule):
+def count_time_imbalances(schedule, limit=DEFAULT_TIME_SLOT_LIMIT):
     """
     Count imbalances where a team is scheduled to play in the same time slot
     too frequently across the entire schedule.
 
     :param schedule: The schedule to evaluate, where each match is represented as a tuple:
                      (team1, team2, venue, day, timeslot, week).
+    :param limit: Number of matches a team may play in one time slot.
     :return: The total imbalance score for uneven distribution of time slots.
     :return: Details of time slot violations.
     """
@@ -104,120 +122,128 @@ def count_time_imbalances(schedule):
         team_time_slots[team2][time_slot] = team_time_slots[team2].get(time_slot, 0) + 1
 
     imbalance_score = 0
-    violatioan_details = []
+    violation_details = []
     for team, time_slot_counts in team_time_slots.items():
-        for count in time_slot_counts.values():
-            if count > 3:
+        for time_slot, count in time_slot_counts.items():
+            if count > limit:
                 imbalance_score += count - 1
-                violatioan_details.append({
+                violation_details.append({
                     "team": team,
                     "time_slot": time_slot,
                     "count": count
                 })
 
-    return imbalance_score, violatioan_details
-
-
-def count_venue_conflicts_withpd(df, constraints):
-    """
-    Count venue conflicts based on the schedule.
-
-    :param individual: The schedule to evaluate, where each match contains:
-                       (team1, team2, venue, day, timeslot, week).
-    :param constraints: The constraints dictionary (not used in this implementation but can be extended).
-    :return: The number of venue conflicts and detailed conflict information.
-    """
-    df['VenueKey'] = df.apply(lambda row: (row['Venue'], row['Week'], row['Day']), axis=1)
-
-    # Count occurrences of each (Venue, Week, Day)
-    venue_usage_counts = df['VenueKey'].value_counts()
-
-    # Identify conflicts (more than one match scheduled for the same (Venue, Week, Day))
-    venue_violations = venue_usage_counts[venue_usage_counts > 1]
-
-    # Total conflicts (subtract 1 for each over-scheduled venue)
-    total_venue_violations = sum(venue_violations - 1)
-
-    # Detailed conflict information
-    violation_details = venue_violations.reset_index()
-    violation_details.columns = ['(Venue, Week, Day)', 'MatchesScheduled']
-
-
+    return imbalance_score, violation_details
 
-    return total_venue_violations
 
-
-def count_rest_violations_withpd(df, constraints):
+def count_team_constraint_violations(schedule, model, team_days=None):
     """
-    Count rest period violations for teams using a pandas-based approach.
+    Count violations of the team constraints a `ConstraintModel` enforces, with the same
+    rules as its ``matches_per_day``, ``consecutive`` and ``repeats`` kernels.
 
     :param schedule: The schedule to evaluate, where each match is a tuple:
                      (team1, team2, venue, day, timeslot, week).
-    :param constraints: The constraints dictionary.
-    :return: The total number of rest period violations.
+    :param model: Compiled `ConstraintModel` of the schedule's constraints.
+    :param team_days: Optional result of `team_match_days` for the schedule.
+    :return: Dict of constraint name to violation count, for the enforced team constraints only.
     """
-    # Minimum rest period in days (default to 3 days if not specified)
-    min_rest_days = constraints.get("rest_periods", {}).get("minimum_hours", 72) // 24
-
-    # Day name to index
-    day_to_index = {
-        "Monday": 0, "Tuesday": 1, "Wednesday": 2,
-        "Thursday": 3, "Friday": 4, "Saturday": 5, "Sunday": 6
-    }
-
-    df_team1 = df[['Week', 'Day', 'Team1']].rename(columns={'Team1': 'Team'})
-    df_team2 = df[['Week', 'Day', 'Team2']].rename(columns={'Team2': 'Team'})
-    df_all = pd.concat([df_team1, df_team2])
-
-    # Convert Week to int
-    df_all['Week'] = df_all['Week'].astype(int)
-
-    # Add DayIndex and AbsoluteDay
-    df_all['DayIndex'] = df_all['Day'].map(day_to_index)
-    df_all['AbsoluteDay'] = df_all['Week'] * 7 + df_all['DayIndex']
-
+    per_day = model.max_matches_per_day
+    consecutive = model.max_consecutive_matches
+
+    if team_days is None:
+        team_days = team_match_days(schedule)
+
+    counts = {}
+    if per_day is not None:
+        # A day equal to the one `per_day` places before it in the sorted days is beyond the limit
+        counts["matches_per_day"] = sum(sum(map(eq, days[per_day:], days)) for days in team_days.values())
+    if consecutive is not None:
+        overruns = 0
+        for days in team_days.values():
+            run = 1
+            for earlier, later in zip(days, days[1:]):
+                run = run + 1 if later - earlier <= 1 else 1
+                overruns += run > consecutive
+        counts["consecutive"] = overruns
+    if "repeats" in model.kernels:
+        pairs = {frozenset((team1["TeamID"], team2["TeamID"])) for team1, team2, *_ in schedule}
+        counts["repeats"] = len(schedule) - len(pairs)
+    return counts
+
+
+def evaluate_fitness(individual, constraints, model=None, match_table=None):
+    """
+    Fitness function to evaluate the quality of a schedule.
+    :param schedule: The schedule to evaluate.
+    :param constraints: Constraints to consider.
+    :param model: Optional precompiled `ConstraintModel`; taken from `compiled_model` when omitted.
+    :param match_table: Optional precomputed match table, used when the model is looked up here.
+    :return: Fitness score (higher is better), including the team constraints of `ConstraintModel`
+    :return: Details of venue conflicts and rest violations.
+    :return: Details of rest period violations.
+    """
+    if model is None:
+        model = compiled_model(constraints, match_table)
 
+    score = 0
 
-    total_violations = 0
-    for team, group in df_all.groupby('Team'):
-        sorted_days = sorted(group['AbsoluteDay'].tolist())
-        for i in range(1, len(sorted_days)):
-            if sorted_days[i] - sorted_days[i - 1] < 3:
-                total_violations += 1
+    total_venue_conflicts, venue_conflicts_details = count_venue_conflicts(individual)
 
-    return total_violations
+    team_days = team_match_days(individual)
 
+    total_rest_violations, rest_violations_details = count_rest_violations(
+        individual, constraints, model.min_rest_days, team_days
+    )
 
+    total_time_imbalances, time_violations_details = count_time_imbalances(individual, model.time_slot_limit)
 
+    total_team_violations = sum(count_team_constraint_violations(individual, model, team_days).values())
 
+    score = score - total_venue_conflicts - total_rest_violations - total_time_imbalances - total_team_violations
 
+    return score, venue_conflicts_details, rest_violations_details, time_violations_details
 
 
-def evaluate_fitness(individual, constraints):
+def evaluate_encoded_fitness(genes, constraints, match_table=None, model=None):
     """
-    Fitness function to evaluate the quality of a schedule.
-    :param schedule: The schedule to evaluate.
+    Fitness function for an encoded individual.
+
+    :param genes: Encoded individual of shape (matches, 4).
     :param constraints: Constraints to consider.
-    :return: Fitness score (higher is better)
-    :return: Details of venue conflicts and rest violations.
-    :return: Details of rest period violations.
+    :param match_table: Optional precomputed match table.
+    :param model: Optional precompiled `ConstraintModel`; taken from `compiled_model` when omitted.
+    :return: Same values as `evaluate_fitness` for the decoded schedule.
     """
-
-    # df = pd.DataFrame(individual, columns=["Team1", "Team2", "Venue", "Day", "Time Slot", "Week"])
-    # df['Team1'] = df['Team1'].apply(lambda x: x['TeamName'] if isinstance(x, dict) else x)
-    # df['Team2'] = df['Team2'].apply(lambda x: x['TeamName'] if isinstance(x, dict) else x)
-    # df['Venue'] = df['Venue'].apply(lambda x: x['VenueName'] if isinstance(x, dict) else x)
+    if model is None:
+        model = compiled_model(constraints, match_table)
+    return evaluate_fitness(decode_schedule(genes, constraints, model.match_table), constraints, model)
 
 
-    score = 0
-
-    total_venue_conflicts, venue_conflicts_details = count_venue_conflicts(individual)
+def evaluate_population(population, constraints, match_table=None):
+    """
+    Fitness function for a whole encoded population in one pass.
 
-    total_rest_violations, rest_violations_details = count_rest_violations(individual, constraints)
+    Scores are identical to running `evaluate_fitness` on every decoded individual,
+    but every constraint is counted with array operations over the population.
+    The `ConstraintModel` comes from `compiled_model`, so repeated calls with the
+    same constraints dict compile it only once.
 
-    total_time_imbalances, time_violations_details = count_time_imbalances(individual)
+    :param population: Encoded population of shape (population, matches, 4).
+    :param constraints: Constraints to consider.
+    :param match_table: Optional precomputed match table.
+    :return: Integer array with one fitness score per individual.
+    """
+    return compiled_model(constraints, match_table).evaluate(population)
 
 
-    score = score - total_venue_conflicts - total_rest_violations - total_time_imbalances
+def count_population_violations(population, constraints, match_table=None):
+    """
+    Violation counts behind `evaluate_population`, per individual and per constraint.
 
-    return score, venue_conflicts_details, rest_violations_details, time_violations_details
\ No newline at end of file
+    :param population: Encoded population of shape (population, matches, 4).
+    :param constraints: Constraints to consider.
+    :param match_table: Optional precomputed match table.
+    :return: Dict of constraint name (venue, rest, time and any enforced team constraints)
+             to an integer array with one count per individual.
+    """
+    return compiled_model(constraints, match_table).count_violations(population)
@@ -0,0 +1,227 @@
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from src.ga.constraint_model import ConstraintModel
+from src.ga.encoding import VENUE, DAY, SLOT, WEEK
+
+
+class IncrementalEvaluator:
+    """
+    Constraint state of one encoded individual that keeps its fitness up to date
+    as genes move, instead of rescoring the whole schedule.
+
+    The state holds the (venue, day) occupancy counts, a sorted list of match days
+    per team and a time slot histogram per team. Changing one gene only touches
+    the entries of its venue and its two teams, so a move costs O(changed genes),
+    plus a pass over the match days of both teams when `max_consecutive_matches`
+    is enforced.
+
+    :param constraints: The constraints dictionary.
+    :param individual: Encoded individual of shape (matches, 4); it is updated in place by every move.
+    :param match_table: Optional precomputed match table.
+    :param model: Optional precompiled `ConstraintModel`; its thresholds and match table are used.
+    """
+
+    def __init__(self, constraints, individual, match_table=None, model=None):
+        if model is None:
+            model = ConstraintModel(constraints, match_table)
+
+        self.individual = individual
+        self.model = model
+        self.match_table = model.match_table.tolist()
+        self.min_rest_days = model.min_rest_days
+        self._absolute_days = model.absolute_days.tolist()
+
+        self.venue_usage = defaultdict(int)
+        self.team_days = [[] for _ in range(model.n_teams)]
+        self.team_slots = [[0] * model.n_slots for _ in range(model.n_teams)]
+        self._team_overruns = [0] * model.n_teams
+
+        self.venue_conflicts = 0
+        self.rest_violations = 0
+        self.time_imbalances = 0
+        self.day_overloads = 0
+        self.consecutive_overruns = 0
+        self.repeated_pairs = model.repeated_pairs
+
+        for match, gene in enumerate(individual.tolist()):
+            self._add(match, gene)
+
+    @property
+    def score(self):
+        """Current fitness score, identical to `evaluate_fitness` on the decoded individual."""
+        return -(self.venue_conflicts + self.rest_violations + self.time_imbalances
+                 + self.day_overloads + self.consecutive_overruns + self.repeated_pairs)
+
+    def move(self, match, gene):
+        """
+        Reassign one match to a new (venue, day, slot, week) gene.
+
+        :param match: Row of the match in the individual.
+        :param gene: New gene as a sequence of four indices.
+        :return: The updated fitness score.
+        """
+        self._remove(match, self.individual[match].tolist())
+        self.individual[match] = gene
+        self._add(match, list(gene))
+        return self.score
+
+    def swap(self, match1, match2):
+        """
+        Exchange the genes of two matches.
+
+        :return: The updated fitness score.
+        """
+        gene1 = self.individual[match1].tolist()
+        gene2 = self.individual[match2].tolist()
+        self.move(match1, gene2)
+        return self.move(match2, gene1)
+
+    def delta(self, match, gene):
+        """
+        Fitness change a move would cause, leaving the individual unchanged.
+
+        :param match: Row of the match in the individual.
+        :param gene: Candidate gene as a sequence of four indices.
+        :return: New score minus current score.
+        """
+        before = self.score
+        old_gene = self.individual[match].tolist()
+        after = self.move(match, gene)
+        self.move(match, old_gene)
+        return after - before
+
+    def venue_free(self, venue, week, day):
+        """Whether no match is scheduled at `venue` on the given encoded week and day."""
+        return self.venue_usage.get((venue, self._absolute_days[week][day]), 0) == 0
+
+    def violating_matches(self):
+        """
+        Matches that take part in a venue conflict, rest violation, time imbalance,
+        day overload or over-long run of consecutive match days.
+
+        :return: List of match rows.
+        """
+        matches = []
+        for match, gene in enumerate(self.individual.tolist()):
+            day = self._absolute_days[gene[WEEK]][gene[DAY]]
+            if self.venue_usage[(gene[VENUE], day)] > 1:
+                matches.append(match)
+                continue
+            for team in self.match_table[match]:
+                if (self._imbalance(self.team_slots[team][gene[SLOT]]) or self._rests_too_little(team, day)
+                        or self._overloaded(team, day) or self._in_long_run(team, day)):
+                    matches.append(match)
+                    break
+        return matches
+
+    def _rests_too_little(self, team, day):
+        days = self.team_days[team]
+        i = bisect_left(days, day)
+        return ((i > 0 and self._too_close(days[i - 1], day))
+                or (i + 1 < len(days) and self._too_close(day, days[i + 1])))
+
+    def _overloaded(self, team, day):
+        limit = self.model.max_matches_per_day
+        days = self.team_days[team]
+        return limit is not None and bisect_right(days, day) - bisect_left(days, day) > limit
+
+    def _in_long_run(self, team, day):
+        limit = self.model.max_consecutive_matches
+        if limit is None:
+            return False
+        days = self.team_days[team]
+        start = end = bisect_left(days, day)
+        while start > 0 and days[start] - days[start - 1] <= 1:
+            start -= 1
+        while end + 1 < len(days) and days[end + 1] - days[end] <= 1:
+            end += 1
+        return end - start + 1 > limit
+
+    def _add(self, match, gene):
+        day = self._absolute_days[gene[WEEK]][gene[DAY]]
+
+        key = (gene[VENUE], day)
+        if self.venue_usage[key] >= 1:
+            self.venue_conflicts += 1
+        self.venue_usage[key] += 1
+
+        for team in self.match_table[match]:
+            self._insert_day(self.team_days[team], day)
+            self._update_overruns(team)
+            self._change_slot(self.team_slots[team], gene[SLOT], 1)
+
+    def _remove(self, match, gene):
+        day = self._absolute_days[gene[WEEK]][gene[DAY]]
+
+        key = (gene[VENUE], day)
+        self.venue_usage[key] -= 1
+        if self.venue_usage[key] >= 1:
+            self.venue_conflicts -= 1
+        elif self.venue_usage[key] == 0:
+            del self.venue_usage[key]
+
+        for team in self.match_table[match]:
+            self._remove_day(self.team_days[team], day)
+            self._update_overruns(team)
+            self._change_slot(self.team_slots[team], gene[SLOT], -1)
+
+    def _too_close(self, earlier, later):
+        return later - earlier < self.min_rest_days
+
+    def _insert_day(self, days, day):
+        i = bisect_left(days, day)
+        previous_day = days[i - 1] if i > 0 else None
+        next_day = days[i] if i < len(days) else None
+
+        if previous_day is not None and next_day is not None:
+            self.rest_violations -= self._too_close(previous_day, next_day)
+        if previous_day is not None:
+            self.rest_violations += self._too_close(previous_day, day)
+        if next_day is not None:
+            self.rest_violations += self._too_close(day, next_day)
+
+        # The new entry is beyond the daily limit if the day already holds that many matches
+        limit = self.model.max_matches_per_day
+        if limit is not None and bisect_right(days, day) - i >= limit:
+            self.day_overloads += 1
+
+        days.insert(i, day)
+
+    def _remove_day(self, days, day):
+        i = bisect_left(days, day)
+        previous_day = days[i - 1] if i > 0 else None
+        next_day = days[i + 1] if i + 1 < len(days) else None
+
+        if previous_day is not None:
+            self.rest_violations -= self._too_close(previous_day, day)
+        if next_day is not None:
+            self.rest_violations -= self._too_close(day, next_day)
+        if previous_day is not None and next_day is not None:
+            self.rest_violations += self._too_close(previous_day, next_day)
+
+        limit = self.model.max_matches_per_day
+        if limit is not None and bisect_right(days, day) - i > limit:
+            self.day_overloads -= 1
+
+        del days[i]
+
+    def _update_overruns(self, team):
+        limit = self.model.max_consecutive_matches
+        if limit is None:
+            return
+        # Every match beyond `limit` in a run of matches at most a day apart
+        overruns, run = 0, 1
+        days = self.team_days[team]
+        for earlier, later in zip(days, days[1:]):
+            run = run + 1 if later - earlier <= 1 else 1
+            overruns += run > limit
+        self.consecutive_overruns += overruns - self._team_overruns[team]
+        self._team_overruns[team] = overruns
+
+    def _change_slot(self, slot_counts, slot, step):
+        self.time_imbalances -= self._imbalance(slot_counts[slot])
+        slot_counts[slot] += step
+        self.time_imbalances += self._imbalance(slot_counts[slot])
+
+    def _imbalance(self, count):
+        return count - 1 if count > self.model.time_slot_limit else 0
@@ -0,0 +1,185 @@
+import logging
+import multiprocessing as mp
+import random
+from functools import partial
+from itertools import product
+import numpy as np
+from src.ga.cache import FitnessCache
+from src.ga.encoding import GENE_DTYPE, build_match_table
+from src.ga.constraint_model import ConstraintModel
+from src.ga.population import PopulationBuffers, initialize_encoded_population
+from src.ga.scheduler import (
+    CROSSOVER_METHODS, MUTATION_METHODS, SELECTION_METHODS, SURVIVOR_STRATEGIES, evolve_generation, schedule_result
+)
+
+logger = logging.getLogger(__name__)
+
+# Choices for every key of an island config
+ISLAND_OPERATORS = {
+    "crossover_method": CROSSOVER_METHODS,
+    "mutation_method": MUTATION_METHODS,
+    "selection_method": SELECTION_METHODS,
+    "survivor_strategy": SURVIVOR_STRATEGIES,
+}
+
+
+def draw_island_configs(islands, seed=None):
+    """
+    Give every island its own operator combination from the existing operator set.
+
+    Combinations are shuffled and dealt out in turn, so up to 16 islands all differ.
+
+    :param islands: Number of islands.
+    :param seed: Optional seed for the shuffle.
+    :return: List of config dicts with crossover, mutation, selection and survivor keys.
+    """
+    combinations = list(product(*ISLAND_OPERATORS.values()))
+    random.Random(seed).shuffle(combinations)
+    return [
+        dict(zip(ISLAND_OPERATORS, combination))
+        for combination in (combinations[i % len(combinations)] for i in range(islands))
+    ]
+
+
+def check_island_config(config):
+    """
+    Raise ValueError unless `config` names one known operator for every key of `ISLAND_OPERATORS`.
+
+    :param config: Island config dict as returned by `draw_island_configs`.
+    """
+    if set(config) != set(ISLAND_OPERATORS):
+        raise ValueError(f"Island config keys must be {sorted(ISLAND_OPERATORS)}, got {sorted(config)}.")
+    for key, choices in ISLAND_OPERATORS.items():
+        if config[key] not in choices:
+            raise ValueError(f"Unknown {key.replace('_', ' ')}: {config[key]} (choose one of {', '.join(choices)}).")
+
+
+def _island_worker(connection, constraints, population_size, config, migration_size, seed):
+    """
+    Evolve one island, driven by (generations, immigrants, immigrant_fitness) messages.
+
+    Replies with the island's best fitness after each generation and its best
+    individuals as emigrants. A None message ends the worker.
+    """
+    if seed is not None:
+        random.seed(seed)
+        np.random.seed(seed)
+
+    match_table = build_match_table(constraints)
+    cache = FitnessCache()
+    evaluate = partial(cache.evaluate, evaluate_fn=ConstraintModel(constraints, match_table).evaluate)
+
+    buffers = PopulationBuffers(population_size, len(match_table))
+    buffers.population[:] = initialize_encoded_population(constraints, population_size)
+    buffers.fitness[:] = evaluate(buffers.population)
+
+    while (message := connection.recv()) is not None:
+        generations, immigrants, immigrant_fitness = message
+
+        # Immigrants replace the island's worst individuals
+        if len(immigrants):
+            worst = np.argsort(buffers.fitness)[:len(immigrants)]
+            buffers.population[worst] = immigrants
+            buffers.fitness[worst] = immigrant_fitness
+
+        history = []
+        for _ in range(generations):
+            if buffers.fitness.max() == 0:
+                break
+            evolve_generation(buffers, constraints, evaluate=evaluate, **config)
+            history.append(int(buffers.fitness.max()))
+
+        best = np.argsort(buffers.fitness)[::-1][:migration_size]
+        connection.send((history, buffers.population[best], buffers.fitness[best].tolist()))
+
+    connection.close()
+
+
+def island_model(constraints, population_size, generations_size, islands=4, migration_interval=10,
+                 migration_size=2, topology="ring", island_configs=None, seed=None):
+    """
+    Island-model genetic algorithm: independent sub-populations in separate processes
+    with periodic migration of their best individuals.
+
+    :param constraints: Constraints for the scheduling problem.
+    :param population_size: Size of each island's population.
+    :param generations_size: Number of generations to run on every island.
+    :param islands: Number of islands (processes).
+    :param migration_interval: Generations between migrations.
+    :param migration_size: Number of best individuals each island sends per migration.
+    :param topology: "ring" (island i sends to i + 1) or "random" (each island sends to a random other island).
+    :param island_configs: Optional list of operator configs, one per island; drawn with `draw_island_configs` when omitted.
+    :param seed: Optional seed; island i is seeded with seed + i.
+    :return: Same values as `genetic_algorithm`: best schedule, its fitness, violation details and
+             the best fitness over all islands per generation.
+    """
+    if topology not in ("ring", "random"):
+        raise ValueError(f"Unknown migration topology: {topology}")
+    if island_configs is None:
+        island_configs = draw_island_configs(islands, seed)
+    if len(island_configs) != islands:
+        raise ValueError("island_configs must contain one config per island.")
+    for config in island_configs:
+        check_island_config(config)
+
+    rng = random.Random(seed)
+    connections, processes = [], []
+    for i, config in enumerate(island_configs):
+        parent_end, child_end = mp.Pipe()
+        process = mp.Process(target=_island_worker, daemon=True,
+                             args=(child_end, constraints, population_size, config, migration_size,
+                                   None if seed is None else seed + i))
+        process.start()
+        connections.append(parent_end)
+        processes.append(process)
+
+    def run_islands(generations, inbox):
+        for connection, (immigrants, immigrant_fitness) in zip(connections, inbox):
+            connection.send((generations, immigrants, immigrant_fitness))
+        return [connection.recv() for connection in connections]
+
+    try:
+        # A zero-generation round collects every island's initial best individuals
+        no_immigrants = (np.empty((0, len(build_match_table(constraints)), 4), dtype=GENE_DTYPE), [])
+        replies = run_islands(0, [no_immigrants] * islands)
+        best_fitness, best_individual = max(((fitness[0], emigrants[0]) for _, emigrants, fitness in replies),
+                                            key=lambda pair: pair[0])
+        generations_graph = [best_fitness]
+        generation = 0
+
+        while best_fitness != 0 and generation < generations_size:
+            # --- Migration ---
+            if topology == "ring":
+                sources = [(i - 1) % islands for i in range(islands)]
+            else:
+                sources = [rng.choice([j for j in range(islands) if j != i] or [i]) for i in range(islands)]
+            inbox = [(replies[j][1], replies[j][2]) for j in sources]
+
+            generations = min(migration_interval, generations_size - generation)
+            replies = run_islands(generations, inbox)
+
+            # Best fitness over all islands per generation; islands that reached zero stop early
+            histories = [history for history, _, _ in replies if history]
+            for step in range(max(map(len, histories), default=0)):
+                generations_graph.append(max(best_fitness, *(history[min(step, len(history) - 1)] for history in histories)))
+
+            for _, emigrants, emigrant_fitness in replies:
+                if emigrant_fitness[0] > best_fitness:
+                    best_fitness, best_individual = emigrant_fitness[0], emigrants[0].copy()
+
+            generation += generations
+            logger.info("Generation %d: Best Fitness = %d (islands: %s)", generation, best_fitness,
+                        ", ".join(str(fitness[0]) for _, _, fitness in replies))
+    finally:
+        # Islands that crashed have closed their end of the pipe; the rest may still be mid-round
+        for connection in connections:
+            try:
+                connection.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+            connection.close()
+        for process in processes:
+            process.terminate()
+            process.join()
+
+    return schedule_result(constraints, best_individual, generations_graph)
@@ -0,0 +1,151 @@
+import numpy as np
+from src.ga.cache import FitnessCache
+from src.ga.constraint_model import compiled_model
+from src.ga.encoding import VENUE, DAY, SLOT, WEEK, field_sizes
+from src.ga.incremental import IncrementalEvaluator
+
+
+class LocalSearch:
+    """
+    Memetic step: bounded hill climbing on the best individuals of each generation.
+
+    Each step picks a match involved in a violation and tries two kinds of moves,
+    scored with an `IncrementalEvaluator` instead of rescoring the schedule:
+    relocating it to a free (venue, week, day) with its teams' least used time slot,
+    and swapping its gene with another match. Only the best improving move is kept.
+
+    The search on an individual ends after `patience` failed steps in a row. Elites
+    survive for many generations, so individuals the search got stuck on are
+    remembered and skipped until they change. That memory is saved with checkpoints
+    (`stuck_keys`, `restore_stuck`), so a resumed run matches the uninterrupted one.
+
+    Pass an instance to `genetic_algorithm(..., local_search=...)`; `moves_tried` and
+    `moves_accepted` count its work over the run.
+
+    :param top_k: Number of best individuals improved every generation.
+    :param max_steps: Maximum number of moves tried per individual and generation.
+    :param candidates: Number of random relocation targets and swap partners scored per move.
+    :param patience: Failed steps in a row after which the search on an individual stops.
+    """
+
+    # Bound on the number of remembered stuck individuals
+    MAX_STUCK = 10_000
+
+    def __init__(self, top_k=4, max_steps=50, candidates=32, patience=10):
+        if top_k < 1 or max_steps < 1 or candidates < 1 or patience < 1:
+            raise ValueError("top_k, max_steps, candidates and patience must be at least 1.")
+        self.top_k = top_k
+        self.max_steps = max_steps
+        self.candidates = candidates
+        self.patience = patience
+        self.moves_tried = 0
+        self.moves_accepted = 0
+        self._stuck = set()
+
+    def stuck_keys(self):
+        """
+        Cache keys of the individuals the search is skipping, for a checkpoint.
+
+        :return: Sorted list of `FitnessCache.key` digests.
+        """
+        return sorted(self._stuck)
+
+    def restore_stuck(self, keys):
+        """
+        Replace the skipped individuals with those saved by `stuck_keys`.
+
+        :param keys: Iterable of `FitnessCache.key` digests.
+        """
+        self._stuck = set(keys)
+
+    def improve_population(self, population, fitness_scores, constraints, match_table=None, model=None):
+        """
+        Improve the `top_k` fittest individuals in place and update their scores.
+
+        :param population: Encoded population of shape (population, matches, 4).
+        :param fitness_scores: Fitness array of the population, updated in place.
+        :param constraints: The constraints dictionary.
+        :param match_table: Optional precomputed match table.
+        :param model: Optional precompiled `ConstraintModel`; taken from `compiled_model` when omitted.
+        """
+        if model is None:
+            model = compiled_model(constraints, match_table)
+
+        top_k = min(self.top_k, len(population))
+        for index in np.argpartition(-fitness_scores, top_k - 1)[:top_k].tolist():
+            if fitness_scores[index] == 0 or FitnessCache.key(population[index]) in self._stuck:
+                continue
+            fitness_scores[index] = self.improve(population[index], constraints, model=model)
+
+    def improve(self, individual, constraints, match_table=None, model=None):
+        """
+        Hill-climb one individual in place.
+
+        :param individual: Encoded individual of shape (matches, 4).
+        :param constraints: The constraints dictionary.
+        :param match_table: Optional precomputed match table.
+        :param model: Optional precompiled `ConstraintModel`.
+        :return: Fitness score of the improved individual.
+        """
+        evaluator = IncrementalEvaluator(constraints, individual, match_table, model)
+        sizes = field_sizes(constraints)
+
+        matches = None
+        failures = 0
+        for _ in range(self.max_steps):
+            if evaluator.score == 0:
+                break
+            if matches is None:
+                matches = evaluator.violating_matches()
+            match = matches[np.random.randint(len(matches))]
+
+            self.moves_tried += 1
+            if self._relocate(evaluator, match, sizes) or self._swap(evaluator, match):
+                self.moves_accepted += 1
+                matches = None
+                failures = 0
+            else:
+                failures += 1
+                if failures == self.patience:
+                    if len(self._stuck) >= self.MAX_STUCK:
+                        self._stuck.clear()
+                    self._stuck.add(FitnessCache.key(individual))
+                    break
+
+        return evaluator.score
+
+    def _relocate(self, evaluator, match, sizes):
+        team1, team2 = evaluator.match_table[match]
+        slot_load = [max(a, b) for a, b in zip(evaluator.team_slots[team1], evaluator.team_slots[team2])]
+        slot = int(np.argmin(slot_load))
+
+        best_gene, best_delta = None, 0
+        for venue, day, week in np.random.randint(0, sizes[[VENUE, DAY, WEEK]], size=(self.candidates, 3)).tolist():
+            if not evaluator.venue_free(venue, week, day):
+                continue
+            gene = [0] * 4
+            gene[VENUE], gene[DAY], gene[SLOT], gene[WEEK] = venue, day, slot, week
+            delta = evaluator.delta(match, gene)
+            if delta > best_delta:
+                best_gene, best_delta = gene, delta
+
+        if best_gene is None:
+            return False
+        evaluator.move(match, best_gene)
+        return True
+
+    def _swap(self, evaluator, match):
+        before = evaluator.score
+        best_partner, best_score = None, before
+        for partner in np.random.randint(0, len(evaluator.individual), size=self.candidates).tolist():
+            if partner == match:
+                continue
+            score = evaluator.swap(match, partner)
+            evaluator.swap(match, partner)
+            if score > best_score:
+                best_partner, best_score = partner, score
+
+        if best_partner is None:
+            return False
+        evaluator.swap(match, best_partner)
+        return True
@@ -1,74 +1,91 @@
+import heapq
 import numpy as np
 import random
+from itertools import chain
+from src.ga.encoding import field_sizes
 # random.seed(42)  
 
-def tournament_selection(population, fitness_scores, tournament_size=5):
+def tournament_selection_indices(fitness_scores, tournament_size=5, n_parents=None):
     """
-    Selects parents from the population using tournament selection.
+    Tournament selection on a fitness array, drawing every tournament in one batch.
 
-    :param population: List of individuals in the current population.
-    :param fitness_scores: List of fitness scores corresponding to the population.
+    Contestants are drawn with replacement, so a tournament can contain an individual
+    twice; with tournaments much smaller than the population this barely changes the
+    selection pressure.
+
+    :param fitness_scores: Fitness scores of the population (array or list).
     :param tournament_size: Number of individuals to compete in each tournament.
-    :return: List of selected parents.
+    :param n_parents: Number of parents to select (defaults to the population size).
+    :return: Integer array with the population index of every selected parent.
     """
-    if tournament_size > len(population):
+    fitness_scores = np.asarray(fitness_scores)
+    population_size = len(fitness_scores)
+    if tournament_size > population_size:
         raise ValueError("Tournament size cannot exceed population size.")
+    if n_parents is None:
+        n_parents = population_size
 
-    selected_parents = []
-
-    for _ in range(len(population)):
-        tournament_indices = np.random.choice(len(population), tournament_size, replace=False)
-        tournament = [(population[i], fitness_scores[i]) for i in tournament_indices]
+    contestants = np.random.randint(0, population_size, size=(n_parents, tournament_size))
+    winners = fitness_scores[contestants].argmax(axis=1)
+    return contestants[np.arange(n_parents), winners]
 
-        # Select the individual with the highest fitness score
-        winner = max(tournament, key=lambda x: x[1])
-        selected_parents.append(winner[0])
 
-    return selected_parents
+def tournament_selection(population, fitness_scores, tournament_size=5):
+    """
+    Selects parents from the population using tournament selection.
 
+    :param population: List of individuals in the current population.
+    :param fitness_scores: List of fitness scores corresponding to the population.
+    :param tournament_size: Number of individuals to compete in each tournament.
+    :return: List of selected parents.
+    """
+    return [population[i] for i in tournament_selection_indices(fitness_scores, tournament_size)]
 
 
-def rank_based_selection(population, fitness_scores, selection_pressure=1.5):
+def rank_based_selection_indices(fitness_scores, selection_pressure=1.5, n_parents=None):
     """
-    Selects parents from the population using rank-based selection.
-    
+    Rank-based selection on a fitness array.
+
     In rank-based selection, individuals are selected based on their rank
-    rather than their actual fitness values, which helps maintain selection 
+    rather than their actual fitness values, which helps maintain selection
     pressure even when fitness values converge.
-    
-    :param population: List of individuals in the current population.
-    :param fitness_scores: List of fitness scores corresponding to the population.
+
+    :param fitness_scores: Fitness scores of the population (array or list).
     :param selection_pressure: A value between 1.0 and 2.0 that determines the selection pressure.
                               Higher values favor higher-ranked individuals more strongly.
-    :return: List of selected parents.
+    :param n_parents: Number of parents to select (defaults to the population size).
+    :return: Integer array with the population index of every selected parent.
     """
     if not (1.0 <= selection_pressure <= 2.0):
         raise ValueError("Selection pressure must be between 1.0 and 2.0")
-        
-    # Create list of (individual, fitness) pairs
-    population_with_fitness = list(zip(population, fitness_scores))
-    
-    sorted_population = sorted(population_with_fitness, key=lambda x: x[1], reverse=True)
-    
-    sorted_individuals = [ind for ind, _ in sorted_population]
-    
+
+    fitness_scores = np.asarray(fitness_scores)
+    n = len(fitness_scores)
+    if n_parents is None:
+        n_parents = n
+
+    # Best first; the stable sort keeps tied individuals in population order
+    ranked = np.argsort(-fitness_scores, kind="stable")
+
     # Calculate selection probabilities based on rank
-    n = len(population)
     ranks = np.arange(1, n+1)
-    
     probs = (2 - selection_pressure) / n + (2 * (ranks - 1) * (selection_pressure - 1)) / (n * (n - 1))
-    
     probs = np.flip(probs)
-    
     probs = probs / np.sum(probs)
-    
-    selected_indices = np.random.choice(n, size=n, p=probs, replace=True)
-    selected_parents = [sorted_individuals[i] for i in selected_indices]
-    
-    return selected_parents
 
+    return ranked[np.random.choice(n, size=n_parents, p=probs, replace=True)]
 
 
+def rank_based_selection(population, fitness_scores, selection_pressure=1.5):
+    """
+    Selects parents from the population using rank-based selection.
+
+    :param population: List of individuals in the current population.
+    :param fitness_scores: List of fitness scores corresponding to the population.
+    :param selection_pressure: A value between 1.0 and 2.0 that determines the selection pressure.
+    :return: List of selected parents.
+    """
+    return [population[i] for i in rank_based_selection_indices(fitness_scores, selection_pressure)]
 
 
 def order_crossover(parent1, parent2): 
@@ -88,23 +105,10 @@ def order_crossover(parent1, parent2):
     child1[start:end] = parent1[start:end]
     child2[start:end] = parent2[start:end]
 
-    # Fill child1 using elements from parent2 that are not already in child1
-    p2_index = end
-    for i in range(size):
-        if child1[i] is None:  # Find the first empty position in child1
-            while parent2[p2_index % size] in child1:
-                p2_index += 1
-            child1[i] = parent2[p2_index % size]
-            p2_index += 1
-
-    # Fill child2 using elements from parent1 that are not already in child2
-    p1_index = end
-    for i in range(size):
-        if child2[i] is None:  # Find the first empty position in child2
-            while parent1[p1_index % size] in child2:
-                p1_index += 1
-            child2[i] = parent1[p1_index % size]
-            p1_index += 1
+    # Fill each child with the other parent's genes that are not already in it,
+    # tracking placed genes in a set so every membership test is O(1)
+    _order_fill_genes(child1, parent2, start, end)
+    _order_fill_genes(child2, parent1, start, end)
 
     for i in range(size):
         child1[i] = (parent1[i][0], parent1[i][1], child1[i][2], child1[i][3], child1[i][4], child1[i][5])
@@ -116,6 +120,45 @@ def order_crossover(parent1, parent2):
 
 
 
+def _gene_key(gene):
+    """Hashable identity of a (team1, team2, venue, day, time_slot, week) gene."""
+    team1, team2, venue, day, time_slot, week = gene
+    return team1['TeamID'], team2['TeamID'], venue['VenueID'], day, time_slot, week
+
+
+def _order_fill_genes(child, donor, start, end):
+    size = len(child)
+    placed = {_gene_key(gene) for gene in child[start:end]}
+
+    donor_index = end
+    for i in chain(range(start), range(end, size)):
+        while _gene_key(donor[donor_index % size]) in placed:
+            donor_index += 1
+        child[i] = donor[donor_index % size]
+        placed.add(_gene_key(child[i]))
+        donor_index += 1
+
+
+def _pmx_child(base, donor, start, end):
+    size = len(base)
+    child = base[:]
+    child[start:end] = donor[start:end]
+
+    # Position of every gene of the donor segment, built once per pair
+    segment_position = {_gene_key(donor[i]): i for i in range(start, end)}
+
+    # Genes outside the segment that clash with it follow the PMX mapping until they don't
+    for i in chain(range(start), range(end, size)):
+        gene = child[i]
+        position = segment_position.get(_gene_key(gene))
+        while position is not None:
+            gene = base[position]
+            position = segment_position.get(_gene_key(gene))
+        child[i] = gene
+
+    return child
+
+
 def PMX_Crossover (parent1, parent2): 
     """
     Partially Mapped Crossover (PMX) for genetic algorithms.
@@ -130,28 +173,9 @@ def PMX_Crossover (parent1, parent2):
 
     start, end = sorted(random.sample(range(size), 2))
 
-    child1 = parent1[:]
-    child2 = parent2[:]
+    child1 = _pmx_child(parent1, parent2, start, end)
+    child2 = _pmx_child(parent2, parent1, start, end)
 
-    child1[start:end] = parent2[start:end]
-    child2[start:end] = parent1[start:end]
-
-    for i in range(start, end):
-        gene = parent2[i]
-        if gene in child1[start:end]:
-            continue
-        while gene in child1:
-            gene = parent2[parent1.index(gene)]
-        child1[child1.index(parent2[i])] = gene
-
-    for i in range(start, end):
-        gene = parent1[i]
-        if gene in child2[start:end]:
-            continue
-        while gene in child2:
-            gene = parent1[parent2.index(gene)]
-        child2[child2.index(parent1[i])] = gene
-    
     for i in range(size):
         child1[i] = (parent1[i][0], parent1[i][1], child1[i][2], child1[i][3], child1[i][4], child1[i][5])
         child2[i] = (parent2[i][0], parent2[i][1], child2[i][2], child2[i][3], child2[i][4], child2[i][5])   
@@ -161,7 +185,35 @@ def PMX_Crossover (parent1, parent2):
 
 
 
-def elitism (old_population, offspring, fitness_old, fitness_offspring, elite_size=20):
+def elitism_indices(fitness_old, fitness_offspring, elite_size=20):
+    """
+    Elitism with random replacement on fitness arrays.
+
+    The `elite_size` fittest individuals of the old population and the offspring survive,
+    and the remaining slots are filled with a uniform sample of everyone else. The top
+    `elite_size` are found with `np.argpartition`, so no full sort is needed.
+
+    :param fitness_old: Fitness values of the old population.
+    :param fitness_offspring: Fitness values of the offspring.
+    :param elite_size: Number of top individuals to preserve.
+    :return: Integer array of survivor indices into the old population followed by the offspring.
+    """
+    combined_fitness = np.concatenate((fitness_old, fitness_offspring))
+    population_size = len(fitness_old)
+    if not 0 <= elite_size <= population_size:
+        raise ValueError("Elite size must be between 0 and the population size.")
+
+    elites = np.argpartition(-combined_fitness, elite_size)[:elite_size]
+
+    others = np.ones(len(combined_fitness), dtype=bool)
+    others[elites] = False
+    others = np.flatnonzero(others)
+    chosen = others[np.random.permutation(len(others))[:population_size - elite_size]]
+
+    return np.concatenate((elites, chosen))
+
+
+def elitism (old_population, offspring, fitness_old, fitness_offspring, elite_size=20, return_fitness=False):
     """
     Survivor selection using elitism with random replacement.
 
@@ -170,23 +222,51 @@ def elitism (old_population, offspring, fitness_old, fitness_offspring, elite_si
     :param fitness_old: Fitness values of the old population.
     :param fitness_offspring: Fitness values of the offspring.
     :param elite_size: Number of top individuals to preserve.
-    :return: The new population for the next generation.
+    :param return_fitness: Also return the fitness values of the survivors.
+    :return: The new population for the next generation (and its fitness values).
     """
     combined_population = old_population + offspring
     combined_fitness = fitness_old + fitness_offspring
 
-    sorted_indices = sorted(range(len(combined_fitness)), key=lambda i: combined_fitness[i], reverse=True)
-    sorted_population = [combined_population[i] for i in sorted_indices]
+    survivors = elitism_indices(fitness_old, fitness_offspring, elite_size)
+    new_population = [combined_population[i] for i in survivors]
 
-    new_population = sorted_population[:elite_size]
+    if return_fitness:
+        return new_population, [combined_fitness[i] for i in survivors]
+    return new_population
 
-    remaining_slots = len(old_population) - elite_size
-    random_indices = random.sample(range(elite_size, len(sorted_population)), remaining_slots)
-    new_population.extend([sorted_population[i] for i in random_indices])
 
-    return new_population
+def genitor_indices(fitness_old, fitness_offspring):
+    """
+    Genitor-style replacement on fitness arrays:
+    each offspring, in order, replaces the current worst individual if it is better.
+
+    The worst individual is kept on a min-heap of (fitness, index), which picks the
+    same individual as `fitness_old.index(min(fitness_old))` would, in O(log P).
+
+    :param fitness_old: Fitness values of the old population.
+    :param fitness_offspring: Fitness values of the offspring.
+    :return: Integer array of survivor indices into the old population followed by the offspring.
+    """
+    fitness_old = np.asarray(fitness_old)
+    fitness_offspring = np.asarray(fitness_offspring)
+    population_size = len(fitness_old)
+    survivors = np.arange(population_size)
+    if population_size == 0:
+        return survivors
+
+    heap = list(zip(fitness_old.tolist(), range(population_size)))
+    heapq.heapify(heap)
 
+    # The worst fitness only rises, so offspring no better than the initial worst never get in
+    candidates = np.flatnonzero(fitness_offspring > heap[0][0])
+    for child, child_fit in zip(candidates.tolist(), fitness_offspring[candidates].tolist()):
+        worst_fitness, worst_index = heap[0]
+        if child_fit > worst_fitness:
+            heapq.heapreplace(heap, (child_fit, worst_index))
+            survivors[worst_index] = population_size + child
 
+    return survivors
 
 
 def genitor(old_population, offspring, fitness_old, fitness_offspring):
@@ -198,15 +278,15 @@ def genitor(old_population, offspring, fitness_old, fitness_offspring):
     :param fitness_old: Fitness values for old_population.
     :param offspring: List of new offspring individuals.
     :param fitness_offspring: Fitness values for offspring.
-    :return: Updated population after replacement.
+    :return: Updated population after replacement (fitness_old is updated in place to match).
     """
+    population_size = len(old_population)
+    survivors = genitor_indices(fitness_old, fitness_offspring)
 
-    for child, child_fit in zip(offspring, fitness_offspring):
-        worst_index = fitness_old.index(min(fitness_old))
-
-        if child_fit > fitness_old[worst_index]:
-            old_population[worst_index] = child
-            fitness_old[worst_index] = child_fit
+    for slot in np.flatnonzero(survivors >= population_size):
+        child = survivors[slot] - population_size
+        old_population[slot] = offspring[child]
+        fitness_old[slot] = fitness_offspring[child]
 
     return old_population
 
@@ -280,6 +360,124 @@ def swap_mutation(individual, mutation_rate=0.1):
 
 
 
+def order_crossover_encoded(parent1, parent2, out=None):
+    """
+    Order crossover for encoded individuals (arrays of shape (matches, 4)).
+
+    Mirrors `order_crossover`: each child keeps a segment of one parent and the
+    remaining positions are filled with the other parent's genes, read from the
+    end of the segment and wrapping around, skipping genes already in the child.
+
+    :param parent1: The first parent (encoded individual).
+    :param parent2: The second parent (encoded individual).
+    :param out: Optional pair of arrays, not overlapping the parents, to write the children into.
+    :return: Two offspring generated from the parents.
+    """
+    assert len(parent1) == len(parent2)
+
+    size = len(parent1)
+
+    start, end = sorted(random.sample(range(size), 2))
+
+    child1, child2 = (parent1.copy(), parent2.copy()) if out is None else out
+    _order_fill(child1, parent1, parent2, start, end)
+    _order_fill(child2, parent2, parent1, start, end)
+    return child1, child2
+
+
+def _order_fill(child, keep, donor, start, end):
+    size = len(keep)
+    child[start:end] = keep[start:end]
+
+    # Donor positions in reading order: end, end + 1, ..., wrapping around to end - 1
+    order = np.roll(np.arange(size), -end)
+
+    # A gene is a (match, attributes) pair, so a donor gene can only already be in the
+    # child if it sits inside the kept segment with identical attributes.
+    in_segment = (order >= start) & (order < end)
+    duplicate = in_segment & np.all(donor[order] == keep[order], axis=1)
+
+    empty_positions = np.r_[0:start, end:size]
+    child[empty_positions] = donor[order[~duplicate][:len(empty_positions)]]
+
+
+def PMX_Crossover_encoded(parent1, parent2, out=None):
+    """
+    Partially Mapped Crossover (PMX) for encoded individuals.
+
+    :param parent1: The first parent (encoded individual).
+    :param parent2: The second parent (encoded individual).
+    :param out: Optional pair of arrays, not overlapping the parents, to write the children into.
+    :return: Two offspring generated from the parents.
+    """
+    assert len(parent1) == len(parent2)
+
+    size = len(parent1)
+
+    start, end = sorted(random.sample(range(size), 2))
+
+    if out is None:
+        child1 = parent1.copy()
+        child2 = parent2.copy()
+    else:
+        child1, child2 = out
+        child1[:] = parent1
+        child2[:] = parent2
+
+    # Genes are unique (match, attributes) pairs, so the PMX mapping never has to
+    # repair duplicates outside the exchanged segment.
+    child1[start:end] = parent2[start:end]
+    child2[start:end] = parent1[start:end]
+
+    return child1, child2
+
+
+def attribute_level_mutation_encoded(data, individual, mutation_rate=0.1, evaluator=None):
+    """
+    Mutates the venue, day, time slot and week of matches in an encoded individual.
+
+    :param data: The constraints dictionary.
+    :param individual: Encoded individual of shape (matches, 4), mutated in place.
+    :param mutation_rate: The probability of mutating a match.
+    :param evaluator: Optional `IncrementalEvaluator` tracking this individual; its score is kept up to date.
+    :return: The mutated individual.
+    """
+    sizes = field_sizes(data)
+
+    mutated = np.random.random(len(individual)) < mutation_rate
+    new_genes = np.random.randint(0, sizes, size=(np.count_nonzero(mutated), len(sizes)))
+
+    if evaluator is None:
+        individual[mutated] = new_genes
+    else:
+        for idx, gene in zip(np.flatnonzero(mutated).tolist(), new_genes.tolist()):
+            evaluator.move(idx, gene)
+
+    return individual
+
+
+def swap_mutation_encoded(individual, mutation_rate=0.1, evaluator=None):
+    """
+    Performs a swap mutation on an encoded individual.
+
+    :param individual: Encoded individual of shape (matches, 4), mutated in place.
+    :param mutation_rate: The probability of performing a swap, tried once per match.
+    :param evaluator: Optional `IncrementalEvaluator` tracking this individual; its score is kept up to date.
+    :return: The mutated individual.
+    """
+    size = len(individual)
+
+    for _ in range(np.random.binomial(size, mutation_rate)):
+        idx1, idx2 = random.sample(range(size), 2)
+        if evaluator is None:
+            individual[[idx1, idx2]] = individual[[idx2, idx1]]
+        else:
+            evaluator.swap(idx1, idx2)
+
+    return individual
+
+
+
 # def genitor (old_population, offspring, fitness_old, fitness_offspring):
 #     combined = list(zip(old_population + offspring, fitness_old + fitness_offspring))
 #     sorted_combined = sorted(combined, key=lambda x: x[1], reverse=True)
@@ -0,0 +1,76 @@
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import numpy as np
+from src.ga.encoding import GENE_DTYPE, build_match_table
+from src.ga.constraint_model import ConstraintModel
+
+
+# Per-process state set up once by the pool initializer
+_worker = {}
+
+
+def _attach(shm_name, shape, constraints):
+    shm = shared_memory.SharedMemory(name=shm_name)
+    _worker["shm"] = shm
+    _worker["population"] = np.ndarray(shape, dtype=GENE_DTYPE, buffer=shm.buf)
+    _worker["model"] = ConstraintModel(constraints)
+
+
+def _evaluate_slice(start, stop):
+    return _worker["model"].evaluate(_worker["population"][start:stop])
+
+
+class ParallelEvaluator:
+    """
+    Fitness evaluation of encoded populations across a process pool.
+
+    Individuals are written into a shared memory buffer once per call and every
+    worker scores its own slice of it, so no genes are pickled between processes.
+    Scores are identical to `evaluate_population`.
+
+    :param constraints: The constraints dictionary.
+    :param workers: Number of worker processes.
+    :param max_population: Largest population that will be evaluated in one call.
+    """
+
+    def __init__(self, constraints, workers, max_population):
+        if workers < 1:
+            raise ValueError("Number of workers must be at least 1.")
+
+        self.workers = workers
+        shape = (max_population, len(build_match_table(constraints)), 4)
+        size = max(int(np.prod(shape)) * np.dtype(GENE_DTYPE).itemsize, 1)
+
+        self._shm = shared_memory.SharedMemory(create=True, size=size)
+        self.buffer = np.ndarray(shape, dtype=GENE_DTYPE, buffer=self._shm.buf)
+        self._pool = ProcessPoolExecutor(max_workers=workers, initializer=_attach,
+                                         initargs=(self._shm.name, shape, constraints))
+
+    def __call__(self, population):
+        """
+        Score an encoded population.
+
+        :param population: Encoded population of shape (population, matches, 4).
+        :return: Integer array with one fitness score per individual.
+        """
+        n = len(population)
+        if n > len(self.buffer):
+            raise ValueError(f"Population of {n} exceeds the shared buffer size of {len(self.buffer)}.")
+
+        self.buffer[:n] = population
+        bounds = np.linspace(0, n, min(self.workers, n) + 1, dtype=int)
+        futures = [self._pool.submit(_evaluate_slice, start, stop) for start, stop in zip(bounds[:-1], bounds[1:])]
+        return np.concatenate([future.result() for future in futures]) if futures else np.empty(0, dtype=np.int64)
+
+    def close(self):
+        """Shut down the pool and release the shared memory block."""
+        self._pool.shutdown()
+        del self.buffer
+        self._shm.close()
+        self._shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -1,5 +1,7 @@
 import numpy as np
 import random
+from src.ga.encoding import SLOT, GENE_DTYPE, GENE_FIELDS, build_match_table, field_sizes
+from src.ga.constraint_model import ConstraintModel
 # random.seed(42)  
 
 
@@ -30,3 +32,228 @@ def initialize_population(constraints, population_size ):
     return population
 
 
+def initialize_encoded_population(constraints, population_size, seeded_fraction=0.0):
+    """
+    Create a population in the integer encoding.
+
+    :param constraints: The constraints dictionary.
+    :param population_size: Number of individuals to create.
+    :param seeded_fraction: Share of the population built by `round_robin_individual`; the rest is random.
+    :return: Integer array of shape (population, matches, 4) holding venue/day/slot/week indices.
+    """
+    if not 0.0 <= seeded_fraction <= 1.0:
+        raise ValueError("Seeded fraction must be between 0 and 1.")
+
+    match_table = build_match_table(constraints)
+    sizes = field_sizes(constraints)
+
+    population = np.random.randint(0, sizes, size=(population_size, len(match_table), len(sizes)))
+    population = population.astype(GENE_DTYPE)
+    n_seeded = round(seeded_fraction * population_size)
+    if n_seeded:
+        model = ConstraintModel(constraints, match_table)
+        for i in range(n_seeded):
+            population[i] = round_robin_individual(constraints, match_table, model)
+    return population
+
+
+def circle_rounds(n_teams):
+    """
+    Round-robin rounds by the circle method: every team meets every other team once.
+
+    With an odd number of teams a dummy team is added and its matches are byes.
+
+    :param n_teams: Number of teams.
+    :return: List of rounds, each a list of (team, team) index pairs; no team appears twice in a round.
+    """
+    players = list(range(n_teams)) + ([None] if n_teams % 2 else [])
+    n = len(players)
+
+    rounds = []
+    for _ in range(n - 1):
+        pairs = [(players[i], players[n - 1 - i]) for i in range(n // 2)]
+        rounds.append([pair for pair in pairs if None not in pair])
+        # Keep the first player fixed and rotate the others one place
+        players = [players[0], players[-1]] + players[1:-1]
+    return rounds
+
+
+def round_robin_individual(constraints, match_table=None, model=None):
+    """
+    Build one encoded individual with a constructive round-robin heuristic.
+
+    Circle-method rounds are placed in calendar order: each match goes on the earliest
+    day on which both teams have had `rest_periods.minimum_hours` of rest and a venue
+    is still free, the venue rotating between matches. The time slot is the one both
+    teams have used least. Teams, round order and rotations are shuffled with
+    `numpy.random`, so repeated calls give different schedules. When the calendar runs
+    out a match goes on a random day.
+
+    Day placement only looks at venues and rest, so the seed is free of those conflicts
+    while the calendar lasts, but not of time imbalances. Slots are balanced afterwards
+    by single-match moves, which settle in a local optimum. A team with more than
+    `len(time_slots) * max_matches_per_time_slot` matches cannot avoid time imbalances
+    at all (19 matches in 5 slots at the default limit of 3 cost at least 6 per team),
+    so large leagues are seeded with many of them.
+
+    :param constraints: The constraints dictionary.
+    :param match_table: Optional precomputed result of `build_match_table`.
+    :param model: Optional precompiled `ConstraintModel`, for callers seeding many individuals.
+    :return: Integer array of shape (matches, 4) ordered like the match table.
+    """
+    if model is None:
+        model = ConstraintModel(constraints, match_table)
+    match_table = model.match_table
+
+    n_teams = len(constraints['teams'])
+    n_venues, n_days, n_slots, n_weeks = field_sizes(constraints)
+    min_rest_days = model.min_rest_days
+
+    # Calendar of (week, day) pairs in absolute day order
+    absolute_days = model.absolute_days.ravel()
+    calendar = np.argsort(absolute_days, kind="stable")
+    calendar_days = absolute_days[calendar]
+
+    free_venues = np.ones((len(calendar), n_venues), dtype=bool)
+    has_free_venue = np.ones(len(calendar), dtype=bool)
+    ready_day = np.full(n_teams, calendar_days[0], dtype=np.int64)
+    slot_counts = np.zeros((n_teams, n_slots), dtype=np.int64)
+    genes = np.empty((len(match_table), 4), dtype=GENE_DTYPE)
+
+    labels = np.random.permutation(n_teams)
+    venue_offset, slot_offset = np.random.randint(n_venues), np.random.randint(n_slots)
+    rounds = circle_rounds(n_teams)
+
+    placed = 0
+    for round_index in np.random.permutation(len(rounds)):
+        for a, b in rounds[round_index]:
+            i, j = sorted((int(labels[a]), int(labels[b])))
+            row = i * n_teams - i * (i + 1) // 2 + (j - i - 1)
+
+            earliest = np.searchsorted(calendar_days, max(ready_day[i], ready_day[j]))
+            open_positions = np.flatnonzero(has_free_venue[earliest:])
+            if len(open_positions):
+                position = earliest + open_positions[0]
+            else:
+                position = np.random.randint(len(calendar))
+
+            # Rotate through the venues, taking the first free one from the rotation's start
+            rotation = (np.arange(n_venues) + venue_offset + placed) % n_venues
+            free = rotation[free_venues[position, rotation]]
+            venue = free[0] if len(free) else rotation[0]
+            free_venues[position, venue] = False
+            has_free_venue[position] = free_venues[position].any()
+
+            slot_order = (np.arange(n_slots) + slot_offset + placed) % n_slots
+            slot = slot_order[np.argmin(np.maximum(slot_counts[i], slot_counts[j])[slot_order])]
+            slot_counts[[i, j], slot] += 1
+
+            week, day = divmod(int(calendar[position]), n_days)
+            ready_day[[i, j]] = calendar_days[position] + min_rest_days
+            genes[row] = (venue, day, slot, week)
+            placed += 1
+
+    _balance_slots(genes, match_table, slot_counts, model.time_slot_limit)
+    return genes
+
+
+def _slot_penalty(count, limit):
+    # Same rule as the time kernel: a team using a slot more than `limit` times costs count - 1
+    return np.where(count > limit, count - 1, 0)
+
+
+def _balance_slots(genes, match_table, slot_counts, limit):
+    """
+    Move matches to other time slots while that lowers the time imbalance penalty.
+
+    Slots play no part in venue or rest violations, so this cannot create any.
+    """
+    improved = True
+    while improved:
+        improved = False
+        for row, (i, j) in enumerate(match_table.tolist()):
+            slot = genes[row, SLOT]
+            counts = slot_counts[[i, j]]
+            # Penalty change of both teams for leaving the current slot and joining each other one
+            leave = (_slot_penalty(counts[:, slot] - 1, limit) - _slot_penalty(counts[:, slot], limit)).sum()
+            delta = (_slot_penalty(counts + 1, limit) - _slot_penalty(counts, limit)).sum(axis=0) + leave
+            delta[slot] = 0
+            best = int(np.argmin(delta))
+            if delta[best] < 0:
+                slot_counts[[i, j], slot] -= 1
+                slot_counts[[i, j], best] += 1
+                genes[row, SLOT] = best
+                improved = True
+
+
+class PopulationBuffers:
+    """
+    Two preallocated generation buffers for the encoded population and its fitness.
+
+    Each buffer holds the population followed by room for its offspring, so the
+    combined pool survivor selection picks from is contiguous. Survivors are
+    gathered into the other buffer and the two are swapped, so a run allocates its
+    population storage once, however many generations it lasts.
+
+    :param population_size: Number of individuals in the population.
+    :param n_matches: Number of matches per individual.
+    """
+
+    def __init__(self, population_size, n_matches):
+        self.population_size = population_size
+        # Crossover produces children in pairs
+        self.offspring_size = population_size - population_size % 2
+        rows = population_size + self.offspring_size
+        self._genes = np.empty((2, rows, n_matches, len(GENE_FIELDS)), dtype=GENE_DTYPE)
+        self._fitness = np.empty((2, rows), dtype=np.int64)
+        self._current = 0
+
+    @classmethod
+    def from_population(cls, population, fitness_scores):
+        """
+        Create buffers holding an existing population.
+
+        :param population: Encoded population of shape (population, matches, 4).
+        :param fitness_scores: Fitness scores of the population.
+        :return: The new `PopulationBuffers`.
+        """
+        buffers = cls(len(population), population.shape[1])
+        buffers.population[:] = population
+        buffers.fitness[:] = fitness_scores
+        return buffers
+
+    @property
+    def population(self):
+        return self._genes[self._current, :self.population_size]
+
+    @property
+    def fitness(self):
+        return self._fitness[self._current, :self.population_size]
+
+    @property
+    def offspring(self):
+        return self._genes[self._current, self.population_size:]
+
+    @property
+    def offspring_fitness(self):
+        return self._fitness[self._current, self.population_size:]
+
+    def advance(self, survivors):
+        """
+        Make the survivors the next population by gathering them into the other buffer.
+
+        :param survivors: Indices into the population followed by the offspring, one per individual.
+        :raises IndexError: If an index is outside the population and offspring.
+        """
+        survivors = np.asarray(survivors)
+        rows = self._fitness.shape[1]
+        # mode="raise" would buffer `out`, so the bounds are checked once here and the gathers use
+        # mode="clip", which can then never actually clip
+        if len(survivors) and (survivors.min() < 0 or survivors.max() >= rows):
+            raise IndexError(f"Survivor indices must lie in [0, {rows}).")
+        following = 1 - self._current
+        np.take(self._genes[self._current], survivors, axis=0, out=self._genes[following, :self.population_size],
+                mode="clip")
+        np.take(self._fitness[self._current], survivors, out=self._fitness[following, :self.population_size],
+                mode="clip")
+        self._current = following
@@ -0,0 +1,180 @@
+import cProfile
+import io
+import pstats
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+
+# Generation phases timed by `genetic_algorithm`, in loop order
+PHASES = ("selection", "crossover", "mutation", "evaluation", "survivor_selection", "local_search",
+          "best_tracking")
+
+
+class GenerationProfiler:
+    """
+    Per-generation timing of the genetic algorithm's phases.
+
+    Pass an instance to `genetic_algorithm(..., profiler=...)`. Every generation
+    appends a record to `records` with the wall time of each phase in `PHASES`,
+    the number of individuals sent to fitness evaluation (`fitness_requests`) and
+    the number actually scored after the cache (`fitness_evaluations`).
+
+    :param capture: Optional "cprofile" or "tracemalloc" to record a detailed profile.
+    :param capture_window: (first, stop) generation numbers, half-open, during which to capture.
+    :param callback: Optional function called with each finished generation record.
+    """
+
+    def __init__(self, capture=None, capture_window=(0, 1), callback=None):
+        if capture not in (None, "cprofile", "tracemalloc"):
+            raise ValueError(f"Unknown capture mode: {capture}")
+
+        self.capture = capture
+        self.capture_window = capture_window
+        self.callback = callback
+        self.records = []
+        self.profile = None
+        self.snapshot = None
+        self._current = None
+        self._generation_start = None
+        self._capturing = False
+
+    def start_generation(self, generation):
+        self._current = {"generation": generation, **{phase: 0.0 for phase in PHASES},
+                         "fitness_requests": 0, "fitness_evaluations": 0}
+        if self.capture and generation == self.capture_window[0]:
+            self._start_capture()
+        self._generation_start = time.perf_counter()
+
+    def end_generation(self):
+        record = self._current
+        record["total"] = time.perf_counter() - self._generation_start
+        self.records.append(record)
+        self._current = None
+
+        if self._capturing and record["generation"] + 1 >= self.capture_window[1]:
+            self._stop_capture()
+        if self.callback is not None:
+            self.callback(record)
+
+    def finish(self):
+        """Stop a capture that is still running because the run ended inside the window."""
+        if self._capturing:
+            self._stop_capture()
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            if self._current is not None:
+                self._current[name] += time.perf_counter() - start
+
+    def count_requests(self, n):
+        if self._current is not None:
+            self._current["fitness_requests"] += n
+
+    def counted(self, evaluate_fn):
+        """
+        Wrap a batch evaluator so the individuals it actually scores are counted.
+
+        :param evaluate_fn: Batch evaluator taking an encoded population.
+        :return: Wrapped evaluator.
+        """
+        def evaluate(population):
+            if self._current is not None:
+                self._current["fitness_evaluations"] += len(population)
+            return evaluate_fn(population)
+        return evaluate
+
+    def _start_capture(self):
+        if self.capture == "cprofile":
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+        else:
+            tracemalloc.start()
+        self._capturing = True
+
+    def _stop_capture(self):
+        if self.capture == "cprofile":
+            self._cprofile.disable()
+            self.profile = pstats.Stats(self._cprofile)
+        else:
+            self.snapshot = tracemalloc.take_snapshot()
+            tracemalloc.stop()
+        self._capturing = False
+
+    def summary(self):
+        """
+        Totals over all recorded generations.
+
+        :return: Dict with total and mean seconds per phase, its share of generation time and fitness counts.
+        """
+        generations = len(self.records)
+        total = sum(record["total"] for record in self.records)
+        phases = {}
+        for phase in PHASES:
+            seconds = sum(record[phase] for record in self.records)
+            phases[phase] = {
+                "total": seconds,
+                "mean": seconds / generations if generations else 0.0,
+                "share": seconds / total if total else 0.0,
+            }
+        return {
+            "generations": generations,
+            "total": total,
+            "phases": phases,
+            "fitness_requests": sum(record["fitness_requests"] for record in self.records),
+            "fitness_evaluations": sum(record["fitness_evaluations"] for record in self.records),
+        }
+
+    def format_summary(self, top=15):
+        """
+        Human-readable summary table, followed by the captured profile when there is one.
+
+        :param top: Number of entries to show from a cProfile or tracemalloc capture.
+        :return: The formatted text.
+        """
+        summary = self.summary()
+        lines = [f"{'phase':<20} {'total s':>10} {'mean ms':>10} {'share':>7}"]
+        for phase, stats in summary["phases"].items():
+            lines.append(f"{phase:<20} {stats['total']:>10.3f} {stats['mean'] * 1e3:>10.3f} {stats['share']:>7.1%}")
+        lines.append(f"{'generation total':<20} {summary['total']:>10.3f} "
+                     f"{summary['total'] / max(summary['generations'], 1) * 1e3:>10.3f}")
+        lines.append(f"fitness requests: {summary['fitness_requests']}, "
+                     f"evaluations after cache: {summary['fitness_evaluations']}")
+
+        if self.profile is not None:
+            stream = io.StringIO()
+            pstats.Stats(self._cprofile, stream=stream).sort_stats("cumulative").print_stats(top)
+            lines.append(stream.getvalue())
+        if self.snapshot is not None:
+            lines.append(f"Top {top} allocation sites:")
+            lines.extend(str(stat) for stat in self.snapshot.statistics("lineno")[:top])
+
+        return "\n".join(lines)
+
+
+class _NullProfiler:
+    """Stand-in used when no profiler is passed; every hook is a no-op."""
+
+    def start_generation(self, generation):
+        pass
+
+    def end_generation(self):
+        pass
+
+    def finish(self):
+        pass
+
+    def phase(self, name):
+        return nullcontext()
+
+    def count_requests(self, n):
+        pass
+
+    def counted(self, evaluate_fn):
+        return evaluate_fn
+
+
+NULL_PROFILER = _NullProfiler()
@@ -1,87 +1,330 @@
+import logging
+import numpy as np
+import random
+from contextlib import nullcontext
+from typing import NamedTuple
+from src.ga.cache import FitnessCache
+from src.ga.checkpoint import CheckpointWriter, capture_state, load_checkpoint, restore_random_state
+from src.ga.constraint_model import ConstraintModel
+from src.ga.encoding import build_match_table, decode_schedule
 from src.ga.fitness import evaluate_fitness
 from src.ga.operators import *
-from src.ga.population import initialize_population
+from src.ga.parallel import ParallelEvaluator
+from src.ga.population import PopulationBuffers, initialize_encoded_population
+from src.ga.profiling import NULL_PROFILER
+from src.ga.stopping import StoppingCriteria
 
+# Operator names accepted by `evolve_generation` and `genetic_algorithm`
+CROSSOVER_METHODS = ("order_crossover", "PMX_Crossover")
+MUTATION_METHODS = ("attribute_level_mutation", "swap_mutation")
+SELECTION_METHODS = ("tournament_selection", "rank_based_selection")
+SURVIVOR_STRATEGIES = ("elitism", "genitor")
 
+logger = logging.getLogger(__name__)
 
-def genetic_algorithm(constraints, population_size, generations_size, 
-                      crossover_method, mutation_method,selection_method, survivor_strategy="elitism"):
+
+
+def evolve_generation(buffers, constraints, crossover_method, mutation_method,
+                      selection_method, survivor_strategy, evaluate, profiler=NULL_PROFILER, local_search=None,
+                      model=None):
     """
-    Genetic Algorithm for scheduling.
+    Run one generation of the genetic algorithm.
+
+    Offspring are written into the offspring half of `buffers` and the survivors are
+    gathered into its other buffer, so no population-sized arrays are allocated.
+
+    :param buffers: `PopulationBuffers` holding the scored population; advanced to the next generation.
     :param constraints: Constraints for the scheduling problem.
-    :param population_size: Size of the population.
-    :param generations_size: Number of generations to run.
     :param crossover_method: Method for crossover operation.
     :param mutation_method: Method for mutation operation.
     :param selection_method: Method for selection operation.
     :param survivor_strategy: Strategy for selecting survivors.
-    :return: Best individual found, its fitness score, and violation details.
+    :param evaluate: Batch evaluator returning an array of scores for an encoded population.
+    :param profiler: Optional `GenerationProfiler` timing each phase.
+    :param local_search: Optional `LocalSearch` run on the best survivors.
+    :param model: Optional precompiled `ConstraintModel`, passed on to `local_search`.
     """
-    # Initialize population
-    population = initialize_population(constraints, population_size)
-    fitness_scores = [evaluate_fitness(ind, constraints)[0] for ind in population]
+    population, fitness_scores = buffers.population, buffers.fitness
+    offspring = buffers.offspring
 
-    best_fitness = max(fitness_scores)
-    idx_best = fitness_scores.index(best_fitness)
-    generations_graph = [best_fitness]
-    generation = 0
-
-    while best_fitness != 0 and generation < generations_size:
-        # --- Parent Selection ---
+    # --- Parent Selection ---
+    with profiler.phase("selection"):
         match selection_method:
             case "tournament_selection":
-                selected = tournament_selection(population, fitness_scores, tournament_size=population_size // 10)
+                parent_indices = tournament_selection_indices(fitness_scores, tournament_size=len(population) // 10,
+                                                              n_parents=len(offspring))
             case "rank_based_selection":
-                selected = rank_based_selection(population, fitness_scores, selection_pressure=1.2)
+                parent_indices = rank_based_selection_indices(fitness_scores, selection_pressure=1.2,
+                                                              n_parents=len(offspring))
             case _:
                 raise ValueError(f"Unknown selection method: {selection_method}")
 
 
-        # --- Crossover ---
-        new_population = []
-        for i in range(0, len(selected) - 1, 2):
-            parent1, parent2 = selected[i], selected[i+1]
-            match crossover_method:
-                case "order_crossover":
-                    child1, child2 = order_crossover(parent1, parent2)
-                case "PMX_Crossover":
-                    child1, child2 = PMX_Crossover(parent1, parent2)
-                case _:
-                    raise ValueError(f"Unknown crossover type: {crossover_method}")
-            new_population.extend([child1, child2])
-
-        # --- Mutation ---
+    # --- Crossover ---
+    with profiler.phase("crossover"):
+        match crossover_method:
+            case "order_crossover":
+                crossover = order_crossover_encoded
+            case "PMX_Crossover":
+                crossover = PMX_Crossover_encoded
+            case _:
+                raise ValueError(f"Unknown crossover type: {crossover_method}")
+        for i in range(0, len(offspring), 2):
+            crossover(population[parent_indices[i]], population[parent_indices[i+1]],
+                      out=(offspring[i], offspring[i+1]))
+
+    # --- Mutation ---
+    with profiler.phase("mutation"):
         match mutation_method:
             case "attribute_level_mutation":
-                mutated_population = [attribute_level_mutation(constraints, ind) for ind in new_population]
+                for ind in offspring:
+                    attribute_level_mutation_encoded(constraints, ind)
             case "swap_mutation":
-                mutated_population = [swap_mutation(ind) for ind in new_population]
+                for ind in offspring:
+                    swap_mutation_encoded(ind)
             case _:
                 raise ValueError(f"Unknown mutation type: {mutation_method}")
 
-        # --- Evaluate Fitness ---
-        offspring_fitness = [evaluate_fitness(ind, constraints)[0] for ind in mutated_population]
+    # --- Evaluate Fitness ---
+    with profiler.phase("evaluation"):
+        profiler.count_requests(len(offspring))
+        buffers.offspring_fitness[:] = evaluate(offspring)
 
-        # --- Survivor Selection ---
+    # --- Survivor Selection ---
+    with profiler.phase("survivor_selection"):
         match survivor_strategy:
             case "elitism":
-                population = elitism(population, mutated_population, fitness_scores, offspring_fitness)
-                fitness_scores = [evaluate_fitness(ind, constraints)[0] for ind in population]
+                survivors = elitism_indices(fitness_scores, buffers.offspring_fitness)
             case "genitor":
-                population = genitor(population, mutated_population, fitness_scores, offspring_fitness)
-                fitness_scores = [evaluate_fitness(ind, constraints)[0] for ind in population]
+                survivors = genitor_indices(fitness_scores, buffers.offspring_fitness)
             case _:
-                population = mutated_population
-                fitness_scores = offspring_fitness
-
-        # --- Track Best ---
-        generation_best_fitness = max(fitness_scores)
-        if generation_best_fitness > best_fitness:
-            best_fitness = generation_best_fitness
-            idx_best = fitness_scores.index(best_fitness)
-
-        generations_graph.append(best_fitness)
-        print(f"Generation {generation}: Best Fitness = {best_fitness}")
-        generation += 1
-    score, venue_violations, rest_period_violations, time_violations_details = evaluate_fitness(population[idx_best], constraints)
-    return population[idx_best],score, venue_violations, rest_period_violations, time_violations_details, generations_graph
+                raise ValueError(f"Unknown survivor strategy: {survivor_strategy}")
+        buffers.advance(survivors)
+
+    # --- Memetic Local Search ---
+    if local_search is not None:
+        with profiler.phase("local_search"):
+            local_search.improve_population(buffers.population, buffers.fitness, constraints, model=model)
+
+
+class GenerationSnapshot(NamedTuple):
+    """Progress of a run after one generation, as yielded by `genetic_algorithm_iter`."""
+    generation: int
+    best_fitness: int
+    mean_fitness: float
+    best_index: int
+    violations: dict
+    best_individual: np.ndarray
+    stop_reason: str | None = None
+
+
+def genetic_algorithm_iter(constraints, population_size, generations_size,
+                           crossover_method, mutation_method, selection_method, survivor_strategy="elitism",
+                           fitness_cache=None, workers=None, seed=None, profiler=None, log_interval=1,
+                           checkpoint_path=None, checkpoint_interval=10, resume_state=None, stopping=None,
+                           seeded_fraction=0.0, local_search=None):
+    """
+    Genetic Algorithm for scheduling, yielding a snapshot after every generation.
+
+    The first snapshot (generation 0) describes the initial population. Stop iterating
+    at any time to end the run early; `schedule_result` turns the last snapshot into
+    the same values `genetic_algorithm` returns.
+
+    The last snapshot carries the reason the run stopped in `stop_reason`.
+    A run resumed from a checkpoint starts with a snapshot of the checkpointed generation
+    and continues exactly as the original run would have.
+
+    :param constraints: Constraints for the scheduling problem.
+    :param population_size: Size of the population.
+    :param generations_size: Number of generations to run.
+    :param crossover_method: Method for crossover operation.
+    :param mutation_method: Method for mutation operation.
+    :param selection_method: Method for selection operation.
+    :param survivor_strategy: Strategy for selecting survivors.
+    :param fitness_cache: Optional `FitnessCache` to reuse (and inspect hit/miss statistics of) across runs
+        on the same constraints; a cache used with other constraints raises ValueError.
+    :param workers: Number of processes for fitness evaluation (None or 1 evaluates in this process).
+    :param seed: Optional seed for `random` and `numpy.random`; results do not depend on `workers`.
+    :param profiler: Optional `GenerationProfiler` that records per-phase timings and fitness counts.
+    :param log_interval: Log progress every this many generations (0 disables it).
+    :param checkpoint_path: Optional .npz file to write a checkpoint to, on a background thread.
+    :param checkpoint_interval: Write the checkpoint every this many generations.
+    :param resume_state: Optional state from `load_checkpoint` to continue instead of starting afresh.
+    :param stopping: Optional `StoppingCriteria`; by default the run stops at fitness 0 or the generation cap.
+    :param seeded_fraction: Share of the initial population built with the round-robin heuristic.
+    :param local_search: Optional `LocalSearch` that hill-climbs the best individuals every generation.
+    :return: Generator of `GenerationSnapshot`; `best_individual` is the best encoded individual found so far.
+    """
+    if seed is not None and resume_state is None:
+        random.seed(seed)
+        np.random.seed(seed)
+
+    match_table = build_match_table(constraints)
+    model = ConstraintModel(constraints, match_table)
+    if fitness_cache is None:
+        fitness_cache = FitnessCache()
+    fitness_cache.bind(model.fingerprint)
+    if profiler is None:
+        profiler = NULL_PROFILER
+    if stopping is None:
+        stopping = StoppingCriteria()
+    writer = CheckpointWriter(checkpoint_path, checkpoint_interval) if checkpoint_path else None
+    config = {"population_size": population_size, "generations_size": generations_size,
+              "crossover_method": crossover_method, "mutation_method": mutation_method,
+              "selection_method": selection_method, "survivor_strategy": survivor_strategy}
+
+    if workers and workers > 1:
+        evaluator = ParallelEvaluator(constraints, workers, population_size)
+    else:
+        evaluator = nullcontext(model.evaluate)
+
+    def snapshot():
+        violations = {name: int(count[0]) for name, count in model.count_violations(best_individual[None]).items()}
+        return GenerationSnapshot(
+            generation=generation,
+            best_fitness=best_fitness,
+            mean_fitness=float(buffers.fitness.mean()),
+            best_index=int(buffers.fitness.argmax()),
+            violations=violations,
+            best_individual=best_individual,
+            stop_reason=stopping.reason,
+        )
+
+    def check_stop():
+        reason = stopping.check(history, buffers.population, best_individual)
+        if reason is None and generation >= generations_size:
+            reason = "generations"
+        stopping.reason = reason
+        return reason
+
+    def write_checkpoint():
+        if writer is not None and writer.due(generation):
+            writer.submit(capture_state(generation, buffers.population, buffers.fitness.tolist(), best_fitness,
+                                        best_individual, history, config,
+                                        local_search.stuck_keys() if local_search is not None else ()))
+
+    with evaluator as evaluate_batch:
+        evaluate_batch = profiler.counted(evaluate_batch)
+
+        def evaluate(population):
+            return fitness_cache.evaluate(population, evaluate_batch)
+
+        try:
+            if resume_state is None:
+                # Initialize population (encoded as an array of shape (population, matches, 4))
+                buffers = PopulationBuffers(population_size, len(match_table))
+                buffers.population[:] = initialize_encoded_population(constraints, population_size, seeded_fraction)
+                buffers.fitness[:] = evaluate(buffers.population)
+
+                best_index = int(buffers.fitness.argmax())
+                best_fitness = int(buffers.fitness[best_index])
+                best_individual = buffers.population[best_index].copy()
+                generation = 0
+                history = [best_fitness]
+                write_checkpoint()
+            else:
+                buffers = PopulationBuffers.from_population(resume_state["population"], resume_state["fitness_scores"])
+                best_fitness = resume_state["best_fitness"]
+                best_individual = resume_state["best_individual"].copy()
+                generation = resume_state["generation"]
+                history = list(resume_state["history"])
+                restore_random_state(resume_state)
+                if local_search is not None:
+                    local_search.restore_stuck(resume_state.get("stuck_keys", []))
+            stop_reason = check_stop()
+            yield snapshot()
+
+            while stop_reason is None:
+                profiler.start_generation(generation)
+                evolve_generation(buffers, constraints, crossover_method, mutation_method,
+                                  selection_method, survivor_strategy, evaluate, profiler, local_search, model)
+
+                # --- Track Best ---
+                with profiler.phase("best_tracking"):
+                    best_index = int(buffers.fitness.argmax())
+                    if buffers.fitness[best_index] > best_fitness:
+                        best_fitness = int(buffers.fitness[best_index])
+                        best_individual = buffers.population[best_index].copy()
+                profiler.end_generation()
+
+                generation += 1
+                history.append(best_fitness)
+                write_checkpoint()
+                stop_reason = check_stop()
+                if log_interval and generation % log_interval == 0:
+                    logger.info("Generation %d: Best Fitness = %d", generation, best_fitness)
+                yield snapshot()
+
+            logger.info("Stopped at generation %d: %s", generation, stop_reason)
+        finally:
+            profiler.finish()
+            if writer is not None:
+                writer.close()
+
+
+def schedule_result(constraints, best_individual, generations_graph, model=None):
+    """
+    Decode a run's best individual and collect its violation details.
+
+    :param constraints: Constraints for the scheduling problem.
+    :param best_individual: Best encoded individual of the run.
+    :param generations_graph: Best fitness per generation.
+    :param model: Optional precompiled `ConstraintModel` of the constraints.
+    :return: Best schedule, its fitness score, venue/rest/time violation details and the fitness history.
+    """
+    if model is None:
+        model = ConstraintModel(constraints)
+    best_schedule = decode_schedule(best_individual, constraints, model.match_table)
+    score, venue_violations, rest_period_violations, time_violations_details = evaluate_fitness(
+        best_schedule, constraints, model
+    )
+    return best_schedule, score, venue_violations, rest_period_violations, time_violations_details, generations_graph
+
+
+def genetic_algorithm(constraints, population_size, generations_size, 
+                      crossover_method, mutation_method,selection_method, survivor_strategy="elitism", **options):
+    """
+    Genetic Algorithm for scheduling.
+    :param constraints: Constraints for the scheduling problem.
+    :param population_size: Size of the population.
+    :param generations_size: Number of generations to run.
+    :param crossover_method: Method for crossover operation.
+    :param mutation_method: Method for mutation operation.
+    :param selection_method: Method for selection operation.
+    :param survivor_strategy: Strategy for selecting survivors.
+    :param options: Optional settings of `genetic_algorithm_iter` (fitness_cache, workers, seed, profiler,
+        log_interval, checkpoint_path, checkpoint_interval, resume_state, stopping, seeded_fraction,
+        local_search). Pass a `StoppingCriteria`
+        as `stopping` to read why the run stopped from its `reason` afterwards.
+    :return: Best individual found, its fitness score, and violation details.
+    """
+    resume_state = options.get("resume_state")
+    # The first snapshot of a resumed run repeats the last generation in its history
+    generations_graph = resume_state["history"][:-1] if resume_state else []
+    for snapshot in genetic_algorithm_iter(constraints, population_size, generations_size, crossover_method,
+                                           mutation_method, selection_method, survivor_strategy, **options):
+        generations_graph.append(snapshot.best_fitness)
+
+    return schedule_result(constraints, snapshot.best_individual, generations_graph)
+
+
+def resume_genetic_algorithm(constraints, checkpoint_path, generations_size=None, **options):
+    """
+    Continue a run from its checkpoint file, with the operators it was started with.
+
+    With the same `generations_size` the result is identical to the uninterrupted run.
+    The resumed run keeps checkpointing to the same file unless `checkpoint_path` is
+    passed in `options`.
+
+    :param constraints: Constraints for the scheduling problem.
+    :param checkpoint_path: Checkpoint file written by a previous run.
+    :param generations_size: Optional new generation cap (defaults to the original one).
+    :param options: Optional settings of `genetic_algorithm_iter` (fitness_cache, workers, profiler, ...).
+    :return: Same values as `genetic_algorithm`.
+    """
+    state = load_checkpoint(checkpoint_path)
+    config = dict(state["config"])
+    if generations_size is not None:
+        config["generations_size"] = generations_size
+    options.setdefault("checkpoint_path", checkpoint_path)
+    return genetic_algorithm(constraints, **config, resume_state=state, **options)
@@ -0,0 +1,74 @@
+import numpy as np
+
+# Reasons a run can stop for, as reported in `StoppingCriteria.reason`
+STOP_REASONS = ("target_fitness", "patience", "improvement_rate", "diversity", "generations")
+
+
+def population_diversity(population, reference):
+    """
+    Mean fraction of matches in which an individual differs from a reference individual.
+
+    :param population: Encoded population of shape (population, matches, 4).
+    :param reference: Encoded individual of shape (matches, 4), usually the best one.
+    :return: Diversity in [0, 1]; 0 means every individual equals the reference.
+    """
+    return float((population != reference).any(axis=2).mean())
+
+
+class StoppingCriteria:
+    """
+    Convergence checks that end a genetic algorithm run before the generation cap.
+
+    Pass an instance to `genetic_algorithm(..., stopping=...)`; after the run `reason`
+    holds the entry of `STOP_REASONS` that ended it. Every check only looks at the
+    fitness history and the current population, so resumed runs stop at the same
+    generation as uninterrupted ones.
+
+    :param target_fitness: Stop once the best fitness reaches this value (0 means no violations left).
+    :param patience: Stop after this many generations without improvement of the best fitness.
+    :param min_improvement_rate: Stop when the best fitness improved by less than this per generation,
+        averaged over the last `rate_window` generations.
+    :param rate_window: Number of generations the improvement rate is averaged over.
+    :param min_diversity: Stop when `population_diversity` to the best individual drops below this.
+    """
+
+    def __init__(self, target_fitness=0, patience=None, min_improvement_rate=None, rate_window=50,
+                 min_diversity=None):
+        if rate_window < 1:
+            raise ValueError("Improvement rate window must be at least 1.")
+        self.target_fitness = target_fitness
+        self.patience = patience
+        self.min_improvement_rate = min_improvement_rate
+        self.rate_window = rate_window
+        self.min_diversity = min_diversity
+        self.reason = None
+
+    def check(self, history, population, best_individual):
+        """
+        Decide whether the run should stop after the latest generation.
+
+        :param history: Best fitness per generation so far, starting with the initial population.
+        :param population: Current encoded population.
+        :param best_individual: Best encoded individual found so far.
+        :return: The stop reason, or None to keep going.
+        """
+        best_fitness = history[-1]
+        generation = len(history) - 1
+
+        if self.target_fitness is not None and best_fitness >= self.target_fitness:
+            return "target_fitness"
+
+        if self.patience is not None and generation >= self.patience:
+            # History holds the best fitness so far, so a plateau is a run of equal values at its end
+            if history[-1 - self.patience] == best_fitness:
+                return "patience"
+
+        if self.min_improvement_rate is not None and generation >= self.rate_window:
+            rate = (best_fitness - history[-1 - self.rate_window]) / self.rate_window
+            if rate < self.min_improvement_rate:
+                return "improvement_rate"
+
+        if self.min_diversity is not None and population_diversity(population, best_individual) < self.min_diversity:
+            return "diversity"
+
+        return None
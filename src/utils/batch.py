@@ -0,0 +1,203 @@
+"""
+Schedule many tournaments in one go on a process pool.
+
+Run from the repository root:
+    python -m src.utils.batch leagues/ --workers 8 --output data/batch.jsonl
+    python -m src.utils.batch leagues.jsonl --population 300 --generations 200 --schedules data/schedules
+
+The source is a directory of constraints JSON files, a JSONL file with one
+constraints object per line, or "-" for JSONL on stdin. Instances are read
+lazily and at most --max-in-flight of them are queued at once. Every finished
+instance is written as one JSON summary line (fitness, violations, runtime)
+in completion order. With --schedules each best schedule is also written to
+<DIR>/<instance>.csv in the columns of main.py's best_schedule.csv, and the
+summary gives its path.
+"""
+import argparse
+import io
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from src.ga.scheduler import (
+    CROSSOVER_METHODS, MUTATION_METHODS, SELECTION_METHODS, SURVIVOR_STRATEGIES, genetic_algorithm_iter
+)
+from src.utils.export import MAIN_COLUMNS, write_schedules
+from src.utils.helper import parse_input_data
+
+# Settings of every run of a batch, passed on to `genetic_algorithm_iter`
+RUN_DEFAULTS = {
+    "population_size": 200,
+    "generations_size": 100,
+    "crossover_method": "PMX_Crossover",
+    "mutation_method": "swap_mutation",
+    "selection_method": "tournament_selection",
+    "survivor_strategy": "elitism",
+    "seed": None,
+}
+
+
+def read_instances(source):
+    """
+    Lazily read tournament instances from a directory, a JSONL file or stdin.
+
+    Instances are not parsed here, so a malformed one only fails its own job.
+
+    :param source: Directory of .json files, path of a .jsonl file, or "-" for JSONL on stdin.
+    :return: Generator of (name, raw JSON text) pairs; JSONL instances are named "<source>:<line>".
+    """
+    if os.path.isdir(source):
+        for entry in sorted(os.listdir(source)):
+            if entry.endswith(".json"):
+                with open(os.path.join(source, entry), "r") as f:
+                    yield entry, f.read()
+        return
+
+    stream = sys.stdin if source == "-" else open(source, "r")
+    try:
+        for line_number, line in enumerate(stream, start=1):
+            if line.strip():
+                yield f"{source}:{line_number}", line
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+
+def schedule_path(schedules, name):
+    """
+    Path the best schedule of an instance is written to.
+
+    :param schedules: Output directory.
+    :param name: Instance name, e.g. "league.json" or "leagues.jsonl:3".
+    :return: Path of a CSV file in `schedules` named after the instance.
+    """
+    stem = os.path.basename(name)
+    if stem.endswith(".json"):
+        stem = stem[:-len(".json")]
+    return os.path.join(schedules, re.sub(r"[^\w.-]+", "_", stem) + ".csv")
+
+
+def run_instance(name, raw, config, schedules=None):
+    """
+    Parse and schedule one instance.
+
+    :param name: Instance name reported in the summary.
+    :param raw: Constraints JSON text.
+    :param config: Run settings keyed like `RUN_DEFAULTS`.
+    :param schedules: Optional directory the best schedule is written to, see `schedule_path`.
+    :return: Summary dict with the best fitness, its violation counts, the generations run,
+             why the run stopped, the runtime and the schedule path if one was written,
+             or with an "error" message if it failed.
+    """
+    start = time.perf_counter()
+    try:
+        constraints = parse_input_data(io.StringIO(raw))
+        for snapshot in genetic_algorithm_iter(constraints, log_interval=0, **config):
+            pass
+        if schedules is not None:
+            path = schedule_path(schedules, name)
+            write_schedules(path, snapshot.best_individual, constraints, columns=MAIN_COLUMNS)
+    except Exception as error:
+        return {"instance": name, "error": f"{type(error).__name__}: {error}",
+                "runtime": time.perf_counter() - start}
+
+    summary = {
+        "instance": name,
+        "fitness": snapshot.best_fitness,
+        "violations": snapshot.violations,
+        "generations": snapshot.generation,
+        "stop_reason": snapshot.stop_reason,
+        "runtime": time.perf_counter() - start,
+    }
+    if schedules is not None:
+        summary["schedule"] = path
+    return summary
+
+
+def run_batch(instances, out, config=None, workers=None, max_in_flight=None, schedules=None):
+    """
+    Schedule instances on a process pool, writing each summary as soon as its job finishes.
+
+    Only `max_in_flight` instances are read ahead of the workers, so neither the inputs
+    nor the results of a large batch are ever held in memory at once.
+
+    :param instances: Iterable of (name, raw JSON text) pairs, e.g. from `read_instances`.
+    :param out: Text stream that receives one JSON summary line per instance.
+    :param config: Run settings overriding `RUN_DEFAULTS`.
+    :param workers: Number of worker processes (defaults to the CPU count).
+    :param max_in_flight: Most instances submitted at once (defaults to twice the workers).
+    :param schedules: Optional directory each best schedule is written to; created if missing.
+    :return: Number of instances scheduled and number that failed.
+    """
+    config = {**RUN_DEFAULTS, **(config or {})}
+    workers = workers or os.cpu_count() or 1
+    if max_in_flight is None:
+        max_in_flight = 2 * workers
+    if max_in_flight < 1:
+        raise ValueError("Number of in-flight instances must be at least 1.")
+    if schedules is not None:
+        os.makedirs(schedules, exist_ok=True)
+
+    finished = failed = 0
+    instances = iter(instances)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+        exhausted = False
+        while pending or not exhausted:
+            while not exhausted and len(pending) < max_in_flight:
+                instance = next(instances, None)
+                if instance is None:
+                    exhausted = True
+                else:
+                    pending.add(pool.submit(run_instance, *instance, config, schedules))
+
+            if not pending:
+                break
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                summary = future.result()
+                out.write(json.dumps(summary) + "\n")
+                out.flush()
+                finished += 1
+                failed += "error" in summary
+
+    return finished, failed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("source", help="Directory of constraints JSON files, a JSONL file, or - for JSONL on stdin.")
+    parser.add_argument("--output", help="JSONL file that receives the summaries (default: stdout).")
+    parser.add_argument("--crossover", choices=CROSSOVER_METHODS, default=RUN_DEFAULTS["crossover_method"])
+    parser.add_argument("--mutation", choices=MUTATION_METHODS, default=RUN_DEFAULTS["mutation_method"])
+    parser.add_argument("--selection", choices=SELECTION_METHODS, default=RUN_DEFAULTS["selection_method"])
+    parser.add_argument("--survivor", choices=SURVIVOR_STRATEGIES, default=RUN_DEFAULTS["survivor_strategy"])
+    parser.add_argument("--population", type=int, default=RUN_DEFAULTS["population_size"], help="Population size.")
+    parser.add_argument("--generations", type=int, default=RUN_DEFAULTS["generations_size"], help="Generation cap.")
+    parser.add_argument("--seed", type=int, default=None, help="Seed every instance is run with.")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count).")
+    parser.add_argument("--max-in-flight", type=int, default=None,
+                        help="Instances queued at once (default: twice the workers).")
+    parser.add_argument("--schedules", help="Directory that receives the best schedule of every instance as CSV.")
+    args = parser.parse_args()
+
+    config = {
+        "population_size": args.population,
+        "generations_size": args.generations,
+        "crossover_method": args.crossover,
+        "mutation_method": args.mutation,
+        "selection_method": args.selection,
+        "survivor_strategy": args.survivor,
+        "seed": args.seed,
+    }
+
+    out = open(args.output, "w") if args.output else sys.stdout
+    try:
+        finished, failed = run_batch(read_instances(args.source), out, config, args.workers, args.max_in_flight,
+                                     args.schedules)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    print(f"Scheduled {finished} instances, {failed} failed", file=sys.stderr)
@@ -0,0 +1,181 @@
+import os
+import numpy as np
+import pandas as pd
+from src.ga.constraint_model import absolute_day_table
+from src.ga.encoding import VENUE, DAY, SLOT, WEEK, build_match_table
+
+# File suffix to export format
+FORMATS = {".csv": "csv", ".parquet": "parquet", ".arrow": "arrow", ".feather": "arrow", ".ipc": "arrow"}
+
+# Column names and order of best_schedule.csv as main.py has always written it, keyed by frame column
+MAIN_COLUMNS = {"Team 1": "Team1", "Team 2": "Team2", "Venue": "Venue", "Day": "Day",
+                "Time Slot": "Time Slot", "Week": "Week"}
+
+
+def export_format(path, format=None):
+    """
+    Export format of a path: `format` if given, otherwise looked up from the file suffix.
+
+    :param path: Output file path.
+    :param format: Optional format name ("csv", "parquet" or "arrow").
+    :return: The format name.
+    """
+    format = format or FORMATS.get(os.path.splitext(str(path))[1].lower())
+    if format not in FORMATS.values():
+        raise ValueError(f"Cannot export to {path!r}: choose one of {sorted(set(FORMATS.values()))}.")
+    return format
+
+
+def schedule_frame(genes, constraints, fitness=None, match_table=None, sort=True):
+    """
+    Turn encoded schedules into a columnar table in one vectorized step.
+
+    Names are not looked up per match: every column is a categorical built from the
+    gene codes and the name lists of the constraints, so the cost is a few array
+    operations however many schedules are exported.
+
+    :param genes: Encoded individual of shape (matches, 4) or a batch of shape (schedules, matches, 4).
+    :param constraints: The constraints dictionary.
+    :param fitness: Optional fitness score per schedule of a batch, stored in a "Fitness" column.
+    :param match_table: Optional precomputed match table.
+    :param sort: Order the matches of each schedule by calendar day and time slot.
+    :return: DataFrame with Week, Day, Time Slot, Venue, Team 1 and Team 2 columns,
+             preceded by "Schedule" (and "Fitness") for a batch.
+    """
+    if match_table is None:
+        match_table = build_match_table(constraints)
+
+    genes = np.asarray(genes)
+    batch = genes.ndim == 3
+    if not batch:
+        genes = genes[None]
+    n_schedules, n_matches = genes.shape[:2]
+
+    if sort:
+        absolute_days = absolute_day_table(constraints)[genes[..., WEEK], genes[..., DAY]]
+        order = np.lexsort((genes[..., SLOT], absolute_days), axis=-1)
+        genes = np.take_along_axis(genes, order[..., None], axis=1)
+        teams = match_table[order]
+    else:
+        teams = np.broadcast_to(match_table, (n_schedules, n_matches, 2))
+
+    team_names = [team['TeamName'] for team in constraints['teams']]
+    venue_names = [venue['VenueName'] for venue in constraints['venues']]
+
+    def categorical(codes, categories):
+        # Categories must be unique, but the constraints do not require unique team or venue names
+        if len(set(categories)) < len(categories):
+            return np.asarray(categories, dtype=object)[codes.ravel()]
+        return pd.Categorical.from_codes(codes.ravel(), categories=categories)
+
+    columns = {}
+    if batch:
+        columns["Schedule"] = np.repeat(np.arange(n_schedules), n_matches)
+        if fitness is not None:
+            columns["Fitness"] = np.repeat(np.asarray(fitness), n_matches)
+    columns["Week"] = categorical(genes[..., WEEK], constraints['weeks'])
+    columns["Day"] = categorical(genes[..., DAY], constraints['days'])
+    columns["Time Slot"] = categorical(genes[..., SLOT], constraints['time_slots'])
+    columns["Venue"] = categorical(genes[..., VENUE], venue_names)
+    columns["Team 1"] = categorical(teams[..., 0], team_names)
+    columns["Team 2"] = categorical(teams[..., 1], team_names)
+    return pd.DataFrame(columns)
+
+
+def write_schedules(path, genes, constraints, fitness=None, format=None, sort=True, columns=None):
+    """
+    Write encoded schedules to a CSV, Parquet or Arrow IPC file.
+
+    :param path: Output file path; the format is taken from its suffix unless `format` is given.
+    :param genes: Encoded individual or batch of individuals, as for `schedule_frame`.
+    :param constraints: The constraints dictionary.
+    :param fitness: Optional fitness score per schedule of a batch.
+    :param format: Optional format name ("csv", "parquet" or "arrow").
+    :param sort: Order the matches of each schedule by calendar day and time slot.
+    :param columns: Optional dict of `schedule_frame` column to output name, in output order (e.g. `MAIN_COLUMNS`).
+    """
+    with ScheduleWriter(path, constraints, format, columns) as writer:
+        writer.write(genes, fitness, sort)
+
+
+class ScheduleWriter:
+    """
+    Streams batches of encoded schedules into one CSV, Parquet or Arrow IPC file.
+
+    Each `write` converts and appends one batch, so exporting thousands of schedules
+    never holds more than a batch as a table. Parquet and Arrow need `pyarrow`.
+
+    :param path: Output file path; the format is taken from its suffix unless `format` is given.
+    :param constraints: The constraints dictionary.
+    :param format: Optional format name ("csv", "parquet" or "arrow").
+    :param columns: Optional dict of `schedule_frame` column to output name, in output order;
+        the "Schedule" and "Fitness" columns of a batch always come first.
+    """
+
+    def __init__(self, path, constraints, format=None, columns=None):
+        self.path = path
+        self.constraints = constraints
+        self.columns = columns
+        self.format = export_format(path, format)
+        self.match_table = build_match_table(constraints)
+        self.schedules_written = 0
+        self._writer = None
+        self._file = None
+
+        if self.format != "csv":
+            try:
+                import pyarrow
+                import pyarrow.ipc
+                import pyarrow.parquet
+            except ImportError as error:
+                raise ImportError(f"Exporting to {self.format} needs pyarrow (pip install pyarrow).") from error
+            self._pyarrow = pyarrow
+
+    def write(self, genes, fitness=None, sort=True):
+        """
+        Append encoded schedules to the file.
+
+        :param genes: Encoded individual or batch of individuals, as for `schedule_frame`.
+        :param fitness: Optional fitness score per schedule of a batch.
+        :param sort: Order the matches of each schedule by calendar day and time slot.
+        """
+        frame = schedule_frame(genes, self.constraints, fitness, self.match_table, sort)
+        if self.columns is not None:
+            leading = [column for column in ("Schedule", "Fitness") if column in frame]
+            frame = frame[leading + list(self.columns)].rename(columns=self.columns)
+        if "Schedule" in frame:
+            # Number schedules across batches, not within each one
+            frame["Schedule"] += self.schedules_written
+            self.schedules_written += len(genes)
+        else:
+            self.schedules_written += 1
+
+        if self.format == "csv":
+            if self._file is None:
+                self._file = open(self.path, "w", newline="")
+                frame.to_csv(self._file, index=False)
+            else:
+                frame.to_csv(self._file, index=False, header=False)
+            return
+
+        table = self._pyarrow.Table.from_pandas(frame, preserve_index=False)
+        if self._writer is None:
+            if self.format == "parquet":
+                self._writer = self._pyarrow.parquet.ParquetWriter(self.path, table.schema)
+            else:
+                self._writer = self._pyarrow.ipc.new_file(self.path, table.schema)
+        self._writer.write_table(table)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,114 @@
+"""
+Synthetic tournament instances in the same JSON schema as data/data.json.
+
+Run from the repository root:
+    python -m src.utils.generator --teams 80 --venues 10 --tightness 0.6 --output data/league_80.json
+"""
+import argparse
+import json
+import math
+import random
+
+DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+
+def make_time_slots(n_slots, first_start=9 * 60, duration=120, gap=30):
+    """
+    Time slot labels like "09:00-11:00", back to back with a gap between slots.
+
+    :param n_slots: Number of slots per day.
+    :return: List of slot labels.
+    """
+    slots = []
+    for i in range(n_slots):
+        start = (first_start + i * (duration + gap)) % (24 * 60)
+        end = (start + duration) % (24 * 60)
+        slots.append(f"{start // 60:02d}:{start % 60:02d}-{end // 60:02d}:{end % 60:02d}")
+    return slots
+
+
+def weeks_for_tightness(n_teams, n_venues, n_days, tightness, rest_hours=72):
+    """
+    Number of weeks that makes the round robin use `tightness` of the available capacity.
+
+    Capacity is whichever binds first: (venue, week, day) slots for all matches, or
+    the days a single team needs to play everyone with the minimum rest in between.
+
+    :param tightness: Fraction of capacity the round robin should use, in (0, 1].
+    :return: Number of weeks (at least 1).
+    """
+    if not 0 < tightness <= 1:
+        raise ValueError("Tightness must be in (0, 1].")
+    n_matches = n_teams * (n_teams - 1) // 2
+    venue_days = n_matches / n_venues
+    rest_days = (n_teams - 1) * max(rest_hours // 24, 1)
+    return max(1, math.ceil(max(venue_days, rest_days) / (tightness * n_days)))
+
+
+def generate_constraints(n_teams, n_venues, n_weeks=None, n_slots=5, n_days=7, tightness=0.5,
+                         rest_hours=72, seed=None):
+    """
+    Build a valid constraints dictionary for a round robin of arbitrary size.
+
+    :param n_teams: Number of teams.
+    :param n_venues: Number of venues.
+    :param n_weeks: Number of weeks; derived from `tightness` when omitted.
+    :param n_slots: Number of time slots per day.
+    :param n_days: Number of playing days per week (Monday first, at most 7).
+    :param tightness: Fraction of venue and rest capacity the season should use when `n_weeks` is omitted.
+    :param rest_hours: Minimum rest between two matches of a team.
+    :param seed: Optional seed for the generated team and venue names.
+    :return: Constraints dictionary.
+    """
+    if n_teams < 2:
+        raise ValueError("At least two teams are needed.")
+    if not 1 <= n_days <= len(DAYS):
+        raise ValueError(f"Days per week must be between 1 and {len(DAYS)}.")
+    if n_weeks is None:
+        n_weeks = weeks_for_tightness(n_teams, n_venues, n_days, tightness, rest_hours)
+
+    rng = random.Random(seed)
+    prefixes = ["North", "South", "East", "West", "Central", "Upper", "Lower", "New", "Old", "Port"]
+    suffixes = ["United", "City", "Rovers", "Athletic", "Wanderers", "Albion", "Town", "Rangers", "Olympic", "FC"]
+
+    return {
+        "rest_periods": {
+            "minimum_hours": rest_hours
+        },
+        "total_days": n_weeks * n_days,
+        "time_slots": make_time_slots(n_slots),
+        "teams": [
+            {"TeamID": i + 1, "TeamName": f"{rng.choice(prefixes)} {rng.choice(suffixes)} {i + 1}"}
+            for i in range(n_teams)
+        ],
+        "venues": [
+            {"VenueID": i + 1, "VenueName": f"Stadium {i + 1}"}
+            for i in range(n_venues)
+        ],
+        "days": DAYS[:n_days],
+        "weeks": [str(week) for week in range(1, n_weeks + 1)],
+        "max_consecutive_matches": 2,
+        "team_constraints": {
+            "avoid_repeats": True,
+            "max_matches_per_day": 1
+        }
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--teams", type=int, required=True)
+    parser.add_argument("--venues", type=int, required=True)
+    parser.add_argument("--weeks", type=int, default=None, help="Weeks in the season (default: from --tightness).")
+    parser.add_argument("--slots", type=int, default=5, help="Time slots per day.")
+    parser.add_argument("--days", type=int, default=7, help="Playing days per week.")
+    parser.add_argument("--tightness", type=float, default=0.5, help="Fraction of venue/rest capacity to use.")
+    parser.add_argument("--rest-hours", type=int, default=72, help="Minimum rest between matches of a team.")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--output", required=True, help="Where to write the constraints JSON.")
+    args = parser.parse_args()
+
+    constraints = generate_constraints(args.teams, args.venues, args.weeks, args.slots, args.days,
+                                       args.tightness, args.rest_hours, args.seed)
+    with open(args.output, "w") as f:
+        json.dump(constraints, f, indent=4)
@@ -1,62 +1,212 @@
-import matplotlib.pyplot as plt
+"""
+Grid search over every operator combination, resumable and run on a process pool.
+
+Run from the repository root:
+    python -m src.utils.grid_search --seeds 0 1 2 --workers 8 --results data/grid_search.jsonl
+
+Every finished run is appended to the results file as one JSON line, so an
+interrupted sweep picks up where it stopped when started again. Runs are tagged
+with the fingerprint of their constraints, so runs on another instance in the
+same file are neither skipped nor summarized.
+"""
+import argparse
+import json
+import os
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from itertools import product
-from src.ga.scheduler import genetic_algorithm
+from src.ga.constraint_model import ConstraintModel
+from src.ga.scheduler import (
+    CROSSOVER_METHODS, MUTATION_METHODS, SELECTION_METHODS, SURVIVOR_STRATEGIES, genetic_algorithm
+)
 from src.utils.helper import parse_input_data
 
-crossover_methods = ["order_crossover", "PMX_Crossover"]
-mutation_methods = ["attribute_level_mutation", "swap_mutation"]
-survivor_strategies = ["elitism", "genitor"]
-selection_methods = ["tournament_selection", "rank_based_selection"]
-
-
-population_size = 200
-generations_size = 100
-
-with open("data/data.json", "r") as f:
-    constraints = parse_input_data(f)
-results = []
-
-for crossover_method, mutation_method, survivor_strategy, selection_methods in product(crossover_methods, mutation_methods, survivor_strategies, selection_methods):
-    print(f"Testing combination: Crossover = {crossover_method}, Mutation = {mutation_method}, Survivor Strategy = {survivor_strategy}, Selection = {selection_methods}")
-    
-    best_individual, best_fitness, venue_violations, rest_period_violations, fitness_graph = genetic_algorithm(
-        constraints, 
-        population_size, 
-        generations_size, 
-        crossover_method, 
-        mutation_method,
-        selection_methods, 
-        survivor_strategy
+# Fields that identify one cell of the sweep; "constraints" is the `ConstraintModel.fingerprint` of the instance
+CELL_KEYS = ("crossover_method", "mutation_method", "survivor_strategy", "selection_method",
+             "seed", "population_size", "generations_size", "constraints")
+
+
+def grid_cells(seeds, population_size, generations_size, fingerprint):
+    """
+    All (operator combination x seed) cells of the sweep.
+
+    :param fingerprint: `ConstraintModel.fingerprint` of the constraints the sweep runs on.
+    :return: List of dicts keyed by `CELL_KEYS`.
+    """
+    return [
+        dict(zip(CELL_KEYS, (crossover, mutation, survivor, selection, seed, population_size, generations_size,
+                             fingerprint)))
+        for crossover, mutation, survivor, selection, seed
+        in product(CROSSOVER_METHODS, MUTATION_METHODS, SURVIVOR_STRATEGIES, SELECTION_METHODS, seeds)
+    ]
+
+
+def load_results(results_path):
+    """
+    Read the runs already recorded in a results file.
+
+    A truncated last line (e.g. from a crash mid-write) is ignored.
+
+    :param results_path: Path of the JSONL results file.
+    :return: List of result dicts.
+    """
+    if not os.path.exists(results_path):
+        return []
+
+    results = []
+    with open(results_path, "r") as f:
+        for line in f:
+            try:
+                results.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    return results
+
+
+def run_cell(constraints, cell):
+    """
+    Run one cell of the sweep and time it.
+
+    :param constraints: The constraints dictionary.
+    :param cell: Dict keyed by `CELL_KEYS`.
+    :return: The cell extended with best fitness, wall time and generations per second.
+    """
+    start = time.perf_counter()
+    _, best_fitness, _, _, _, fitness_graph = genetic_algorithm(
+        constraints,
+        cell["population_size"],
+        cell["generations_size"],
+        cell["crossover_method"],
+        cell["mutation_method"],
+        cell["selection_method"],
+        cell["survivor_strategy"],
+        seed=cell["seed"],
     )
-    
-    results.append({
-        "crossover_method": crossover_method,
-        "mutation_method": mutation_method,
-        "survivor_strategy": survivor_strategy,
-        "selection_method": selection_methods,
+    wall_time = time.perf_counter() - start
+    generations = len(fitness_graph) - 1
+
+    return {
+        **cell,
         "best_fitness": best_fitness,
-        "fitness_graph": fitness_graph
-    })
+        "generations": generations,
+        "wall_time": wall_time,
+        "generations_per_sec": generations / wall_time if wall_time else 0.0,
+        "fitness_graph": fitness_graph,
+    }
+
+
+def run_grid_search(constraints, results_path, population_size=200, generations_size=100, seeds=(0,), workers=None):
+    """
+    Run every unfinished cell of the sweep on a process pool, streaming results to disk.
+
+    :param constraints: The constraints dictionary.
+    :param results_path: JSONL file that receives one line per finished run; cells already in it are skipped.
+        Runs recorded for other constraints stay in the file but are ignored.
+    :param population_size: Population size of every run.
+    :param generations_size: Generation cap of every run.
+    :param seeds: Seeds to run each operator combination with.
+    :param workers: Number of worker processes (defaults to the CPU count).
+    :return: All results on these constraints, previously recorded ones included.
+    """
+    fingerprint = ConstraintModel(constraints).fingerprint
+    results = [result for result in load_results(results_path) if result.get("constraints") == fingerprint]
+    done = {tuple(result[key] for key in CELL_KEYS) for result in results}
+    pending = [cell for cell in grid_cells(seeds, population_size, generations_size, fingerprint)
+               if tuple(cell[key] for key in CELL_KEYS) not in done]
+
+    print(f"{len(done)} runs already recorded, {len(pending)} to go")
+    if not pending:
+        return results
+
+    with ProcessPoolExecutor(max_workers=workers) as pool, open(results_path, "a+") as out:
+        # Terminate a line left half-written by a crash so new results start on their own line
+        if out.tell():
+            out.seek(out.tell() - 1)
+            if out.read(1) != "\n":
+                out.write("\n")
+
+        futures = [pool.submit(run_cell, constraints, cell) for cell in pending]
+        for future in as_completed(futures):
+            result = future.result()
+            out.write(json.dumps(result) + "\n")
+            out.flush()
+            results.append(result)
+            print(f"Finished {combination_label(result)} seed={result['seed']}: "
+                  f"fitness={result['best_fitness']} in {result['wall_time']:.1f}s "
+                  f"({result['generations_per_sec']:.1f} gen/s)")
+
+    return results
+
+
+def combination_label(result):
+    return " + ".join(result[key] for key in CELL_KEYS[:4])
+
+
+def summarize(results):
+    """
+    Aggregate results per operator combination.
+
+    :param results: Result dicts as returned by `run_grid_search`.
+    :return: List of summary dicts sorted by mean best fitness, best first.
+    """
+    groups = defaultdict(list)
+    for result in results:
+        groups[combination_label(result)].append(result)
+
+    summary = []
+    for label, runs in groups.items():
+        summary.append({
+            "combination": label,
+            "runs": len(runs),
+            "best_fitness": max(run["best_fitness"] for run in runs),
+            "mean_fitness": sum(run["best_fitness"] for run in runs) / len(runs),
+            "mean_wall_time": sum(run["wall_time"] for run in runs) / len(runs),
+            "generations_per_sec": sum(run["generations"] for run in runs) / sum(run["wall_time"] for run in runs),
+        })
+    return sorted(summary, key=lambda row: row["mean_fitness"], reverse=True)
+
+
+def print_summary(summary):
+    print(f"\n{'Combination':<80} {'runs':>4} {'best':>6} {'mean':>8} {'wall s':>8} {'gen/s':>8}")
+    for row in summary:
+        print(f"{row['combination']:<80} {row['runs']:>4} {row['best_fitness']:>6} {row['mean_fitness']:>8.2f} "
+              f"{row['mean_wall_time']:>8.1f} {row['generations_per_sec']:>8.1f}")
+
+
+def plot_results(results):
+    """Plot the fitness evolution of every recorded run."""
+    import matplotlib.pyplot as plt
+
+    plt.figure(figsize=(16, 8))
+
+    for result in results:
+        plt.plot(result["fitness_graph"], label=f"{combination_label(result)} (seed {result['seed']})")
 
-best_result = max(results, key=lambda x: x["best_fitness"])
+    plt.title("Fitness Evolution for Different Parameter Combinations")
+    plt.xlabel("Generations")
+    plt.ylabel("Fitness")
+    plt.legend(loc="best")
+    plt.grid(True)
+    plt.show()
 
-print("\nBest Combination:")
-print(f"Crossover Method: {best_result['crossover_method']}")
-print(f"Mutation Method: {best_result['mutation_method']}")
-print(f"Survivor Strategy: {best_result['survivor_strategy']}")
-print(f"Selection Method: {best_result['selection_method']}")
-print(f"Best Fitness: {best_result['best_fitness']}")
 
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--constraints", default="data/data.json", help="Constraints JSON file.")
+    parser.add_argument("--results", default="data/grid_search.jsonl", help="JSONL file that stores finished runs.")
+    parser.add_argument("--population", type=int, default=200, help="Population size.")
+    parser.add_argument("--generations", type=int, default=100, help="Generation cap.")
+    parser.add_argument("--seeds", type=int, nargs="+", default=[0], help="Seeds to run every combination with.")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count).")
+    parser.add_argument("--plot", action="store_true", help="Plot the fitness curves when done.")
+    args = parser.parse_args()
 
-plt.figure(figsize=(16, 8))
+    with open(args.constraints, "r") as f:
+        constraints = parse_input_data(f)
 
-for result in results:
-    label = f"{result['crossover_method']} + {result['mutation_method']} + {result['survivor_strategy']} + {result['selection_method']}"
-    plt.plot(result["fitness_graph"], label=label)
+    results = run_grid_search(constraints, args.results, args.population, args.generations, args.seeds, args.workers)
+    print_summary(summarize(results))
 
-plt.title("Fitness Evolution for Different Parameter Combinations")
-plt.xlabel("Generations")
-plt.ylabel("Fitness")
-plt.legend(loc="best")
-plt.grid(True)
-plt.show()
\ No newline at end of file
+    if args.plot:
+        plot_results(results)
@@ -1,4 +1,3 @@
-import pandas as pd
 import json
 
 def parse_input_data(data_file):
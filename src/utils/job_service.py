@@ -0,0 +1,455 @@
+"""
+Local scheduling job service: submit constraints plus a GA config over HTTP and poll or stream progress.
+
+Run from the repository root:
+    python -m src.utils.job_service --port 8765 --workers 4
+    python -m src.utils.job_service --socket /tmp/scheduler.sock --workers 4
+
+Endpoints (JSON in and out):
+    POST   /jobs              {"constraints": {...}, "config": {...}, "seed": 0, "time_limit": 60} -> {"id": ...}
+    GET    /jobs              status of every job
+    GET    /jobs/<id>         status, latest progress and, once finished, the result
+    GET    /jobs/<id>/events  progress as newline-delimited JSON until the job finishes
+    DELETE /jobs/<id>         cancel a queued or running job
+
+At most --workers jobs run at once, each in its own process; the rest wait in the queue.
+A job that reaches its time limit stops after the current generation and returns the
+best schedule found so far; one that does not stop within a grace period is killed.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import multiprocessing as mp
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from src.ga.scheduler import (
+    CROSSOVER_METHODS, MUTATION_METHODS, SELECTION_METHODS, SURVIVOR_STRATEGIES, genetic_algorithm_iter,
+    schedule_result
+)
+
+logger = logging.getLogger(__name__)
+
+# Config keys a job may set, with their defaults
+DEFAULT_CONFIG = {
+    "population_size": 200,
+    "generations_size": 200,
+    "crossover_method": "PMX_Crossover",
+    "mutation_method": "swap_mutation",
+    "selection_method": "tournament_selection",
+    "survivor_strategy": "elitism",
+    "seeded_fraction": 0.0,
+}
+FINISHED = ("done", "timed_out", "failed", "cancelled")
+
+# Seconds a worker may overrun its time limit before it is killed
+KILL_GRACE = 5.0
+
+# Workers are spawned, not forked, so they do not inherit the service's open client sockets
+# (a forked worker would hold every connection open until its job ends)
+_mp = mp.get_context("spawn")
+
+# Finished jobs are forgotten after this many seconds, or sooner when more than MAX_FINISHED_JOBS pile up
+RETENTION = 3600.0
+MAX_FINISHED_JOBS = 1000
+
+
+def _result_json(constraints, best_individual, generations_graph, stop_reason):
+    schedule, fitness, venue_violations, rest_period_violations, time_violations, generations_fitness = schedule_result(
+        constraints, best_individual, generations_graph
+    )
+    return {
+        "fitness": fitness,
+        "stop_reason": stop_reason,
+        "schedule": schedule,
+        "venue_violations": [{"venue": venue, "week": week, "day": day, "count": count}
+                             for (venue, week, day), count in venue_violations.items()],
+        "rest_period_violations": rest_period_violations,
+        "time_violations": time_violations,
+        "generations_fitness": generations_fitness,
+    }
+
+
+def _job_worker(connection, constraints, config, seed, time_limit, progress_interval):
+    """
+    Run one job in a worker process, sending ("progress", dict) messages and a final ("result", dict).
+
+    :param connection: Write end of the pipe to the service.
+    :param time_limit: Seconds after which the run stops at the end of the current generation, or None.
+    :param progress_interval: Minimum seconds between progress messages.
+    """
+    try:
+        start = time.monotonic()
+        last_sent = 0.0
+        generations_graph = []
+        for snapshot in genetic_algorithm_iter(constraints, seed=seed, log_interval=0, **config):
+            generations_graph.append(snapshot.best_fitness)
+            elapsed = time.monotonic() - start
+            stop_reason = snapshot.stop_reason
+            if stop_reason is None and time_limit is not None and elapsed >= time_limit:
+                stop_reason = "time_limit"
+
+            if stop_reason is not None or elapsed - last_sent >= progress_interval:
+                last_sent = elapsed
+                connection.send(("progress", {
+                    "generation": snapshot.generation,
+                    "best_fitness": snapshot.best_fitness,
+                    "mean_fitness": snapshot.mean_fitness,
+                    "violations": snapshot.violations,
+                    "elapsed": elapsed,
+                }))
+            if stop_reason is not None:
+                break
+
+        connection.send(("result", _result_json(constraints, snapshot.best_individual, generations_graph, stop_reason)))
+    except Exception as e:
+        connection.send(("error", f"{type(e).__name__}: {e}"))
+    finally:
+        connection.close()
+
+
+class Job:
+    """State of one submitted job; `events` holds every progress update for streaming."""
+
+    def __init__(self, constraints, config, seed, time_limit):
+        self.id = uuid.uuid4().hex[:12]
+        self.constraints = constraints
+        self.config = config
+        self.seed = seed
+        self.time_limit = time_limit
+        self.status = "queued"
+        self.submitted = time.time()
+        self.started = None
+        self.finished = None
+        self.progress = None
+        self.result = None
+        self.error = None
+        self.events = []
+        self.process = None
+        self.task = None
+        self.changed = asyncio.Condition()
+
+    def summary(self, include_result=False):
+        summary = {
+            "id": self.id,
+            "status": self.status,
+            "config": self.config,
+            "seed": self.seed,
+            "time_limit": self.time_limit,
+            "submitted": self.submitted,
+            "started": self.started,
+            "finished": self.finished,
+            "progress": self.progress,
+            "error": self.error,
+        }
+        if include_result:
+            summary["result"] = self.result
+        return summary
+
+    async def publish(self, event):
+        async with self.changed:
+            self.events.append(event)
+            self.changed.notify_all()
+
+
+class JobService:
+    """
+    Queue of GA jobs run on a bounded set of worker processes.
+
+    Finished jobs, with their results and events, are kept for `retention` seconds
+    and at most `max_finished` of them at a time, the oldest being evicted first.
+
+    :param workers: Maximum number of jobs running at once.
+    :param default_time_limit: Time limit in seconds for jobs that do not set one (None for no limit).
+    :param progress_interval: Minimum seconds between progress updates of a job.
+    :param retention: Seconds a finished job stays queryable.
+    :param max_finished: Maximum number of finished jobs kept.
+    """
+
+    def __init__(self, workers=2, default_time_limit=None, progress_interval=0.5, retention=RETENTION,
+                 max_finished=MAX_FINISHED_JOBS):
+        if workers < 1:
+            raise ValueError("At least one worker is needed.")
+        _check_time_limit(default_time_limit)
+        self.workers = workers
+        self.default_time_limit = default_time_limit
+        self.progress_interval = progress_interval
+        self.retention = retention
+        self.max_finished = max_finished
+        self.jobs = {}
+        self._slots = asyncio.Semaphore(workers)
+        # One thread per running job waits on its worker's pipe
+        self._receivers = ThreadPoolExecutor(max_workers=workers)
+
+    def submit(self, constraints, config=None, seed=None, time_limit=None):
+        """
+        Queue a job.
+
+        :param constraints: Constraints dictionary.
+        :param config: Optional overrides of `DEFAULT_CONFIG`.
+        :param seed: Optional seed, for reproducible runs.
+        :param time_limit: Optional time limit in seconds (defaults to the service's).
+        :return: The queued `Job`.
+        """
+        config = {**DEFAULT_CONFIG, **(config or {})}
+        unknown = set(config) - set(DEFAULT_CONFIG)
+        if unknown:
+            raise ValueError(f"Unknown config keys: {', '.join(sorted(unknown))}")
+        for key, allowed in (("crossover_method", CROSSOVER_METHODS), ("mutation_method", MUTATION_METHODS),
+                             ("selection_method", SELECTION_METHODS), ("survivor_strategy", SURVIVOR_STRATEGIES)):
+            if config[key] not in allowed:
+                raise ValueError(f"Unknown {key}: {config[key]}")
+        for key in ("population_size", "generations_size"):
+            if not isinstance(config[key], int) or config[key] < 2:
+                raise ValueError(f"{key} must be an integer of at least 2.")
+        _check_time_limit(time_limit)
+
+        self._evict()
+        job = Job(constraints, config, seed, self.default_time_limit if time_limit is None else time_limit)
+        self.jobs[job.id] = job
+        job.task = asyncio.create_task(self._run(job))
+        return job
+
+    async def cancel(self, job_id):
+        """
+        Cancel a job; a running worker process is terminated.
+
+        :return: The job, or None when unknown.
+        """
+        job = self.jobs.get(job_id)
+        if job is None or job.status in FINISHED:
+            return job
+        await self._finish(job, "cancelled")
+        if job.process is not None:
+            job.process.terminate()
+        else:
+            job.task.cancel()
+        return job
+
+    async def close(self):
+        for job in list(self.jobs.values()):
+            await self.cancel(job.id)
+        self._receivers.shutdown(wait=True)
+
+    async def _finish(self, job, status, result=None, error=None):
+        if job.status in FINISHED:
+            return
+        job.status = status
+        job.result = result
+        job.error = error
+        job.finished = time.time()
+        await job.publish({"status": status, "error": error})
+
+    def _evict(self):
+        finished = sorted((job for job in self.jobs.values() if job.status in FINISHED), key=lambda job: job.finished)
+        expired = time.time() - self.retention
+        excess = len(finished) - self.max_finished
+        for i, job in enumerate(finished):
+            if i < excess or job.finished < expired:
+                del self.jobs[job.id]
+
+    async def _run(self, job):
+        async with self._slots:
+            if job.status in FINISHED:
+                return
+            loop = asyncio.get_running_loop()
+            receiver, sender = _mp.Pipe(duplex=False)
+            job.process = _mp.Process(
+                target=_job_worker, daemon=True,
+                args=(sender, job.constraints, job.config, job.seed, job.time_limit, self.progress_interval)
+            )
+            job.process.start()
+            sender.close()
+
+            killed = []
+
+            def kill():
+                killed.append(True)
+                job.process.terminate()
+
+            watchdog = None
+            try:
+                # Anything failing from here on still finishes the job, closes the pipe and joins the worker
+                if job.time_limit is not None:
+                    watchdog = loop.call_later(job.time_limit + KILL_GRACE, kill)
+                job.status = "running"
+                job.started = time.time()
+                await job.publish({"status": "running"})
+
+                while True:
+                    try:
+                        kind, payload = await loop.run_in_executor(self._receivers, receiver.recv)
+                    except EOFError:
+                        await self._finish(job, "timed_out" if killed else "failed",
+                                           error=f"Worker exited without a result (exit code {job.process.exitcode})")
+                        break
+                    if kind == "progress":
+                        job.progress = payload
+                        await job.publish(payload)
+                    elif kind == "result":
+                        await self._finish(job, "timed_out" if payload["stop_reason"] == "time_limit" else "done",
+                                           result=payload)
+                        break
+                    else:
+                        await self._finish(job, "failed", error=payload)
+                        break
+            except Exception as e:
+                job.process.terminate()
+                await self._finish(job, "failed", error=f"{type(e).__name__}: {e}")
+                logger.exception("Job %s failed", job.id)
+            finally:
+                if watchdog is not None:
+                    watchdog.cancel()
+                receiver.close()
+                await loop.run_in_executor(self._receivers, job.process.join)
+                logger.info("Job %s %s", job.id, job.status)
+
+
+def _check_time_limit(time_limit):
+    if time_limit is not None and (isinstance(time_limit, bool) or not isinstance(time_limit, (int, float))
+                                   or not time_limit > 0):
+        raise ValueError(f"time_limit must be a positive number of seconds, not {time_limit!r}.")
+
+
+async def _read_request(reader):
+    """
+    Read one HTTP request.
+
+    :return: (method, path, body), or None when the client sent nothing.
+    :raises ValueError: On a malformed request line or Content-Length.
+    """
+    request_line = (await reader.readline()).decode("latin-1").strip()
+    if not request_line:
+        return None
+    parts = request_line.split(" ", 2)
+    if len(parts) != 3:
+        raise ValueError(f"Malformed request line: {request_line!r}")
+    method, path, _ = parts
+    headers = {}
+    while True:
+        line = (await reader.readline()).decode("latin-1").strip()
+        if not line:
+            break
+        name, _, value = line.partition(":")
+        headers[name.strip().lower()] = value.strip()
+    length = int(headers.get("content-length", 0))
+    if length < 0:
+        raise ValueError(f"Invalid Content-Length: {length}")
+    body = await reader.readexactly(length)
+    return method, path, body
+
+
+def _write_head(writer, status, content_type="application/json", length=None):
+    writer.write(f"HTTP/1.1 {status.value} {status.phrase}\r\n".encode())
+    writer.write(f"Content-Type: {content_type}\r\nConnection: close\r\n".encode())
+    if length is not None:
+        writer.write(f"Content-Length: {length}\r\n".encode())
+    writer.write(b"\r\n")
+
+
+def _write_json(writer, status, payload):
+    body = json.dumps(payload).encode()
+    _write_head(writer, status, length=len(body))
+    writer.write(body)
+
+
+async def _stream_events(writer, job):
+    _write_head(writer, HTTPStatus.OK, "application/x-ndjson")
+    sent = 0
+    while True:
+        async with job.changed:
+            await job.changed.wait_for(lambda: len(job.events) > sent or job.status in FINISHED)
+            events = job.events[sent:]
+        for event in events:
+            writer.write((json.dumps(event) + "\n").encode())
+        sent += len(events)
+        await writer.drain()
+        if job.status in FINISHED and sent == len(job.events):
+            return
+
+
+async def handle_request(service, reader, writer):
+    """Serve one HTTP request on a connection."""
+    try:
+        try:
+            request = await _read_request(reader)
+        except ValueError as e:
+            _write_json(writer, HTTPStatus.BAD_REQUEST, {"error": str(e)})
+            await writer.drain()
+            return
+        if request is None:
+            return
+        method, path, body = request
+        parts = [part for part in path.split("?", 1)[0].split("/") if part]
+
+        if parts == ["jobs"] and method == "POST":
+            try:
+                payload = json.loads(body or b"{}")
+                job = service.submit(payload["constraints"], payload.get("config"), payload.get("seed"),
+                                     payload.get("time_limit"))
+            except (KeyError, ValueError, TypeError) as e:
+                _write_json(writer, HTTPStatus.BAD_REQUEST, {"error": str(e)})
+            else:
+                _write_json(writer, HTTPStatus.ACCEPTED, {"id": job.id, "status": job.status})
+        elif parts == ["jobs"] and method == "GET":
+            _write_json(writer, HTTPStatus.OK, [job.summary() for job in service.jobs.values()])
+        elif len(parts) in (2, 3) and parts[0] == "jobs" and parts[1] in service.jobs:
+            job = service.jobs[parts[1]]
+            if len(parts) == 3 and parts[2] == "events" and method == "GET":
+                await _stream_events(writer, job)
+            elif len(parts) == 2 and method == "GET":
+                _write_json(writer, HTTPStatus.OK, job.summary(include_result=True))
+            elif len(parts) == 2 and method == "DELETE":
+                job = await service.cancel(job.id)
+                _write_json(writer, HTTPStatus.OK, job.summary())
+            else:
+                _write_json(writer, HTTPStatus.METHOD_NOT_ALLOWED, {"error": f"{method} not allowed on {path}"})
+        else:
+            _write_json(writer, HTTPStatus.NOT_FOUND, {"error": f"Not found: {path}"})
+        await writer.drain()
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        writer.close()
+
+
+async def serve(host="127.0.0.1", port=8765, socket_path=None, workers=2, default_time_limit=None):
+    """
+    Run the job service until cancelled.
+
+    :param socket_path: Listen on this Unix socket instead of host and port.
+    """
+    service = JobService(workers, default_time_limit)
+
+    async def handle(reader, writer):
+        await handle_request(service, reader, writer)
+
+    if socket_path:
+        server = await asyncio.start_unix_server(handle, path=socket_path)
+    else:
+        server = await asyncio.start_server(handle, host, port)
+    logger.info("Serving on %s with %d workers", socket_path or f"http://{host}:{port}", workers)
+
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--socket", help="Listen on this Unix socket instead of --host/--port.")
+    parser.add_argument("--workers", type=int, default=2, help="Jobs run at once.")
+    parser.add_argument("--time-limit", type=float, default=None, help="Default per-job time limit in seconds.")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    try:
+        asyncio.run(serve(args.host, args.port, args.socket, args.workers, args.time_limit))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,129 @@
+"""
+Scaling report: run the genetic algorithm on synthetic leagues of growing size.
+
+Run from the repository root:
+    python -m src.utils.scaling_report --teams 20 40 60 80 100 120 --venues 10 --generations 50 --output scaling.json
+
+Each size runs in a fresh process so its peak memory is measured on its own.
+"""
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from src.ga.scheduler import genetic_algorithm
+from src.utils.generator import generate_constraints
+
+
+def _peak_rss_mb():
+    """
+    Peak memory of this process in MB.
+
+    Uses ru_maxrss where `resource` exists (POSIX) and psutil's peak working set otherwise.
+    Without either it falls back to the tracemalloc peak, which starts tracing on the first
+    call and only counts Python and NumPy allocations.
+    """
+    try:
+        import resource
+    except ImportError:
+        pass
+    else:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is reported in bytes on macOS and in kilobytes elsewhere
+        return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+    try:
+        import psutil
+    except ImportError:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        return tracemalloc.get_traced_memory()[1] / 2**20
+    memory = psutil.Process().memory_info()
+    # peak_wset is only reported on Windows
+    return getattr(memory, "peak_wset", memory.rss) / 2**20
+
+
+def measure_size(n_teams, n_venues, tightness, population_size, generations_size, config, seed):
+    """
+    Run the genetic algorithm on one synthetic league and record its cost.
+
+    :return: Dict with the instance size, time per generation, peak memory and generations to feasibility.
+    """
+    constraints = generate_constraints(n_teams, n_venues, tightness=tightness, seed=seed)
+    baseline_mb = _peak_rss_mb()
+
+    start = time.perf_counter()
+    _, best_fitness, _, _, _, fitness_graph = genetic_algorithm(
+        constraints, population_size, generations_size, seed=seed, **config
+    )
+    wall_time = time.perf_counter() - start
+
+    generations = len(fitness_graph) - 1
+    time_per_generation = wall_time / max(generations, 1)
+    feasible_at = fitness_graph.index(0) if 0 in fitness_graph else None
+
+    return {
+        "teams": n_teams,
+        "venues": n_venues,
+        "weeks": len(constraints["weeks"]),
+        "matches": n_teams * (n_teams - 1) // 2,
+        "population_size": population_size,
+        "generations": generations,
+        "best_fitness": best_fitness,
+        "wall_time": wall_time,
+        "time_per_generation": time_per_generation,
+        "peak_memory_mb": _peak_rss_mb(),
+        "baseline_memory_mb": baseline_mb,
+        "generations_to_feasibility": feasible_at,
+        "time_to_feasibility": None if feasible_at is None else feasible_at * time_per_generation,
+    }
+
+
+def scaling_report(team_counts, n_venues=10, tightness=0.5, population_size=200, generations_size=50,
+                   config=None, seed=0):
+    """
+    Measure every league size in its own process.
+
+    :param team_counts: League sizes to run.
+    :param config: Operator config passed to `genetic_algorithm` (crossover/mutation/selection/survivor).
+    :return: List of measurement dicts, one per league size.
+    """
+    if config is None:
+        config = {
+            "crossover_method": "PMX_Crossover",
+            "mutation_method": "attribute_level_mutation",
+            "selection_method": "tournament_selection",
+            "survivor_strategy": "elitism",
+        }
+
+    rows = []
+    for n_teams in team_counts:
+        # A single-use pool gives every size a clean process for the memory measurement
+        with ProcessPoolExecutor(max_workers=1) as pool:
+            row = pool.submit(measure_size, n_teams, n_venues, tightness, population_size,
+                              generations_size, config, seed).result()
+        rows.append(row)
+        print(f"{row['teams']:>6} {row['matches']:>8} {row['time_per_generation']:>10.3f} "
+              f"{row['peak_memory_mb']:>10.1f} {row['best_fitness']:>8} "
+              f"{'-' if row['time_to_feasibility'] is None else format(row['time_to_feasibility'], '.1f'):>10}")
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--teams", type=int, nargs="+", default=[20, 40, 60, 80, 100, 120], help="League sizes.")
+    parser.add_argument("--venues", type=int, default=10)
+    parser.add_argument("--tightness", type=float, default=0.5, help="Fraction of venue/rest capacity to use.")
+    parser.add_argument("--population", type=int, default=200)
+    parser.add_argument("--generations", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write the report as JSON to this file.")
+    args = parser.parse_args()
+
+    print(f"{'teams':>6} {'matches':>8} {'s/gen':>10} {'peak MB':>10} {'fitness':>8} {'feasible s':>10}")
+    report = scaling_report(args.teams, args.venues, args.tightness, args.population, args.generations, seed=args.seed)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
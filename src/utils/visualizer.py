@@ -24,15 +24,13 @@ def visualize_schedule(schedule, venue_violations_details, rest_violations_detai
     for match in schedule:
         team1, team2, venue, day, time_slot, week = match
 
-        # Check if the match has venue conflicts
-        venue_key = (venue["VenueID"], day, week)
-        venue_conflict = any(
-            conflict["venue_key"] == venue_key for conflict in venue_violations_details
-        )
+        # Check if the match has venue conflicts (keyed like count_venue_conflicts)
+        venue_key = (venue["VenueName"], week, day)
+        venue_conflict = venue_key in venue_violations_details
 
-        # Check if the match has rest period violations
+        # Check if the match has rest period violations (teams are named like count_rest_violations)
         rest_violation = any(
-            violation["team"] in [team1["TeamID"], team2["TeamID"]]
+            violation["team"] in [team1["TeamName"], team2["TeamName"]]
             for violation in rest_violations_details
         )
 
@@ -0,0 +1,59 @@
+"""
+Tests of batch scheduling: the in-flight limit and the exported best schedules.
+
+Run from the repository root:
+    python -m pytest tests
+"""
+import io
+import json
+import os
+import tempfile
+import unittest
+import pandas as pd
+from src.ga.encoding import build_match_table
+from src.utils.batch import run_batch
+from src.utils.export import MAIN_COLUMNS
+from src.utils.generator import generate_constraints
+from tests.test_fitness import load_data
+
+CONFIG = {"population_size": 20, "generations_size": 3, "seed": 0}
+
+
+class BatchTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.instances = {"data.json": load_data(),
+                          "leagues.jsonl:2": generate_constraints(n_teams=6, n_venues=2, seed=0)}
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_zero_in_flight_is_rejected(self):
+        with self.assertRaises(ValueError):
+            run_batch([], io.StringIO(), CONFIG, workers=1, max_in_flight=0)
+
+    def test_best_schedules_are_written(self):
+        schedules = os.path.join(self.directory.name, "schedules")
+        out = io.StringIO()
+        finished, failed = run_batch(((name, json.dumps(constraints)) for name, constraints in self.instances.items()),
+                                     out, CONFIG, workers=2, schedules=schedules)
+        self.assertEqual((finished, failed), (2, 0))
+
+        summaries = {summary["instance"]: summary for summary in map(json.loads, out.getvalue().splitlines())}
+        self.assertEqual(summaries["data.json"]["schedule"], os.path.join(schedules, "data.csv"))
+        self.assertEqual(summaries["leagues.jsonl:2"]["schedule"], os.path.join(schedules, "leagues.jsonl_2.csv"))
+        for name, constraints in self.instances.items():
+            with self.subTest(instance=name):
+                frame = pd.read_csv(summaries[name]["schedule"])
+                self.assertEqual(list(frame.columns), list(MAIN_COLUMNS.values()))
+                self.assertEqual(len(frame), len(build_match_table(constraints)))
+
+    def test_summaries_without_schedules(self):
+        out = io.StringIO()
+        run_batch([("data.json", json.dumps(load_data()))], out, CONFIG, workers=1)
+        self.assertNotIn("schedule", json.loads(out.getvalue()))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,36 @@
+"""
+Tests of the fitness cache's binding to one set of constraints.
+
+Run from the repository root:
+    python -m pytest tests
+"""
+import unittest
+from src.ga.cache import FitnessCache
+from src.ga.scheduler import genetic_algorithm
+from src.utils.generator import generate_constraints
+
+RUN = {"population_size": 30, "generations_size": 2, "crossover_method": "PMX_Crossover",
+       "mutation_method": "swap_mutation", "selection_method": "tournament_selection", "seed": 0}
+
+
+class FitnessCacheTest(unittest.TestCase):
+
+    def test_cache_is_reused_for_the_same_constraints(self):
+        cache = FitnessCache()
+        constraints = generate_constraints(n_teams=6, n_venues=3, seed=0)
+        genetic_algorithm(constraints, fitness_cache=cache, **RUN)
+        misses = cache.misses
+        genetic_algorithm(constraints, fitness_cache=cache, **RUN)
+        self.assertEqual(cache.misses, misses)
+
+    def test_cache_rejects_other_constraints(self):
+        cache = FitnessCache()
+        genetic_algorithm(generate_constraints(n_teams=6, n_venues=3, seed=0), fitness_cache=cache, **RUN)
+        other = generate_constraints(n_teams=6, n_venues=3, seed=0)
+        other["rest_periods"] = {"minimum_hours": 24}
+        with self.assertRaisesRegex(ValueError, "different constraints"):
+            genetic_algorithm(other, fitness_cache=cache, **RUN)
+
+
+if __name__ == "__main__":
+    unittest.main()
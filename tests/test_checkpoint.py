@@ -0,0 +1,83 @@
+"""
+Tests that a run resumed from a checkpoint matches the uninterrupted run.
+
+Run from the repository root:
+    python -m pytest tests
+"""
+import os
+import tempfile
+import random
+import unittest
+import numpy as np
+from src.ga.checkpoint import capture_state, load_checkpoint, save_checkpoint
+from src.ga.local_search import LocalSearch
+from src.ga.scheduler import genetic_algorithm
+from src.utils.generator import generate_constraints
+from tests.test_fitness import load_data
+
+RUN = {"population_size": 30, "crossover_method": "PMX_Crossover", "mutation_method": "swap_mutation",
+       "selection_method": "tournament_selection", "seed": 3}
+
+
+class ResumeTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "checkpoint.npz")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def assertResumeMatches(self, constraints, make_local_search=lambda: None, **options):
+        full = genetic_algorithm(constraints, generations_size=20, local_search=make_local_search(), **RUN, **options)
+        genetic_algorithm(constraints, generations_size=10, local_search=make_local_search(),
+                          checkpoint_path=self.path, checkpoint_interval=10, **RUN, **options)
+        state = load_checkpoint(self.path)
+        resumed = genetic_algorithm(constraints, generations_size=20, local_search=make_local_search(),
+                                    resume_state=state, **RUN, **options)
+
+        self.assertEqual(resumed[1], full[1])
+        self.assertEqual(resumed[-1], full[-1])
+        self.assertEqual(resumed[0], full[0])
+        return state
+
+    def test_resume_matches_uninterrupted_run(self):
+        for name, constraints in {"data.json": load_data(),
+                                  "generated": generate_constraints(n_teams=10, n_venues=3, seed=0)}.items():
+            for survivor_strategy in ("elitism", "genitor"):
+                with self.subTest(constraints=name, survivor_strategy=survivor_strategy):
+                    self.assertResumeMatches(constraints, survivor_strategy=survivor_strategy, seeded_fraction=0.2)
+
+    def test_saved_state_loads_back_unchanged(self):
+        np.random.seed(5)
+        random.seed(5)
+        population = np.random.randint(0, 7, size=(4, 6, 4)).astype(np.int16)
+        state = capture_state(3, population, [-4, -2, -9, -1], -1, population[3], [-5, -3, -1, -1],
+                              {**RUN, "generations_size": 20, "survivor_strategy": "elitism"}, [b"\x00" * 16])
+        save_checkpoint(self.path, state)
+        loaded = load_checkpoint(self.path)
+
+        for key in ("generation", "fitness_scores", "best_fitness", "history", "config", "random_state",
+                    "stuck_keys"):
+            self.assertEqual(loaded[key], state[key], key)
+        np.testing.assert_array_equal(loaded["population"], population)
+        np.testing.assert_array_equal(loaded["best_individual"], population[3])
+        random.random()
+        np.random.random()
+        # Restoring the saved generators replays the same draws
+        np.random.set_state(loaded["numpy_state"])
+        random.setstate(loaded["random_state"])
+        draws = (random.random(), np.random.random())
+        np.random.set_state(state["numpy_state"])
+        random.setstate(state["random_state"])
+        self.assertEqual(draws, (random.random(), np.random.random()))
+
+    def test_resume_with_local_search_restores_stuck_individuals(self):
+        constraints = generate_constraints(n_teams=16, n_venues=2, seed=1)
+        state = self.assertResumeMatches(
+            constraints, lambda: LocalSearch(top_k=3, max_steps=3, candidates=4, patience=1))
+        self.assertTrue(state["stuck_keys"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+"""
+Tests of the columnar schedule export.
+
+Run from the repository root:
+    python -m pytest tests
+"""
+import csv
+import json
+import os
+import tempfile
+import unittest
+import numpy as np
+from src.ga.encoding import VENUE, build_match_table
+from src.ga.population import initialize_encoded_population
+from src.utils.export import MAIN_COLUMNS, schedule_frame, write_schedules
+
+
+class ExportTest(unittest.TestCase):
+
+    def setUp(self):
+        with open(os.path.join("data", "data.json"), "r") as f:
+            self.constraints = json.load(f)
+        np.random.seed(0)
+        self.genes = initialize_encoded_population(self.constraints, 2)
+
+    def test_duplicate_team_and_venue_names_are_exported(self):
+        teams, venues = self.constraints["teams"], self.constraints["venues"]
+        teams[1]["TeamName"] = teams[0]["TeamName"]
+        venues[1]["VenueName"] = venues[0]["VenueName"]
+
+        frame = schedule_frame(self.genes[0], self.constraints, sort=False)
+        match_table = build_match_table(self.constraints)
+        self.assertEqual(list(frame["Team 1"]), [teams[i]["TeamName"] for i in match_table[:, 0]])
+        self.assertEqual(list(frame["Venue"]), [venues[v]["VenueName"] for v in self.genes[0][:, VENUE]])
+
+    def test_main_columns_keep_the_best_schedule_csv_layout(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "best_schedule.csv")
+            write_schedules(path, self.genes[0], self.constraints, columns=MAIN_COLUMNS)
+            with open(path, newline="") as f:
+                self.assertEqual(next(csv.reader(f)), ["Team1", "Team2", "Venue", "Day", "Time Slot", "Week"])
+
+
+if __name__ == "__main__":
+    unittest.main()
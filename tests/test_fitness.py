@@ -0,0 +1,78 @@
+"""
+Tests of the fitness counters: the vectorized population scores against the
+list-based reference, and the details the reference reports.
+
+Run from the repository root:
+    python -m pytest tests
+"""
+import json
+import os
+import unittest
+import numpy as np
+from src.ga.encoding import decode_schedule
+from src.ga.fitness import (
+    count_population_violations, count_rest_violations, count_time_imbalances, count_venue_conflicts,
+    evaluate_fitness, evaluate_population
+)
+from src.ga.population import initialize_encoded_population
+from src.utils.generator import generate_constraints
+
+
+def load_data():
+    with open(os.path.join("data", "data.json"), "r") as f:
+        return json.load(f)
+
+
+def constraint_variants():
+    """The saved instance, and generated ones with every team constraint enforced."""
+    generated = generate_constraints(n_teams=12, n_venues=3, seed=0)
+    tight = generate_constraints(n_teams=9, n_venues=2, tightness=1.0, seed=1)
+    tight["team_constraints"]["max_matches_per_day"] = 2
+    tight["max_consecutive_matches"] = 3
+    return {"data.json": load_data(), "generated": generated, "tight": tight}
+
+
+class PopulationFitnessTest(unittest.TestCase):
+
+    def test_population_scores_equal_reference_scores(self):
+        for name, constraints in constraint_variants().items():
+            with self.subTest(constraints=name):
+                np.random.seed(0)
+                population = initialize_encoded_population(constraints, 40, seeded_fraction=0.25)
+                expected = [evaluate_fitness(decode_schedule(genes, constraints), constraints)[0]
+                            for genes in population]
+                self.assertEqual(evaluate_population(population, constraints).tolist(), expected)
+
+    def test_population_counts_equal_reference_counters(self):
+        for name, constraints in constraint_variants().items():
+            with self.subTest(constraints=name):
+                np.random.seed(1)
+                population = initialize_encoded_population(constraints, 10)
+                counts = count_population_violations(population, constraints)
+                limit = constraints.get("team_constraints", {}).get("max_matches_per_time_slot", 3)
+                for i, genes in enumerate(population):
+                    schedule = decode_schedule(genes, constraints)
+                    self.assertEqual(counts["venue"][i], count_venue_conflicts(schedule)[0])
+                    self.assertEqual(counts["rest"][i], count_rest_violations(schedule, constraints)[0])
+                    self.assertEqual(counts["time"][i], count_time_imbalances(schedule, limit)[0])
+
+
+class TimeImbalanceTest(unittest.TestCase):
+
+    def setUp(self):
+        self.constraints = load_data()
+
+    def test_details_name_the_overused_slot(self):
+        home, *others = self.constraints["teams"][:6]
+        venue, slots = self.constraints["venues"][0], self.constraints["time_slots"]
+        # `home` plays four matches in the second slot and one in the first
+        schedule = [(home, other, venue, "Monday", slots[1], "1") for other in others[:4]]
+        schedule.append((home, others[4], venue, "Monday", slots[0], "1"))
+
+        score, details = count_time_imbalances(schedule, limit=3)
+        self.assertEqual(score, 3)
+        self.assertEqual(details, [{"team": home["TeamName"], "time_slot": slots[1], "count": 4}])
+
+
+if __name__ == "__main__":
+    unittest.main()
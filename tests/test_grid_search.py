@@ -0,0 +1,40 @@
+"""
+Tests of the resumable grid search.
+
+Run from the repository root:
+    python -m pytest tests
+"""
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+from src.utils.generator import generate_constraints
+from src.utils.grid_search import load_results, run_grid_search
+
+
+class GridSearchTest(unittest.TestCase):
+
+    def run_sweep(self, constraints, path):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return run_grid_search(constraints, path, population_size=30, generations_size=2, workers=2)
+
+    def test_resume_skips_only_cells_of_the_same_constraints(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "grid.jsonl")
+            first = generate_constraints(n_teams=6, n_venues=3, seed=0)
+            second = generate_constraints(n_teams=6, n_venues=3, seed=1)
+
+            results = self.run_sweep(first, path)
+            self.assertEqual(len(results), 16)
+            self.assertEqual(len(self.run_sweep(first, path)), 16)
+            self.assertEqual(len(load_results(path)), 16)
+
+            results = self.run_sweep(second, path)
+            self.assertEqual(len(results), 16)
+            self.assertEqual(len({result["constraints"] for result in results}), 1)
+            self.assertEqual(len(load_results(path)), 32)
+
+
+if __name__ == "__main__":
+    unittest.main()
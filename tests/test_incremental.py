@@ -0,0 +1,43 @@
+"""
+Tests that incremental evaluation tracks a full rescore move by move.
+
+Run from the repository root:
+    python -m pytest tests
+"""
+import unittest
+import numpy as np
+from src.ga.constraint_model import ConstraintModel
+from src.ga.encoding import field_sizes
+from src.ga.incremental import IncrementalEvaluator
+from src.ga.population import initialize_encoded_population
+from tests.test_fitness import constraint_variants
+
+
+class IncrementalEvaluatorTest(unittest.TestCase):
+
+    def test_moves_and_swaps_equal_a_full_rescore(self):
+        for name, constraints in constraint_variants().items():
+            with self.subTest(constraints=name):
+                np.random.seed(0)
+                model = ConstraintModel(constraints)
+                individual = initialize_encoded_population(constraints, 1, seeded_fraction=1.0)[0]
+                evaluator = IncrementalEvaluator(constraints, individual, model=model)
+                sizes = field_sizes(constraints)
+                self.assertEqual(evaluator.score, model.evaluate(individual[None])[0])
+
+                for step in range(300):
+                    match = np.random.randint(len(individual))
+                    if step % 3 == 0:
+                        score = evaluator.swap(match, np.random.randint(len(individual)))
+                    else:
+                        gene = np.random.randint(0, sizes).tolist()
+                        before = evaluator.score
+                        delta = evaluator.delta(match, gene)
+                        self.assertEqual(evaluator.score, before)
+                        score = evaluator.move(match, gene)
+                        self.assertEqual(score - before, delta)
+                    self.assertEqual(score, model.evaluate(individual[None])[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
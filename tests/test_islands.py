@@ -0,0 +1,38 @@
+"""
+Tests of the island model's config checks and shutdown.
+
+Run from the repository root:
+    python -m pytest tests
+"""
+import multiprocessing as mp
+import unittest
+from src.ga.islands import draw_island_configs, island_model
+from src.utils.generator import generate_constraints
+
+
+class IslandModelTest(unittest.TestCase):
+
+    def setUp(self):
+        self.constraints = generate_constraints(n_teams=6, n_venues=3, seed=0)
+
+    def test_unknown_operator_is_rejected_before_islands_start(self):
+        configs = draw_island_configs(2, seed=0)
+        configs[1] = {**configs[1], "survivor_strategy": "nope"}
+        with self.assertRaisesRegex(ValueError, "survivor strategy: nope"):
+            island_model(self.constraints, 30, 5, islands=2, island_configs=configs)
+        self.assertEqual(mp.active_children(), [])
+
+    def test_missing_config_key_is_rejected(self):
+        configs = draw_island_configs(1, seed=0)
+        del configs[0]["mutation_method"]
+        with self.assertRaises(ValueError):
+            island_model(self.constraints, 30, 5, islands=1, island_configs=configs)
+
+    def test_run_stops_every_island(self):
+        result = island_model(self.constraints, 30, 4, islands=2, migration_interval=2, seed=0)
+        self.assertLessEqual(result[1], 0)
+        self.assertEqual(mp.active_children(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+"""
+End-to-end tests of the job service over a localhost TCP socket.
+
+Run from the repository root:
+    python -m pytest tests
+"""
+import asyncio
+import json
+import unittest
+from src.utils.generator import generate_constraints
+from src.utils.job_service import JobService, handle_request
+
+
+async def http(port, method, path, payload=None, raw=None):
+    """Send one request and return (status code, body bytes)."""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    if raw is None:
+        body = json.dumps(payload).encode() if payload is not None else b""
+        raw = f"{method} {path} HTTP/1.1\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body
+    writer.write(raw)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, body = response.partition(b"\r\n\r\n")
+    return int(head.split(b" ", 2)[1]), body
+
+
+class JobServiceTest(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.constraints = generate_constraints(n_teams=8, n_venues=3, seed=0)
+        self.service = JobService(workers=2, progress_interval=0.0)
+        self.server = await asyncio.start_server(
+            lambda reader, writer: handle_request(self.service, reader, writer), "127.0.0.1", 0)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def asyncTearDown(self):
+        self.server.close()
+        await self.server.wait_closed()
+        await self.service.close()
+
+    async def submit(self, **payload):
+        status, body = await http(self.port, "POST", "/jobs", {"constraints": self.constraints, **payload})
+        self.assertEqual(status, 202, body)
+        return json.loads(body)["id"]
+
+    async def test_submit_and_stream_until_done(self):
+        job_id = await self.submit(config={"population_size": 30, "generations_size": 5}, seed=0)
+
+        status, body = await http(self.port, "GET", f"/jobs/{job_id}/events")
+        events = [json.loads(line) for line in body.decode().splitlines()]
+        self.assertEqual(status, 200)
+        self.assertEqual(events[-1]["status"], "done")
+        self.assertTrue(any("best_fitness" in event for event in events))
+
+        status, body = await http(self.port, "GET", f"/jobs/{job_id}")
+        job = json.loads(body)
+        self.assertEqual(job["status"], "done")
+        self.assertEqual(len(job["result"]["generations_fitness"]), 6)
+
+    async def test_cancel_running_job(self):
+        job_id = await self.submit(config={"population_size": 50, "generations_size": 100_000})
+        while self.service.jobs[job_id].status == "queued":
+            await asyncio.sleep(0.05)
+
+        status, body = await http(self.port, "DELETE", f"/jobs/{job_id}")
+        self.assertEqual(json.loads(body)["status"], "cancelled")
+        await asyncio.wait_for(self.service.jobs[job_id].task, timeout=10)
+        self.assertFalse(self.service.jobs[job_id].process.is_alive())
+
+    async def test_time_limit_stops_job(self):
+        job_id = await self.submit(config={"population_size": 50, "generations_size": 100_000}, time_limit=0.5)
+        await asyncio.wait_for(self.service.jobs[job_id].task, timeout=10)
+        job = self.service.jobs[job_id]
+        self.assertEqual(job.status, "timed_out")
+        self.assertEqual(job.result["stop_reason"], "time_limit")
+
+    async def test_bad_requests_are_rejected(self):
+        status, _ = await http(self.port, "POST", "/jobs", {"constraints": self.constraints, "time_limit": "5"})
+        self.assertEqual(status, 400)
+        status, _ = await http(self.port, "POST", "/jobs", {"constraints": self.constraints, "time_limit": -1})
+        self.assertEqual(status, 400)
+        status, _ = await http(self.port, None, None, raw=b"GARBAGE\r\n\r\n")
+        self.assertEqual(status, 400)
+        status, _ = await http(self.port, "GET", "/jobs/unknown")
+        self.assertEqual(status, 404)
+        self.assertEqual(self.service.jobs, {})
+
+    async def test_finished_jobs_are_evicted(self):
+        self.service.max_finished = 1
+        first = await self.submit(config={"population_size": 30, "generations_size": 2})
+        await self.service.jobs[first].task
+        second = await self.submit(config={"population_size": 30, "generations_size": 2})
+        await self.service.jobs[second].task
+        await self.submit(config={"population_size": 30, "generations_size": 2})
+        self.assertNotIn(first, self.service.jobs)
+        self.assertIn(second, self.service.jobs)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,145 @@
+"""
+Tests that the index-based selection and survivor operators keep the
+semantics of the list-based originals.
+
+Run from the repository root:
+    python -m pytest tests
+"""
+import unittest
+import numpy as np
+from src.ga.operators import (
+    elitism, elitism_indices, genitor, rank_based_selection, rank_based_selection_indices, tournament_selection,
+    tournament_selection_indices
+)
+
+
+def reference_tournament_selection(population, fitness_scores, tournament_size=5):
+    """The list-based tournament selection the index version replaced."""
+    selected_parents = []
+    for _ in range(len(population)):
+        tournament_indices = np.random.choice(len(population), tournament_size, replace=False)
+        tournament = [(population[i], fitness_scores[i]) for i in tournament_indices]
+        selected_parents.append(max(tournament, key=lambda x: x[1])[0])
+    return selected_parents
+
+
+def reference_rank_based_selection(population, fitness_scores, selection_pressure=1.5):
+    """The list-based rank selection the index version replaced."""
+    sorted_population = sorted(zip(population, fitness_scores), key=lambda x: x[1], reverse=True)
+    sorted_individuals = [ind for ind, _ in sorted_population]
+    n = len(population)
+    ranks = np.arange(1, n + 1)
+    probs = (2 - selection_pressure) / n + (2 * (ranks - 1) * (selection_pressure - 1)) / (n * (n - 1))
+    probs = np.flip(probs)
+    probs = probs / np.sum(probs)
+    selected_indices = np.random.choice(n, size=n, p=probs, replace=True)
+    return [sorted_individuals[i] for i in selected_indices]
+
+
+def reference_elitism(old_population, offspring, fitness_old, fitness_offspring, elite_size=20):
+    """The sort-based elitism the argpartition version replaced."""
+    combined_population = old_population + offspring
+    combined_fitness = fitness_old + fitness_offspring
+    sorted_indices = sorted(range(len(combined_fitness)), key=lambda i: combined_fitness[i], reverse=True)
+    return [combined_population[i] for i in sorted_indices[:elite_size]]
+
+
+def reference_genitor(old_population, offspring, fitness_old, fitness_offspring):
+    """The linear-scan genitor the heap version replaced."""
+    for child, child_fit in zip(offspring, fitness_offspring):
+        worst_index = fitness_old.index(min(fitness_old))
+        if child_fit > fitness_old[worst_index]:
+            old_population[worst_index] = child
+            fitness_old[worst_index] = child_fit
+    return old_population
+
+
+class SelectionTest(unittest.TestCase):
+
+    def setUp(self):
+        np.random.seed(0)
+        # Few distinct values, so ties are common
+        self.fitness = np.random.randint(-20, 0, size=200).tolist()
+        self.population = [f"individual {i}" for i in range(200)]
+
+    def test_rank_selection_picks_the_same_parents(self):
+        for pressure in (1.0, 1.2, 2.0):
+            with self.subTest(selection_pressure=pressure):
+                np.random.seed(1)
+                expected = reference_rank_based_selection(self.population, self.fitness, pressure)
+                np.random.seed(1)
+                self.assertEqual(rank_based_selection(self.population, self.fitness, pressure), expected)
+
+    def test_tournament_winner_is_the_fittest_contestant(self):
+        np.random.seed(2)
+        winners = tournament_selection_indices(self.fitness, tournament_size=7, n_parents=500)
+        np.random.seed(2)
+        contestants = np.random.randint(0, len(self.fitness), size=(500, 7))
+        for winner, row in zip(winners.tolist(), contestants.tolist()):
+            self.assertIn(winner, row)
+            self.assertEqual(self.fitness[winner], max(self.fitness[i] for i in row))
+
+    def test_tournament_keeps_the_selection_pressure(self):
+        # Drawing contestants with replacement barely changes how fit the winners are
+        fitness_of = dict(zip(self.population, self.fitness))
+        np.random.seed(3)
+        expected = np.mean([fitness_of[parent] for _ in range(20)
+                            for parent in reference_tournament_selection(self.population, self.fitness, 20)])
+        np.random.seed(3)
+        actual = np.mean([fitness_of[parent] for _ in range(20)
+                          for parent in tournament_selection(self.population, self.fitness, 20)])
+        self.assertAlmostEqual(actual, expected, delta=0.1 * abs(expected))
+
+    def test_tournament_size_is_checked(self):
+        with self.assertRaises(ValueError):
+            tournament_selection(self.population[:3], self.fitness[:3], tournament_size=4)
+
+
+class SurvivorTest(unittest.TestCase):
+
+    def random_generation(self, size, low=-15):
+        population = [f"parent {i}" for i in range(size)]
+        offspring = [f"child {i}" for i in range(size)]
+        return (population, offspring, np.random.randint(low, 1, size=size).tolist(),
+                np.random.randint(low, 1, size=size).tolist())
+
+    def test_genitor_replaces_the_same_individuals(self):
+        np.random.seed(4)
+        for size in (1, 2, 9, 60):
+            for _ in range(20):
+                population, offspring, fitness_old, fitness_offspring = self.random_generation(size)
+                expected_fitness = fitness_old[:]
+                expected = reference_genitor(population[:], offspring, expected_fitness, fitness_offspring)
+                actual = genitor(population, offspring, fitness_old, fitness_offspring)
+                self.assertEqual(actual, expected)
+                self.assertEqual(fitness_old, expected_fitness)
+
+    def test_elitism_keeps_the_elites_and_samples_the_rest(self):
+        np.random.seed(5)
+        for size, elite_size in ((30, 20), (50, 0), (25, 25), (40, 7)):
+            with self.subTest(size=size, elite_size=elite_size):
+                population, offspring, fitness_old, fitness_offspring = self.random_generation(size)
+                survivors = elitism_indices(fitness_old, fitness_offspring, elite_size)
+                combined_fitness = fitness_old + fitness_offspring
+
+                self.assertEqual(len(survivors), size)
+                self.assertEqual(len(set(survivors.tolist())), size)
+                elites = sorted((combined_fitness[i] for i in survivors[:elite_size]), reverse=True)
+                self.assertEqual(elites, sorted(combined_fitness, reverse=True)[:elite_size])
+
+                reference = reference_elitism(population, offspring, fitness_old, fitness_offspring, elite_size)
+                new_population, new_fitness = elitism(population, offspring, fitness_old, fitness_offspring,
+                                                      elite_size, return_fitness=True)
+                self.assertEqual(sorted(new_fitness[:elite_size], reverse=True),
+                                 sorted((combined_fitness[(population + offspring).index(individual)]
+                                         for individual in reference), reverse=True))
+                self.assertEqual(new_fitness, [combined_fitness[(population + offspring).index(individual)]
+                                               for individual in new_population])
+
+    def test_elite_size_is_checked(self):
+        with self.assertRaises(ValueError):
+            elitism_indices([0, -1], [0, -2], elite_size=3)
+
+
+if __name__ == "__main__":
+    unittest.main()
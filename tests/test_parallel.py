@@ -0,0 +1,49 @@
+"""
+Tests that the process-pool evaluator scores like serial evaluation.
+
+Run from the repository root:
+    python -m pytest tests
+"""
+import unittest
+import numpy as np
+from src.ga.fitness import evaluate_population
+from src.ga.parallel import ParallelEvaluator
+from src.ga.population import initialize_encoded_population
+from src.ga.scheduler import genetic_algorithm
+from tests.test_fitness import constraint_variants, load_data
+
+
+class ParallelEvaluatorTest(unittest.TestCase):
+
+    def test_parallel_scores_equal_serial_scores(self):
+        for name, constraints in constraint_variants().items():
+            with self.subTest(constraints=name):
+                np.random.seed(0)
+                population = initialize_encoded_population(constraints, 50)
+                expected = evaluate_population(population, constraints)
+                with ParallelEvaluator(constraints, workers=3, max_population=50) as evaluate:
+                    # Smaller populations reuse the front of the shared buffer
+                    for size in (50, 7, 2, 0):
+                        self.assertEqual(evaluate(population[:size]).tolist(), expected[:size].tolist())
+
+    def test_population_beyond_the_buffer_is_rejected(self):
+        constraints = load_data()
+        population = initialize_encoded_population(constraints, 5)
+        with ParallelEvaluator(constraints, workers=2, max_population=4) as evaluate:
+            with self.assertRaises(ValueError):
+                evaluate(population)
+
+    def test_seeded_run_does_not_depend_on_workers(self):
+        constraints = load_data()
+        run = {"population_size": 30, "generations_size": 5, "crossover_method": "order_crossover",
+               "mutation_method": "attribute_level_mutation", "selection_method": "rank_based_selection",
+               "seed": 4}
+        serial = genetic_algorithm(constraints, **run)
+        parallel = genetic_algorithm(constraints, workers=2, **run)
+        self.assertEqual(parallel[1], serial[1])
+        self.assertEqual(parallel[-1], serial[-1])
+        self.assertEqual(parallel[0], serial[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+"""
+Tests that the population double buffers never alias individuals.
+
+Run from the repository root:
+    python -m pytest tests
+"""
+import unittest
+import numpy as np
+from src.ga.constraint_model import ConstraintModel
+from src.ga.population import PopulationBuffers, initialize_encoded_population
+from src.ga.scheduler import evolve_generation
+from src.utils.generator import generate_constraints
+from tests.test_fitness import load_data
+
+
+class PopulationBuffersTest(unittest.TestCase):
+
+    def setUp(self):
+        self.constraints = load_data()
+        np.random.seed(0)
+        self.population = initialize_encoded_population(self.constraints, 6)
+        self.buffers = PopulationBuffers.from_population(self.population, np.arange(6))
+
+    def test_population_and_offspring_do_not_share_memory(self):
+        self.assertFalse(np.shares_memory(self.buffers.population, self.buffers.offspring))
+        previous = self.buffers.population
+        self.buffers.advance(np.arange(6))
+        self.assertFalse(np.shares_memory(self.buffers.population, previous))
+        self.assertFalse(np.shares_memory(self.buffers.population, self.buffers.offspring))
+
+    def test_survivors_are_copies(self):
+        self.buffers.offspring[:] = self.population[::-1]
+        self.buffers.offspring_fitness[:] = np.arange(6, 12)
+        # Individual 2 survives twice and child 0 (index 6) once
+        self.buffers.advance(np.array([2, 2, 6, 0, 1, 3]))
+        np.testing.assert_array_equal(self.buffers.population[2], self.population[-1])
+        self.assertEqual(self.buffers.fitness.tolist(), [2, 2, 6, 0, 1, 3])
+
+        self.buffers.population[0, 0] += 1
+        np.testing.assert_array_equal(self.buffers.population[1], self.population[2])
+        self.buffers.offspring[:] = 0
+        np.testing.assert_array_equal(self.buffers.population[3], self.population[0])
+
+    def test_out_of_range_survivors_are_rejected(self):
+        for survivors in ([0, 1, 2, 3, 4, 12], [0, 1, 2, 3, 4, -1]):
+            with self.assertRaises(IndexError):
+                self.buffers.advance(np.array(survivors))
+
+    def test_scores_stay_in_step_with_individuals(self):
+        for name, constraints in {"data.json": self.constraints,
+                                  "generated": generate_constraints(n_teams=10, n_venues=3, seed=0)}.items():
+            model = ConstraintModel(constraints)
+            for survivor_strategy in ("elitism", "genitor"):
+                for mutation_method in ("swap_mutation", "attribute_level_mutation"):
+                    with self.subTest(constraints=name, survivor_strategy=survivor_strategy,
+                                      mutation_method=mutation_method):
+                        np.random.seed(1)
+                        population = initialize_encoded_population(constraints, 30)
+                        buffers = PopulationBuffers.from_population(population, model.evaluate(population))
+                        for _ in range(5):
+                            evolve_generation(buffers, constraints, "PMX_Crossover", mutation_method,
+                                              "tournament_selection", survivor_strategy, model.evaluate)
+                            # A parent changed through an alias would keep its stale score
+                            self.assertEqual(buffers.fitness.tolist(),
+                                             model.evaluate(buffers.population).tolist())
+
+
+if __name__ == "__main__":
+    unittest.main()